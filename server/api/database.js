@@ -542,6 +542,27 @@ export async function markOldInternshipsInactive(daysOld = 90) {
   return result.rows.length;
 }
 
+/**
+ * Mark specific internships as inactive (removal tombstones from the scraper service)
+ */
+export async function markInternshipsInactiveByIds(ids) {
+  if (!ids || ids.length === 0) {
+    return 0;
+  }
+
+  const result = await pool.query(
+    `
+    UPDATE internships
+    SET is_active = false, updated_at = NOW()
+    WHERE id = ANY($1::text[])
+    AND is_active = true
+    RETURNING id;
+    `,
+    [ids]
+  );
+  return result.rows.length;
+}
+
 // Get saved internships for a user
 export async function getSavedInternships(userId) {
   const result = await pool.query(
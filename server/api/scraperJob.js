@@ -11,7 +11,12 @@ import {
   WORKDAY_COMPANIES,
   SMARTRECRUITERS_COMPANIES,
 } from './companies.js';
-import { bulkUpsertInternships, logScraping, markOldInternshipsInactive } from './database.js';
+import {
+  bulkUpsertInternships,
+  logScraping,
+  markInternshipsInactiveByIds,
+  markOldInternshipsInactive,
+} from './database.js';
 
 const SCRAPER_SERVICE_URL = process.env.SCRAPER_SERVICE_URL || 'http://localhost:3002';
 
@@ -280,6 +285,96 @@ async function scrapeGitHub() {
   }
 }
 
+// ETag of the last web scrape payload, so unchanged results come back as 304
+let lastWebScrapeEtag = null;
+
+// Position in the scraper service's removal feed; after a restart the feed is
+// read again from the start, which only deactivates the same jobs again
+let removalCursor = 0;
+const REMOVAL_PAGE_SIZE = 1000;
+
+const SCRAPE_JOB_POLL_MS = parseInt(process.env.SCRAPE_JOB_POLL_MS || '5000', 10);
+const SCRAPE_JOB_TIMEOUT_MS = parseInt(process.env.SCRAPE_JOB_TIMEOUT_MS || String(30 * 60 * 1000), 10);
+const FINISHED_JOB_STATUSES = ['succeeded', 'failed', 'cancelled'];
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Start an asynchronous scrape job and poll it until it finishes.
+ * On timeout the job is cancelled; its partial results are still returned.
+ */
+async function runScrapeJob() {
+  const created = await fetch(`${SCRAPER_SERVICE_URL}/api/scrape/jobs`, { method: 'POST' });
+  if (!created.ok) {
+    throw new Error(`Scraper service returned ${created.status}`);
+  }
+  let job = await created.json();
+  const jobUrl = `${SCRAPER_SERVICE_URL}/api/scrape/jobs/${job.id}`;
+  const deadline = Date.now() + SCRAPE_JOB_TIMEOUT_MS;
+
+  while (!FINISHED_JOB_STATUSES.includes(job.status)) {
+    if (Date.now() > deadline) {
+      console.log(`⚠️  Scrape job ${job.id} timed out; cancelling and keeping partial results`);
+      await fetch(jobUrl, { method: 'DELETE' });
+      break;
+    }
+    await sleep(SCRAPE_JOB_POLL_MS);
+    const response = await fetch(`${jobUrl}?results=false`);
+    if (!response.ok) {
+      throw new Error(`Scraper service returned ${response.status} for job ${job.id}`);
+    }
+    job = await response.json();
+  }
+
+  return job;
+}
+
+/**
+ * Fetch the latest stored web scrape result (304 when unchanged)
+ */
+async function fetchWebScrapeResult() {
+  const headers = lastWebScrapeEtag ? { 'If-None-Match': lastWebScrapeEtag } : {};
+  const response = await fetch(`${SCRAPER_SERVICE_URL}/api/scrape`, { headers });
+
+  if (response.status === 304) {
+    return { notModified: true };
+  }
+  if (!response.ok) {
+    throw new Error(`Scraper service returned ${response.status}`);
+  }
+  return { data: await response.json(), etag: response.headers.get('etag') };
+}
+
+/**
+ * Deactivate internships the scraper service reported removed since the last call.
+ * The cursor only advances once a page is stored, so a failure re-reads that page.
+ */
+async function deactivateRemovedInternships() {
+  let deactivated = 0;
+  for (;;) {
+    const response = await fetch(
+      `${SCRAPER_SERVICE_URL}/api/scrape/removed?after=${removalCursor}&limit=${REMOVAL_PAGE_SIZE}`
+    );
+    if (response.status === 404) {
+      // Job ledger disabled: nothing is ever reported removed
+      return deactivated;
+    }
+    if (!response.ok) {
+      throw new Error(`Scraper service returned ${response.status} for the removal feed`);
+    }
+    const { removed = [], cursor } = await response.json();
+    deactivated += await markInternshipsInactiveByIds(removed.map((tombstone) => tombstone.id));
+    removalCursor = cursor;
+    if (removed.length < REMOVAL_PAGE_SIZE) {
+      break;
+    }
+  }
+  if (deactivated > 0) {
+    console.log(`   - Deactivated ${deactivated} removed internships`);
+  }
+  return deactivated;
+}
+
 /**
  * Fetch and store web-scraped internships
  */
@@ -288,21 +383,44 @@ async function scrapeWeb() {
   const startTime = Date.now();
 
   try {
-    const response = await fetch(`${SCRAPER_SERVICE_URL}/api/scrape`);
-
-    if (!response.ok) {
-      throw new Error(`Scraper service returned ${response.status}`);
+    const job = await runScrapeJob();
+
+    let data;
+    let etag = null;
+    if (job.status === 'succeeded') {
+      // The finished job stored a fresh result; read it with the ETag so unchanged data is a 304
+      const result = await fetchWebScrapeResult();
+      if (result.notModified) {
+        console.log('✓ Web scraping results unchanged (304 Not Modified)');
+        // Other scrapes (keywords, schedules) may still have recorded removals
+        await deactivateRemovedInternships();
+        return { success: true, newCount: 0, updatedCount: 0 };
+      }
+      ({ data, etag } = result);
+    } else {
+      // Failed, cancelled or timed out: keep whatever sources finished
+      const response = await fetch(`${SCRAPER_SERVICE_URL}/api/scrape/jobs/${job.id}`);
+      if (!response.ok) {
+        throw new Error(`Scraper service returned ${response.status} for job ${job.id}`);
+      }
+      data = await response.json();
+      console.log(`⚠️  Scrape job ${job.id} ${data.status}; using ${data.internships?.length || 0} partial results`);
     }
 
-    const data = await response.json();
     const internships = data.internships || [];
 
     if (internships.length === 0) {
       console.log('⚠️  No internships found from web scraping');
+      await deactivateRemovedInternships();
       return { success: true, newCount: 0, updatedCount: 0 };
     }
 
     const { newCount, updatedCount } = await bulkUpsertInternships(internships);
+    if (etag) {
+      lastWebScrapeEtag = etag;
+    }
+    // After the upsert, so a partial result cannot reactivate a removed job
+    await deactivateRemovedInternships();
 
     const duration = ((Date.now() - startTime) / 1000).toFixed(2);
 
@@ -311,13 +429,15 @@ async function scrapeWeb() {
       internships: internships.length,
       newCount,
       updatedCount,
-      status: 'success',
+      status: job.status === 'succeeded' ? 'success' : 'partial',
     });
 
     console.log(`✅ Web scraping completed in ${duration}s`);
     console.log(`   - Total internships: ${internships.length}`);
     console.log(`   - New: ${newCount}, Updated: ${updatedCount}`);
-    console.log(`   - Sources: ${data.sources?.join(', ') || 'unknown'}`);
+    // A stored result lists source names; a job maps each scraper to its progress
+    const sourceNames = Array.isArray(data.sources) ? data.sources : Object.keys(data.sources || {});
+    console.log(`   - Sources: ${sourceNames.join(', ') || 'unknown'}`);
 
     return { success: true, newCount, updatedCount };
   } catch (error) {
@@ -1,58 +1,400 @@
 """
 Flask API server for web scraping service
+
+`python app.py` runs the Flask dev server and scrapes inside the request
+that needs a fresh result. In production, wsgi.py sets SCRAPE_MODE=worker:
+request workers only read results from the shared JobStore and a separate
+scrape worker (scrape_worker.py) does the scraping.
 """
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from scrapers import scrape_all_sources
+from config import env_int
+from job_batch import ARROW_MIME_TYPE, JobBatch
+from job_ledger import get_job_ledger
+from job_store import get_job_store
+from metrics import get_metrics
+from profiling import DEFAULT_TOP, PROFILE_KINDS
+from response_cache import PreparedPayload, ResponseCache
+from scrape_jobs import FINISHED_STATUSES, SUCCEEDED, get_scrape_jobs
+from scrape_worker import job_runner, run_scrape
+from tracing import get_trace_store
+from concurrent.futures import ThreadPoolExecutor
+import event_log
+import hmac
+import json
 import os
+import threading
+import time
 
 app = Flask(__name__)
 CORS(app)
 
-# Cache for scraped results
-cache = {
-    'data': [],
-    'timestamp': None
-}
 
-CACHE_DURATION = 3600  # 1 hour in seconds
+CACHE_DURATION = env_int('SCRAPE_CACHE_SECONDS', 3600)  # 1 hour by default
+# 'inline' scrapes in the requesting process; 'worker' hands scrapes to scrape_worker.py
+SCRAPE_MODE = os.environ.get('SCRAPE_MODE', 'inline')
+SCRAPE_WAIT_SECONDS = env_int('SCRAPE_WAIT_SECONDS', 600)
+# Bearer token for /api/scrape?profile=...; profiling is off without one
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+
+DEFAULT_KEYWORDS = 'software engineering intern'
+
+
+# Scrape results shared by every process, keyed by keywords
+# Each entry: {'batch': JobBatch, 'truncated': [source], 'timestamp': float, 'version': int}
+store = get_job_store()
+# Striped so arbitrary client keywords cannot grow a lock per value; keyword
+# sets sharing a stripe just scrape one after the other
+scrape_locks = [threading.Lock() for _ in range(32)]
+
+# Asynchronous scrape jobs; run by the scrape worker, or by this thread in inline mode
+scrape_jobs = get_scrape_jobs()
+inline_job_runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scrape-job')
+
+# Serialized + compressed payloads, keyed by result version and request variant
+payload_cache = ResponseCache()
+
+
+class ScrapeUnavailable(Exception):
+    """No result could be produced in time (scrape worker down or too slow)"""
+
+
+def scrape_lock(keywords: str) -> threading.Lock:
+    """Lock serializing inline scrapes of a keyword set"""
+    return scrape_locks[hash(keywords) % len(scrape_locks)]
+
+
+def get_scrape_result(keywords: str, refresh: bool = False) -> dict:
+    """Return the stored scrape result for keywords, scraping when stale"""
+    entry = store.load(keywords)
+    if entry and not refresh and time.time() - entry['timestamp'] < CACHE_DURATION:
+        return entry
+
+    if SCRAPE_MODE == 'worker':
+        queued = store.request_scrape(keywords)
+        # Serve the stale result while the worker refreshes it; only wait when there is none
+        if entry is not None and not refresh:
+            return entry
+        if not queued:
+            raise ScrapeUnavailable('too many scrapes are waiting for the scrape worker')
+        if not store.worker_alive():
+            raise ScrapeUnavailable('scrape worker is not running')
+        result = store.wait_for(keywords, newer_than=entry['version'] if entry else 0,
+                                timeout=SCRAPE_WAIT_SECONDS)
+        if result is None:
+            raise ScrapeUnavailable(f'no result within {SCRAPE_WAIT_SECONDS}s')
+        return result
+
+    # One scrape per keyword set at a time; concurrent callers wait for it
+    with scrape_lock(keywords):
+        latest = store.load(keywords)
+        if latest is not None and (entry is None or latest['version'] != entry['version']):
+            return latest
+        return run_scrape(keywords, store)
+
+
+def profile_scrape(keywords: str, kind: str):
+    """
+    Run one scrape under the profiler and return its report
+
+    The scrape is filed as a profile job and waited for: in worker mode it
+    runs in the scrape worker, the only process that may scrape (and write
+    learned state); in inline mode on the job runner thread.
+    """
+    if not PROFILE_TOKEN:
+        return jsonify({'error': 'Profiling disabled', 'message': 'PROFILE_TOKEN is not set'}), 404
+    token = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    if not hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        return jsonify({'error': 'Unauthorized', 'message': 'Profiling needs Authorization: Bearer <PROFILE_TOKEN>'}), 401
+
+    if kind not in PROFILE_KINDS:
+        return jsonify({'error': 'Invalid profile', 'message': f"profile must be one of {', '.join(PROFILE_KINDS)}"}), 400
+    try:
+        top = int(request.args.get('top', str(DEFAULT_TOP)))
+    except ValueError:
+        return jsonify({'error': 'Invalid profile', 'message': 'top must be an integer'}), 400
+    if SCRAPE_MODE == 'worker' and not store.worker_alive():
+        return jsonify({'error': 'Scrape unavailable', 'message': 'scrape worker is not running'}), 503
+
+    job = scrape_jobs.create(keywords, profile={'kind': kind, 'top': top})
+    if SCRAPE_MODE != 'worker':
+        inline_job_runner.submit(scrape_jobs.run, job['id'], job_runner(job, store))
+    job = scrape_jobs.wait(job['id'], timeout=SCRAPE_WAIT_SECONDS,
+                           runner_alive=store.worker_alive if SCRAPE_MODE == 'worker' else None)
+    if job is None:
+        return jsonify({'error': 'Scrape unavailable', 'message': f'no profile within {SCRAPE_WAIT_SECONDS}s'}), 503
+    if job['status'] != SUCCEEDED:
+        return jsonify({'error': 'Profile failed', 'message': job.get('error') or job['status'], 'job': job['id']}), 500
+
+    return jsonify({
+        'keywords': keywords,
+        'job': job['id'],
+        'jobs': job['total'],
+        'truncated': job.get('truncated', []),
+        'profile': job['profile_report'],
+    })
+
+
+def _serialize_json(data) -> bytes:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def build_scrape_payload(batch: JobBatch, output_format: str, sources_filter: tuple,
+                         job_types_filter: tuple, fields: str,
+                         truncated: list = ()) -> PreparedPayload:
+    """Filter, serialize and compress one variant of a scrape result"""
+    if sources_filter:
+        batch = batch.where('source', sources_filter)
+    if job_types_filter:
+        batch = batch.where('job_type', job_types_filter)
+
+    sources = [source or 'Unknown' for source in batch.distinct('source')]
+
+    if output_format == 'json':
+        return PreparedPayload.build(_serialize_json({
+            'total': len(batch),
+            'internships': batch.to_dicts(),
+            'sources': sources,
+            'truncated': list(truncated)
+        }), 'application/json')
+
+    if fields:
+        batch = batch.project(field.strip() for field in fields.split(','))
+
+    if output_format == 'arrow':
+        return PreparedPayload.build(batch.to_arrow_ipc(), ARROW_MIME_TYPE)
+
+    return PreparedPayload.build(_serialize_json({
+        'total': len(batch),
+        'columns': batch.to_columns_json()['columns'],
+        'sources': sources,
+        'truncated': list(truncated)
+    }), 'application/json')
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({
+    body = {
         'status': 'ok',
         'service': 'scraper-service',
         'version': '1.0.0'
-    })
+    }
+    if SCRAPE_MODE == 'worker':
+        worker = store.worker_status() or {}
+        body['scrape_worker'] = {'alive': store.worker_alive(), 'busy': worker.get('busy')}
+    return jsonify(body)
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus metrics of every serving process and the scrape worker
+
+    Per-source histograms of source wall time, fetch latency, parse time and
+    bytes downloaded, plus fetch outcomes (304 ratio), cache hit ratios,
+    jobs emitted and error counts.
+    """
+    registry = get_metrics()
+    if registry is None:
+        return jsonify({'error': 'Metrics disabled'}), 404
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8',
+                    headers={'Cache-Control': 'no-cache'})
+
+
+@app.route('/api/traces', methods=['GET'])
+def traces():
+    """Recent sampled scrape traces, newest first (id, keywords, spans, duration_ms)"""
+    trace_store = get_trace_store()
+    if trace_store is None:
+        return jsonify({'error': 'Tracing disabled'}), 404
+    return jsonify({'traces': trace_store.list()})
+
+
+@app.route('/api/traces/<trace_id>', methods=['GET'])
+def get_trace(trace_id):
+    """
+    One scrape trace as Chrome trace-event JSON
+
+    Load the file in chrome://tracing or https://ui.perfetto.dev to see the
+    scrape → source → board/repo → fetch/parse/classify/dedup timeline.
+    """
+    trace_store = get_trace_store()
+    trace = trace_store.get(trace_id) if trace_store is not None else None
+    if trace is None:
+        return jsonify({'error': 'Not found', 'message': f'No trace {trace_id}'}), 404
+    response = jsonify(trace)
+    response.headers['Content-Disposition'] = f'attachment; filename="trace-{trace_id}.json"'
+    return response
 
 
 @app.route('/api/scrape', methods=['GET'])
 def scrape():
-    """Scrape internships from web sources"""
+    """
+    Scrape internships from web sources
+
+    Results are cached for CACHE_DURATION seconds and served as
+    pre-serialized, pre-compressed bytes with an ETag; a matching
+    If-None-Match gets 304 Not Modified. JSON responses include `truncated`:
+    sources that ran out of their deadline budget and returned partial
+    results. Jobs that dropped out of their source are served separately
+    by GET /api/scrape/removed.
+
+    Query params:
+        q: Search keywords
+        refresh: 'true' to scrape again even if the cached result is fresh
+        source, job_type: Only return matching jobs (repeatable)
+        fields: Comma-separated columns to return (columns/arrow formats)
+        format: 'json' (default, list of jobs), 'columns' (compact
+            dictionary-encoded JSON columns) or 'arrow' (Arrow IPC stream)
+        profile: 'cpu' or 'alloc' to scrape now under a profiler and return
+            the top functions or allocation sites instead of the jobs
+            (needs Authorization: Bearer <PROFILE_TOKEN>); the scrape runs
+            as a job in the scrape worker
+        top: Functions/allocation sites in a profile (default 30)
+
+    In worker mode a stale result is served as is while the scrape worker
+    refreshes it; only a missing result (or refresh=true) waits for a scrape.
+    """
     try:
-        keywords = request.args.get('q', 'software engineering intern')
+        keywords = request.args.get('q', DEFAULT_KEYWORDS)
+        output_format = request.args.get('format', 'json')
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
 
-        print(f"Starting web scraping with keywords: {keywords}")
+        if request.args.get('profile'):
+            return profile_scrape(keywords, request.args['profile'])
 
-        # Scrape all sources
-        internships = scrape_all_sources(keywords)
+        if output_format not in ('json', 'columns', 'arrow'):
+            return jsonify({
+                'error': 'Invalid format',
+                'message': "format must be one of 'json', 'columns', 'arrow'"
+            }), 400
 
-        return jsonify({
-            'total': len(internships),
-            'internships': internships,
-            'sources': list(set([job.get('source', 'Unknown') for job in internships]))
-        })
+        try:
+            result = get_scrape_result(keywords, refresh=refresh)
+        except ScrapeUnavailable as e:
+            return jsonify({'error': 'Scrape unavailable', 'message': str(e)}), 503
+
+        sources_filter = tuple(sorted(request.args.getlist('source')))
+        job_types_filter = tuple(sorted(request.args.getlist('job_type')))
+        fields = request.args.get('fields', '') if output_format != 'json' else ''
+        key = (keywords, result['version'], output_format, sources_filter, job_types_filter, fields)
+
+        try:
+            payload = payload_cache.get_or_build(key, lambda: build_scrape_payload(
+                result['batch'], output_format, sources_filter, job_types_filter, fields,
+                truncated=result.get('truncated', [])
+            ))
+        except RuntimeError as e:
+            return jsonify({'error': 'Arrow output unavailable', 'message': str(e)}), 501
+
+        return payload.make_response(request)
 
     except Exception as e:
-        print(f"Error in scrape endpoint: {e}")
+        event_log.error('endpoint.failed', path=request.path, error=str(e))
         return jsonify({
             'error': 'Scraping failed',
             'message': str(e)
         }), 500
 
 
+def _job_response(job: dict, include_results: bool = True) -> dict:
+    body = dict(job)
+    if include_results:
+        body.update(scrape_jobs.results(job['id']))
+    return body
+
+
+@app.route('/api/scrape/removed', methods=['GET'])
+def removed_jobs():
+    """
+    Removal feed: jobs that dropped out of their source, oldest first
+
+    Every removal the job ledger records gets the next number of one
+    sequence, whichever scrape (keywords, job or schedule) recorded it.
+    Consumers keep the returned `cursor` and pass it back as `after`, so
+    each removal is read once and none is lost between scrapes. A cursor
+    past the end of the sequence (a reset ledger) starts over from 0.
+
+    Query params:
+        after: Cursor from the previous call (default 0: every removal)
+        limit: Max removals returned (default 1000); call again with the
+            new cursor until fewer come back
+        source: Only return removals of matching sources (repeatable)
+    """
+    ledger = get_job_ledger()
+    if ledger is None:
+        return jsonify({'error': 'Job ledger disabled'}), 404
+    try:
+        after = max(0, int(request.args.get('after', '0')))
+        limit = min(max(1, int(request.args.get('limit', '1000'))), 10000)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor', 'message': 'after and limit must be integers'}), 400
+
+    removed, cursor = ledger.removals_after(after, limit)
+    sources_filter = request.args.getlist('source')
+    if sources_filter:
+        removed = [tombstone for tombstone in removed if tombstone['source'] in sources_filter]
+    return jsonify({'removed': removed, 'cursor': cursor})
+
+
+@app.route('/api/scrape/jobs', methods=['POST'])
+def create_scrape_job():
+    """
+    Start an asynchronous scrape
+
+    Returns 202 with the job at once; poll GET /api/scrape/jobs/<id>.
+
+    Body (JSON, optional) or query params:
+        q: Search keywords
+    """
+    body = request.get_json(silent=True) or {}
+    keywords = body.get('q') or request.args.get('q', DEFAULT_KEYWORDS)
+    job = scrape_jobs.create(keywords)
+    if SCRAPE_MODE != 'worker':
+        inline_job_runner.submit(scrape_jobs.run, job['id'], job_runner(job, store))
+
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers['Location'] = f"/api/scrape/jobs/{job['id']}"
+    return response
+
+
+@app.route('/api/scrape/jobs/<job_id>', methods=['GET'])
+def get_scrape_job(job_id):
+    """
+    Scrape job status, per-source progress and results so far
+
+    `sources` maps each scraper to its status, elapsed_seconds, jobs_found
+    and error; `internships` holds the jobs of finished sources until the
+    job succeeds, then the final result. Query params:
+        results: 'false' to leave out internships (cheap polling)
+    """
+    job = scrape_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Not found', 'message': f'No scrape job {job_id}'}), 404
+    include_results = request.args.get('results', 'true').lower() not in ('0', 'false', 'no')
+    return jsonify(_job_response(job, include_results))
+
+
+@app.route('/api/scrape/jobs/<job_id>', methods=['DELETE'])
+def cancel_scrape_job(job_id):
+    """
+    Cancel a scrape job
+
+    Cancellation is cooperative: a running job stops before its next source
+    and keeps the partial results collected so far.
+    """
+    job = scrape_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Not found', 'message': f'No scrape job {job_id}'}), 404
+    if job['status'] in FINISHED_STATUSES:
+        return jsonify({'error': 'Already finished', 'message': f"Job is {job['status']}"}), 409
+    response = jsonify(job)
+    response.status_code = 202
+    return response
+
+
 @app.route('/api/scrape/sources', methods=['GET'])
 def sources():
     """List available scraping sources"""
@@ -91,10 +433,15 @@ def sources():
 
 
 if __name__ == '__main__':
+    if SCRAPE_MODE != 'worker':
+        # This process is the only job runner in inline mode; jobs a previous run left running are dead
+        scrape_jobs.fail_orphaned()
     port = int(os.environ.get('PORT', 3002))
     print(f"🔍 Scraper service starting on port {port}")
     print("📡 Available endpoints:")
     print(f"   - GET http://localhost:{port}/health")
     print(f"   - GET http://localhost:{port}/api/scrape")
     print(f"   - GET http://localhost:{port}/api/scrape/sources")
+    print(f"   - GET http://localhost:{port}/api/scrape/removed")
+    print(f"   - POST http://localhost:{port}/api/scrape/jobs")
     app.run(host='0.0.0.0', port=port, debug=True)
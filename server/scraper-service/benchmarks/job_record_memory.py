@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Compare the memory needed to hold a job catalog as dicts vs JobRecords
+
+Strings are built fresh for every job, the way parsed HTML/JSON values
+are, so interning and shared eligible-year tuples show up in the numbers.
+
+Usage:
+    python benchmarks/job_record_memory.py [--jobs 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_record import JobRecord  # noqa: E402
+
+COMPANIES = ['Stripe', 'Databricks', 'Ramp', 'Figma', 'Palantir', 'Citadel', 'Notion', 'NVIDIA', 'Airbnb', 'Reddit']
+LOCATIONS = ['San Francisco, CA', 'New York, NY', 'Seattle, WA', 'Remote', 'Austin, TX']
+JOB_TYPES = ['Software Engineering', 'Machine Learning', 'Data Science', 'Quantitative Finance']
+SOURCES = ['github_simplify_summer2026', 'greenhouse', 'lever', 'Levels.fyi', 'Google Jobs (SerpApi)']
+YEARS = [['Sophomore', 'Junior', 'Senior'], ['Junior', 'Senior', 'Graduate'], ['Graduate']]
+
+
+def _fresh(value: str) -> str:
+    """Build a new string object with the same contents"""
+    return ''.join(list(value))
+
+
+def build_fields(count: int):
+    """Yield job field dicts with freshly allocated strings"""
+    rng = random.Random(42)
+    for i in range(count):
+        company = rng.choice(COMPANIES)
+        yield {
+            'id': f'bench-{i}',
+            'company_name': _fresh(company),
+            'position_title': f'Software Engineer Intern {i % 50}',
+            'description': f'Software Engineer Intern at {company}',
+            'job_type': _fresh(rng.choice(JOB_TYPES)),
+            'location': _fresh(rng.choice(LOCATIONS)),
+            'eligible_years': [_fresh(year) for year in rng.choice(YEARS)],
+            'posted_date': '2026-01-15T00:00:00',
+            'application_deadline': None,
+            'application_url': f'https://jobs.example.com/{i}',
+            'is_active': True,
+            'source': _fresh(rng.choice(SOURCES)),
+        }
+
+
+def measure(count: int, as_records: bool) -> int:
+    """Return bytes held by a catalog of `count` jobs"""
+    tracemalloc.start()
+    if as_records:
+        catalog = [JobRecord(**fields) for fields in build_fields(count)]
+    else:
+        catalog = list(build_fields(count))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del catalog
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure job catalog memory')
+    parser.add_argument('--jobs', type=int, default=20000, help='Number of jobs in the catalog')
+    args = parser.parse_args()
+
+    dict_bytes = measure(args.jobs, as_records=False)
+    record_bytes = measure(args.jobs, as_records=True)
+
+    print(f"{args.jobs} jobs as dicts:      {dict_bytes / 1024 / 1024:8.2f} MB")
+    print(f"{args.jobs} jobs as JobRecords: {record_bytes / 1024 / 1024:8.2f} MB")
+    print(f"Reduction: {(1 - record_bytes / dict_bytes) * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
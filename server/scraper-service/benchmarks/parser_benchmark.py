@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parser backends over recorded pages
+
+Measures, for every backend and recorded page:
+- parse latency (document build + table row extraction), median and p95
+- memory: peak Python heap (tracemalloc) and resident-set growth while the
+  parsed document is alive (covers C-level allocations tracemalloc misses)
+
+Each backend/page pair runs in a fresh process so memory numbers are not
+polluted by earlier runs.
+
+Usage:
+    python benchmarks/parser_benchmark.py                 # all backends, all fixtures
+    python benchmarks/parser_benchmark.py -b lxml -n 50   # one backend, 50 iterations
+    python benchmarks/parser_benchmark.py --record        # refresh fixtures from live pages
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, SERVICE_DIR)
+
+# Recorded page -> (live URL, extract_table_rows keyword arguments)
+PAGES = {
+    'github_readme.html': (
+        'https://github.com/SimplifyJobs/Summer2026-Internships',
+        {'max_rows_per_table': 100},
+    ),
+    'levels_internships.html': (
+        'https://www.levels.fyi/internships/',
+        {'max_rows': 30},
+    ),
+}
+
+
+def _current_rss_kb() -> int:
+    """Current resident set size in KB (Linux only, 0 elsewhere)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return 0
+
+
+def _run_case(backend_name: str, page_name: str, iterations: int, queue):
+    """Benchmark one backend on one page (runs in a child process)"""
+    from html_parsers import get_backend
+    from scrapers import extract_table_rows
+
+    url, extract_kwargs = PAGES[page_name]
+    with open(os.path.join(FIXTURES_DIR, page_name), encoding='utf-8') as f:
+        html = f.read()
+
+    backend = get_backend(backend_name)
+
+    # Load the backend's modules before taking the RSS baseline
+    extract_table_rows(backend.parse('<table><tbody><tr><td></td></tr></tbody></table>', url))
+
+    baseline_rss_kb = _current_rss_kb()
+    document = backend.parse(html, url)
+    rows = extract_table_rows(document, **extract_kwargs)
+    rss_growth_kb = _current_rss_kb() - baseline_rss_kb
+    del document
+
+    tracemalloc.start()
+    extract_table_rows(backend.parse(html, url), **extract_kwargs)
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        extract_table_rows(backend.parse(html, url), **extract_kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    queue.put({
+        'backend': backend.name,
+        'page': page_name,
+        'bytes': len(html.encode('utf-8')),
+        'rows': len(rows),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'heap_peak_kb': round(heap_peak / 1024, 1),
+        'rss_growth_kb': rss_growth_kb,
+    })
+
+
+def run_benchmarks(backends, iterations: int):
+    """Run every backend/page combination in its own process"""
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+
+    for page_name in PAGES:
+        if not os.path.exists(os.path.join(FIXTURES_DIR, page_name)):
+            print(f"Missing fixture {page_name}, run with --record first")
+            continue
+
+        for backend_name in backends:
+            queue = ctx.Queue()
+            process = ctx.Process(target=_run_case, args=(backend_name, page_name, iterations, queue))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print(f"  ✗ {backend_name} on {page_name} failed (exit code {process.exitcode})")
+                continue
+            results.append(queue.get())
+
+    return results
+
+
+def record_fixtures():
+    """Save the live pages as fixtures"""
+    import requests
+    from html_parsers import DEFAULT_HEADERS
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for page_name, (url, _) in PAGES.items():
+        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(FIXTURES_DIR, page_name), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Recorded {url} -> {page_name} ({len(response.content)} bytes)")
+
+
+def main():
+    from html_parsers import BACKENDS
+
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends')
+    parser.add_argument('-b', '--backend', action='append', choices=sorted(BACKENDS),
+                        help='Backend to benchmark (repeatable, default: all)')
+    parser.add_argument('-n', '--iterations', type=int, default=20, help='Timed iterations per case')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--record', action='store_true', help='Refresh fixtures from live pages')
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return
+
+    results = run_benchmarks(args.backend or list(BACKENDS), max(1, args.iterations))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'page':<26}{'backend':<12}{'rows':>6}{'median ms':>12}{'p95 ms':>10}{'heap KB':>10}{'RSS KB':>10}")
+    for r in results:
+        print(f"{r['page']:<26}{r['backend']:<12}{r['rows']:>6}{r['median_ms']:>12}"
+              f"{r['p95_ms']:>10}{r['heap_peak_kb']:>10}{r['rss_growth_kb']:>10}")
+
+
+if __name__ == '__main__':
+    main()
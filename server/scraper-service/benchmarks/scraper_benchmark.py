@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Benchmark every scraper offline against recorded source responses
+
+requests.get, Scrapling's fetchers and SerpApi's GoogleSearch are replaced
+by a replayer serving the fixtures (Greenhouse and Lever board JSON, GitHub
+README HTML, the Levels.fyi page, LinkedIn and Indeed search pages, SerpApi
+Google Jobs and LinkedIn results), so whole scrapes run without network
+access, quota or state from earlier runs. The HTML pages go through the
+same parser backends as live ones (Scrapling for LinkedIn and Indeed).
+
+For every source it measures:
+- jobs emitted and jobs/sec (at the median run time)
+- per-stage latency, median and p95 over the runs, from the tracing spans
+  the scrapers already emit (fetch, parse, classify, dedup, ...); 'total'
+  is the whole scrape
+- peak memory: the peak Python heap (tracemalloc) of a whole scrape, and
+  per stage above the level at the start of the stage, from extra runs
+
+Each source runs --repeats times, each time in a fresh process like
+parser_benchmark.py, and every metric is the median over the repeats. The
+spread of a metric over the repeats (max - min, in percent of the median)
+is its noise band. Results can be saved as a baseline
+(baselines/scraper_benchmark.json); later runs print the change against
+it, and --check fails when a source emits fewer jobs than in the baseline
+or a metric got worse by more than --threshold percent plus the larger of
+the two noise bands.
+
+Usage:
+    python benchmarks/scraper_benchmark.py                    # all sources, diff against the baseline
+    python benchmarks/scraper_benchmark.py -s github -n 50    # one source, 50 runs per repeat
+    python benchmarks/scraper_benchmark.py --save-baseline    # store the results as the new baseline
+    python benchmarks/scraper_benchmark.py --check            # exit 1 on regressions
+    python benchmarks/scraper_benchmark.py --record           # refresh JSON fixtures from live APIs
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, 'baselines', 'scraper_benchmark.json')
+sys.path.insert(0, SERVICE_DIR)
+
+# URL fragment -> fixture served for it
+ROUTES = [
+    ('boards-api.greenhouse.io', 'greenhouse_board.json'),
+    ('api.lever.co', 'lever_postings.json'),
+    ('github.com', 'github_readme.html'),
+    ('levels.fyi', 'levels_internships.html'),
+    ('serpapi.com', 'serpapi_linkedin_jobs.json'),
+    ('linkedin.com', 'linkedin_search.html'),
+    ('indeed.com', 'indeed_search.html'),
+]
+GOOGLE_JOBS_FIXTURE = 'serpapi_google_jobs.json'
+
+SOURCES = ('greenhouse', 'lever', 'levels', 'github', 'linkedin_html', 'indeed', 'google', 'linkedin')
+
+# Metrics compared against the baseline: name -> whether higher is better
+COMPARED = {'median_ms': False, 'p95_ms': False, 'peak_kb': False, 'jobs_per_sec': True}
+# Smaller absolute changes are noise, however large in percent (sub-millisecond stages)
+NOISE_FLOOR = {'median_ms': 1.0, 'p95_ms': 1.0, 'peak_kb': 16.0}
+
+# Offline, stateless and deterministic: no caches, filters, watermarks,
+# breakers or retries; parsing stays in the measured process
+BENCHMARK_ENV = {
+    'SERPAPI_API_KEY': 'benchmark',
+    'SERPAPI_CACHE': '0',
+    'SERPAPI_MONTHLY_QUOTA': '1000000',
+    'SEEN_FILTER': '0',
+    'BOARD_WATERMARKS': '0',
+    'CIRCUIT_BREAKER': '0',
+    'REQUEST_MAX_ATTEMPTS': '1',
+    'PARSE_POOL_WORKERS': '1',
+    'TRACING': '0',
+    'LOG_LEVEL': 'error',
+}
+
+
+class ReplayResponse:
+    """Enough of requests.Response for the scrapers (streaming included)"""
+
+    class _Raw:
+        def __init__(self):
+            self.position = 0
+
+        def tell(self) -> int:
+            return self.position
+
+    def __init__(self, url: str, body: bytes, status_code: int = 200):
+        self.url = url
+        self.content = body
+        self.status_code = status_code
+        self.headers = {'Content-Type': 'application/json' if body[:1] in (b'{', b'[') else 'text/html'}
+        self.encoding = 'utf-8'
+        self.raw = self._Raw()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self.content), chunk_size):
+            chunk = self.content[start:start + chunk_size]
+            self.raw.position += len(chunk)
+            yield chunk
+
+    def raise_for_status(self):
+        import requests
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Replayer:
+    """Serves fixtures in place of requests.get and GoogleSearch"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.bodies = {}
+        for _, name in ROUTES:
+            with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+                self.bodies[name] = f.read()
+        with open(os.path.join(FIXTURES_DIR, GOOGLE_JOBS_FIXTURE), encoding='utf-8') as f:
+            # Recorded result pages, served in turn to successive searches
+            self.google_pages = itertools.cycle(json.load(f)['pages'])
+
+    def _body(self, url: str):
+        """Fixture body routed to a URL (None when none is)"""
+        if self.latency:
+            time.sleep(self.latency)
+        for fragment, name in ROUTES:
+            if fragment in url:
+                return self.bodies[name]
+        return None
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False, **kwargs):
+        body = self._body(url)
+        if body is None:
+            return ReplayResponse(url, b'', status_code=404)
+        return ReplayResponse(url, body)
+
+    def fetcher(self):
+        """Stand-in for Scrapling's Fetcher and StealthyFetcher: pages parsed from fixtures"""
+        replayer = self
+
+        class ReplayFetcher:
+            @staticmethod
+            def get(url, **kwargs):
+                return ReplayFetcher.fetch(url)
+
+            @staticmethod
+            def fetch(url, **kwargs):
+                from scrapling import Adaptor
+
+                body = replayer._body(url)
+                if body is None:
+                    raise RuntimeError(f"No fixture for {url}")
+                return Adaptor(body.decode('utf-8'), url=url)
+
+        return ReplayFetcher
+
+    def google_search(self, params):
+        replayer = self
+
+        class ReplayGoogleSearch:
+            def get_dict(self):
+                if replayer.latency:
+                    time.sleep(replayer.latency)
+                return json.loads(json.dumps(next(replayer.google_pages)))
+
+        return ReplayGoogleSearch()
+
+    def install(self):
+        import requests
+        import scrapling.fetchers
+        import scrapers
+
+        requests.get = self.get
+        # html_parsers imports Fetcher from scrapling.fetchers at fetch time
+        scrapling.fetchers.Fetcher = scrapers.StealthyFetcher = self.fetcher()
+        scrapers.GoogleSearch = self.google_search
+
+
+def _build_runner(source: str):
+    """A callable running one full scrape of a source"""
+    import scrapers
+    from delta_scrapers import GREENHOUSE_COMPANIES, LEVER_COMPANIES, GreenhouseScraper, LeverScraper
+    from smart_polling import SmartPollingManager
+
+    if source == 'greenhouse':
+        return lambda: GreenhouseScraper(GREENHOUSE_COMPANIES).scrape_all_boards()
+    if source == 'lever':
+        return lambda: LeverScraper(LEVER_COMPANIES).scrape_all_boards()
+    if source == 'levels':
+        # A fresh polling manager each run: every run is due and refetches
+        return lambda: scrapers.LevelsFyiScraper(SmartPollingManager()).scrape()
+    if source == 'github':
+        return lambda: scrapers.GitHubInternshipScraper().scrape()
+    if source == 'linkedin_html':
+        return lambda: scrapers.LinkedInScraper().scrape()
+    if source == 'indeed':
+        return lambda: scrapers.IndeedScraper().scrape()
+    if source == 'google':
+        return lambda: scrapers.GoogleJobsScraper().scrape()
+    if source == 'linkedin':
+        return lambda: scrapers.SerpApiLinkedInScraper().scrape()
+    raise ValueError(f"Unknown source: {source}")
+
+
+def _stage_of(event) -> str:
+    """Stage a span is reported under ('' for grouping spans such as boards)"""
+    if event['cat'] == 'fetch':
+        return 'fetch'
+    if event['cat'] == 'stage':
+        return event['name']
+    return ''
+
+
+def _percentile(values, quantile: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * quantile))]
+
+
+class StagePeaks:
+    """
+    Wraps tracing.span to record each stage's peak heap above its starting level
+
+    The heap peak is process-wide, so stages running concurrently (Google
+    queries) are charged for each other's allocations.
+    """
+
+    def __init__(self):
+        import tracing
+
+        self.peaks = {}
+        self._local = threading.local()
+        self._original = tracing.span
+        tracing.span = self.span
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = 'stage', **args):
+        stack = self._local.__dict__.setdefault('stack', [])
+        stage = _stage_of({'cat': category, 'name': name})
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # The enclosing stage's peak so far, before the reset below loses it
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        stack.append([current, 0])
+        try:
+            with self._original(name, category, **args) as span:
+                yield span
+        finally:
+            start, inner_peak = stack.pop()
+            peak = max(inner_peak, tracemalloc.get_traced_memory()[1])
+            if stage:
+                self.peaks[stage] = max(self.peaks.get(stage, 0), peak - start)
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+
+
+def _run_case(source: str, iterations: int, latency_ms: float, queue):
+    """Benchmark one source (runs in a child process)"""
+    state_dir = tempfile.mkdtemp(prefix='scraper-benchmark-')
+    os.environ.update(BENCHMARK_ENV, SCRAPER_STATE_DIR=state_dir)
+
+    from tracing import TraceSampler, TraceStore
+
+    Replayer(latency_ms).install()
+    run = _build_runner(source)
+    # Every run is traced, however loaded the machine is
+    store = TraceStore(os.path.join(state_dir, 'traces'), sampler=TraceSampler(rate=1.0, loaded_rate=1.0), keep=1)
+
+    def traced_run():
+        # Scrapers print progress; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()), store.trace(source) as trace:
+            jobs = run()
+        return jobs, trace
+
+    # Warm-up: imports, regex compilation, parser start-up
+    traced_run()
+
+    totals, stages, job_counts = [], {}, []
+    for _ in range(iterations):
+        jobs, trace = traced_run()
+        job_counts.append(len(jobs))
+        per_run = {}
+        for event in trace.events:
+            if event['cat'] == 'trace':
+                totals.append(event['dur'] / 1000)
+                continue
+            stage = _stage_of(event)
+            if stage:
+                per_run.setdefault(stage, [0.0, 0])
+                per_run[stage][0] += event['dur'] / 1000
+                per_run[stage][1] += 1
+        for stage, (elapsed_ms, calls) in per_run.items():
+            stages.setdefault(stage, []).append((elapsed_ms, calls))
+
+    tracemalloc.start()
+    traced_run()
+    total_peak = tracemalloc.get_traced_memory()[1]
+    # Stage peaks need their own run: they reset the peak at every stage
+    peaks = StagePeaks()
+    traced_run()
+    tracemalloc.stop()
+
+    median_ms = statistics.median(totals)
+    results = {'total': {
+        'calls': 1,
+        'median_ms': round(median_ms, 3),
+        'p95_ms': round(_percentile(totals, 0.95), 3),
+        'peak_kb': round(total_peak / 1024, 1),
+    }}
+    for stage, samples in sorted(stages.items()):
+        timings = [elapsed_ms for elapsed_ms, _ in samples]
+        results[stage] = {
+            'calls': round(statistics.mean(calls for _, calls in samples), 1),
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(_percentile(timings, 0.95), 3),
+            'peak_kb': round(peaks.peaks.get(stage, 0) / 1024, 1),
+        }
+
+    jobs = int(statistics.median(job_counts))
+    queue.put({
+        'source': source,
+        'jobs': jobs,
+        'jobs_per_sec': round(jobs / (median_ms / 1000), 1) if median_ms else 0.0,
+        'stages': results,
+    })
+
+
+def _median_and_noise(values):
+    """Median of the repeats' values and their spread in percent of it"""
+    middle = statistics.median(values)
+    noise = 100.0 * (max(values) - min(values)) / middle if middle else 0.0
+    return middle, round(noise, 1)
+
+
+def merge_repeats(runs):
+    """One result per source: every metric's median over the repeats, spreads under 'noise'"""
+    jobs_per_sec, jobs_per_sec_noise = _median_and_noise([run['jobs_per_sec'] for run in runs])
+    stages = {}
+    for stage in runs[0]['stages']:
+        samples = [run['stages'][stage] for run in runs if stage in run['stages']]
+        merged = {'calls': statistics.median(sample['calls'] for sample in samples), 'noise': {}}
+        for metric in ('median_ms', 'p95_ms', 'peak_kb'):
+            value, merged['noise'][metric] = _median_and_noise([sample[metric] for sample in samples])
+            merged[metric] = round(value, 3)
+        stages[stage] = merged
+    stages['total']['noise']['jobs_per_sec'] = jobs_per_sec_noise
+    return {
+        'source': runs[0]['source'],
+        'jobs': int(statistics.median(run['jobs'] for run in runs)),
+        'jobs_per_sec': round(jobs_per_sec, 1),
+        'stages': stages,
+    }
+
+
+def run_benchmarks(sources, iterations: int, latency_ms: float, repeats: int = 1):
+    """Run every source repeats times, each in its own process, and merge the repeats"""
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+
+    for source in sources:
+        runs = []
+        for _ in range(repeats):
+            queue = ctx.Queue()
+            process = ctx.Process(target=_run_case, args=(source, iterations, latency_ms, queue))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print(f"  ✗ {source} failed (exit code {process.exitcode})")
+                break
+            runs.append(queue.get())
+        if len(runs) == repeats:
+            results.append(merge_repeats(runs))
+
+    return results
+
+
+def _rows(results):
+    """(source, stage, metrics) rows; source-level jobs/sec sits on the 'total' stage"""
+    for result in results:
+        for stage, values in result['stages'].items():
+            row = dict(values)
+            if stage == 'total':
+                row.update(jobs=result['jobs'], jobs_per_sec=result['jobs_per_sec'])
+            yield result['source'], stage, row
+
+
+def compare(results, baseline, threshold: float):
+    """
+    Percent change per metric against the baseline, and the regressions
+
+    A metric regressed when it got worse by more than threshold percent
+    plus the larger noise band of the two runs (and by more than its
+    NOISE_FLOOR); a source regressed when it emits fewer jobs, which the
+    fixtures keep fixed.
+    """
+    previous = {(source, stage): row for source, stage, row in _rows(baseline['results'])}
+    changes, regressions = {}, []
+    for source, stage, row in _rows(results):
+        before = previous.get((source, stage))
+        if before is None:
+            continue
+        if row.get('jobs', 0) < before.get('jobs', 0):
+            regressions.append(f"{source} jobs: {before['jobs']} -> {row['jobs']}")
+        for metric, higher_is_better in COMPARED.items():
+            if metric not in row or not before.get(metric):
+                continue
+            change = 100.0 * (row[metric] - before[metric]) / before[metric]
+            changes[(source, stage, metric)] = change
+            worse = -change if higher_is_better else change
+            if abs(row[metric] - before[metric]) < NOISE_FLOOR.get(metric, 0):
+                continue
+            noise = max(row.get('noise', {}).get(metric, 0.0), before.get('noise', {}).get(metric, 0.0))
+            if worse > threshold + noise:
+                regressions.append(f"{source}/{stage} {metric}: {before[metric]} -> {row[metric]} ({change:+.1f}%)")
+    return changes, regressions
+
+
+def print_report(results, changes):
+    def cell(value, change, width):
+        text = f"{value}" if change is None else f"{value} ({change:+.0f}%)"
+        return f"{text:>{width}}"
+
+    print(f"{'source':<15}{'stage':<14}{'calls':>7}{'median ms':>20}{'p95 ms':>20}{'peak KB':>20}{'jobs/s':>20}")
+    for source, stage, row in _rows(results):
+        print(f"{source:<15}{stage:<14}{row['calls']:>7}"
+              f"{cell(row['median_ms'], changes.get((source, stage, 'median_ms')), 20)}"
+              f"{cell(row['p95_ms'], changes.get((source, stage, 'p95_ms')), 20)}"
+              f"{cell(row['peak_kb'], changes.get((source, stage, 'peak_kb')), 20)}"
+              + (cell(row['jobs_per_sec'], changes.get((source, stage, 'jobs_per_sec')), 20)
+                 if 'jobs_per_sec' in row else ''))
+
+
+def record_fixtures():
+    """Save live board and SerpApi responses as fixtures (SerpApi needs SERPAPI_API_KEY)"""
+    import requests
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    live = [
+        ('https://boards-api.greenhouse.io/v1/boards/stripe/jobs', None, 'greenhouse_board.json'),
+        ('https://api.lever.co/v0/postings/plaid', {'mode': 'json'}, 'lever_postings.json'),
+    ]
+    api_key = os.environ.get('SERPAPI_API_KEY') or os.environ.get('SERPAPI_KEY')
+    if api_key:
+        live.append(('https://serpapi.com/search.json',
+                     {'engine': 'linkedin_jobs', 'q': 'software engineering intern', 'api_key': api_key},
+                     'serpapi_linkedin_jobs.json'))
+    for url, params, name in live:
+        response = requests.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(FIXTURES_DIR, name), 'wb') as f:
+            f.write(response.content)
+        print(f"Recorded {url} -> {name} ({len(response.content)} bytes)")
+
+    if not api_key:
+        print("SERPAPI_API_KEY not set; keeping the SerpApi fixtures")
+        return
+    from serpapi import GoogleSearch
+    pages = []
+    for query in ('software engineering internship 2026', 'machine learning internship 2026',
+                  'data science internship 2026', 'Stripe internship 2026'):
+        pages.append(GoogleSearch({
+            'engine': 'google_jobs', 'q': query, 'hl': 'en', 'gl': 'us', 'api_key': api_key,
+        }).get_dict())
+    with open(os.path.join(FIXTURES_DIR, GOOGLE_JOBS_FIXTURE), 'w', encoding='utf-8') as f:
+        json.dump({'pages': pages}, f, indent=1)
+    print(f"Recorded {len(pages)} Google Jobs pages -> {GOOGLE_JOBS_FIXTURE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scrapers offline over recorded responses')
+    parser.add_argument('-s', '--source', action='append', choices=SOURCES,
+                        help='Source to benchmark (repeatable, default: all)')
+    parser.add_argument('-n', '--iterations', type=int, default=20, help='Timed runs per source and repeat')
+    parser.add_argument('-r', '--repeats', type=int, default=3,
+                        help='Fresh processes per source; metrics are the median over them (default: 3)')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Simulated network latency per request (default: none, CPU only)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline file to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the baseline')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with status 1 when a metric regressed or a source failed')
+    parser.add_argument('--threshold', type=float, default=30.0,
+                        help='Percent change beyond the noise band counted as a regression (default: 30)')
+    parser.add_argument('--record', action='store_true', help='Refresh JSON fixtures from live APIs')
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return
+
+    sources = args.source or list(SOURCES)
+    results = run_benchmarks(sources, max(1, args.iterations), args.latency_ms, max(1, args.repeats))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                            'cpus': os.cpu_count()},
+                'iterations': args.iterations,
+                'repeats': args.repeats,
+                'results': results,
+            }, f, indent=2)
+            f.write('\n')
+        print(f"Saved baseline to {args.baseline}")
+
+    changes, regressions = {}, []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            changes, regressions = compare(results, json.load(f), args.threshold)
+
+    if args.json:
+        print(json.dumps({'results': results, 'regressions': regressions}, indent=2))
+    else:
+        print_report(results, changes)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0f}% plus noise against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+
+    if args.check and (regressions or len(results) < len(sources)):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
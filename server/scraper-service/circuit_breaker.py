@@ -0,0 +1,136 @@
+"""
+Circuit breakers for upstream sources and job boards
+
+Each upstream (a source URL, an API endpoint, a Greenhouse/Lever board) has
+a breaker kept in its PollingMetadata, next to the status code and latency
+history the polling manager already records:
+
+- closed: calls go through; consecutive failures (connection errors, 404,
+  429, 5xx, or responses slower than slow_call_ms) are counted
+- open: after failure_threshold failures in a row, calls fail immediately
+  with CircuitOpen and cost no time at all
+- half-open: once the cooldown has passed, exactly one probe call is let
+  through; success closes the breaker, failure reopens it with a doubled
+  cooldown (up to max_cooldown_seconds)
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+import event_log
+from config import env_float, env_int
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+    def __init__(self, source_name: str):
+        super().__init__(f"circuit open for {source_name}")
+        self.source_name = source_name
+
+
+class CircuitBreaker:
+    """Closed/open/half-open policy applied to polling metadata"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        slow_call_ms: Optional[int] = 20000,
+        cooldown_seconds: float = 300,
+        max_cooldown_seconds: float = 6 * 3600
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            slow_call_ms: Successful responses slower than this count as
+                failures (None: latency is ignored)
+            cooldown_seconds: First wait before a half-open probe
+            max_cooldown_seconds: Cap for the cooldown, which doubles after
+                every failed probe
+        """
+        self.failure_threshold = failure_threshold
+        self.slow_call_ms = slow_call_ms
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+
+    @classmethod
+    def from_env(cls) -> Optional['CircuitBreaker']:
+        """Breaker configured from CIRCUIT_BREAKER_* env vars (None when CIRCUIT_BREAKER=0)"""
+        if os.environ.get('CIRCUIT_BREAKER', '1').lower() in ('0', 'false', 'no'):
+            return None
+        slow_call_ms = env_int('CIRCUIT_BREAKER_SLOW_MS', 20000)
+        return cls(
+            failure_threshold=max(1, env_int('CIRCUIT_BREAKER_FAILURES', 3)),
+            slow_call_ms=slow_call_ms or None,
+            cooldown_seconds=env_float('CIRCUIT_BREAKER_COOLDOWN_SECONDS', 300),
+            max_cooldown_seconds=env_float('CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS', 6 * 3600),
+        )
+
+    def is_failure(self, status_code: int, response_time_ms: Optional[int]) -> bool:
+        """Whether one call outcome counts against the upstream"""
+        if status_code == 0 or status_code >= 500 or status_code in (404, 410, 429):
+            return True
+        return (
+            self.slow_call_ms is not None and
+            response_time_ms is not None and
+            response_time_ms >= self.slow_call_ms
+        )
+
+    def allow(self, metadata, now: datetime) -> bool:
+        """
+        Whether a call to the upstream may go ahead now
+
+        Moves an open breaker whose cooldown has passed to half-open and
+        admits that call as the probe.
+        """
+        if metadata.breaker_state == CLOSED:
+            return True
+
+        cooldown = timedelta(seconds=metadata.breaker_cooldown_seconds or self.cooldown_seconds)
+        if metadata.breaker_state == HALF_OPEN:
+            # A probe that never reported back (crash, cancellation) is retried after a cooldown
+            if metadata.breaker_probe_at is not None and now - metadata.breaker_probe_at < cooldown:
+                return False
+        elif metadata.breaker_opened_at is not None and now - metadata.breaker_opened_at < cooldown:
+            return False
+
+        metadata.breaker_state = HALF_OPEN
+        metadata.breaker_probe_at = now
+        return True
+
+    def record(self, metadata, status_code: int, response_time_ms: Optional[int], now: datetime):
+        """Fold one call outcome into the breaker state"""
+        if not self.is_failure(status_code, response_time_ms):
+            metadata.consecutive_failures = 0
+            metadata.breaker_state = CLOSED
+            metadata.breaker_opened_at = None
+            metadata.breaker_probe_at = None
+            metadata.breaker_cooldown_seconds = None
+            return
+
+        metadata.consecutive_failures += 1
+        if metadata.breaker_state == HALF_OPEN:
+            # Failed probe: stay away twice as long
+            previous = metadata.breaker_cooldown_seconds or self.cooldown_seconds
+            self._open(metadata, now, min(previous * 2, self.max_cooldown_seconds))
+        elif metadata.breaker_state == CLOSED and metadata.consecutive_failures >= self.failure_threshold:
+            self._open(metadata, now, self.cooldown_seconds)
+
+    def release(self, metadata):
+        """Forget an admitted call that never reached the upstream (frees a half-open probe)"""
+        if metadata.breaker_state == HALF_OPEN:
+            metadata.breaker_probe_at = None
+
+    def _open(self, metadata, now: datetime, cooldown_seconds: float):
+        metadata.breaker_state = OPEN
+        metadata.breaker_opened_at = now
+        metadata.breaker_probe_at = None
+        metadata.breaker_cooldown_seconds = cooldown_seconds
+        event_log.warning('circuit.open', upstream=metadata.source_name, cooldown_seconds=cooldown_seconds,
+                          failures=metadata.consecutive_failures, last_status=metadata.last_status_code)
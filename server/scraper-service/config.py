@@ -0,0 +1,25 @@
+"""
+Numeric settings from environment variables
+
+Every tunable of the service is an env var read where it is used. A value
+that does not parse falls back to the default instead of raising, so a
+typo in a deployment degrades to default behaviour rather than failing
+imports or every request.
+"""
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    """Integer env var, or default when it is unset or not an integer"""
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Float env var, or default when it is unset or not a number"""
+    try:
+        return float(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
@@ -0,0 +1,95 @@
+"""
+Deadline budgets for scrapes
+
+A whole scrape has a latency SLO (SCRAPE_SLO_SECONDS) and every source gets
+its own budget inside it (SCRAPE_SOURCE_BUDGET_SECONDS, overridable per
+scraper with SCRAPE_SOURCE_BUDGETS). Scrapers receive a Deadline and check
+it cooperatively:
+
+- blocking calls take their timeout from deadline.timeout(default), so no
+  single fetch can outlive the budget
+- row and page loops call deadline.stop() and break when it returns True;
+  that marks the deadline truncated, and the source's partial results are
+  returned with a "truncated" marker
+"""
+import math
+import os
+import time
+from typing import Dict, Optional
+
+from config import env_float
+
+DEFAULT_SLO_SECONDS = 300.0
+DEFAULT_SOURCE_BUDGET_SECONDS = 120.0
+# Never hand a blocking call less than this, even when the budget is almost spent
+MIN_TIMEOUT_SECONDS = 1.0
+
+
+class Deadline:
+    """Monotonic time budget, optionally nested inside a parent budget"""
+
+    def __init__(self, seconds: Optional[float] = None, parent: Optional['Deadline'] = None):
+        """
+        Initialize deadline
+
+        Args:
+            seconds: Budget from now (None: unlimited apart from the parent)
+            parent: Enclosing deadline; this one never outlives it
+        """
+        expires_at = time.monotonic() + seconds if seconds is not None else math.inf
+        if parent is not None:
+            expires_at = min(expires_at, parent.expires_at)
+        self.expires_at = expires_at
+        self.truncated = False
+
+    @classmethod
+    def never(cls) -> 'Deadline':
+        return cls()
+
+    def child(self, seconds: Optional[float]) -> 'Deadline':
+        """A budget of `seconds` that also ends when this one does"""
+        return Deadline(seconds, parent=self)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def stop(self) -> bool:
+        """Whether work should stop now; marks the deadline truncated if so"""
+        if self.expired():
+            self.truncated = True
+            return True
+        return False
+
+    def timeout(self, default: float) -> float:
+        """Timeout for one blocking call: default, capped by the remaining budget"""
+        if self.expires_at == math.inf:
+            return default
+        return max(MIN_TIMEOUT_SECONDS, min(default, self.remaining()))
+
+
+def scrape_slo_seconds() -> float:
+    """Latency SLO for a whole scrape (SCRAPE_SLO_SECONDS; 0 disables it)"""
+    return env_float('SCRAPE_SLO_SECONDS', DEFAULT_SLO_SECONDS)
+
+
+def source_budgets() -> Dict[str, float]:
+    """Per-scraper overrides from SCRAPE_SOURCE_BUDGETS ('GoogleJobsScraper=60,LeverScraper=30')"""
+    budgets = {}
+    for item in os.environ.get('SCRAPE_SOURCE_BUDGETS', '').split(','):
+        name, _, seconds = item.partition('=')
+        try:
+            budgets[name.strip()] = float(seconds)
+        except ValueError:
+            continue
+    return budgets
+
+
+def source_budget_seconds(source: str) -> float:
+    """Budget for one source (its override, else SCRAPE_SOURCE_BUDGET_SECONDS)"""
+    override = source_budgets().get(source)
+    if override is not None:
+        return override
+    return env_float('SCRAPE_SOURCE_BUDGET_SECONDS', DEFAULT_SOURCE_BUDGET_SECONDS)
@@ -2,16 +2,122 @@
 Delta-friendly scrapers for job board APIs (Greenhouse, Lever, Workday, etc.)
 
 These scrapers leverage:
-- API timestamps (updated_at fields)
-- Structured JSON responses
+- API timestamps (updated_at fields) against per-board watermarks
+- Structured JSON responses, decoded item by item from the response stream
 - Content hashing for HTML sources
 """
 import hashlib
 import json
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import requests
-from scrapling.fetchers import Fetcher
+from circuit_breaker import CircuitOpen
+from deadlines import Deadline
+from html_parsers import fetch_document
+from job_record import JobRecord
+from json_stream import contains_any, iter_response_items
+import event_log
+import metrics
+import tracing
+from request_policy import RequestPolicy
+from smart_polling import SmartPollingManager
+from watermarks import PendingWatermarks, WatermarkStore, parse_timestamp
+
+INTERNSHIP_KEYWORDS = ['intern', 'co-op', 'coop']
+
+# Boards can list thousands of postings; only decode ones mentioning an internship
+_internship_prefilter = contains_any(INTERNSHIP_KEYWORDS)
+
+# Called once per successfully fetched board with (board, jobs, complete)
+BoardCallback = Callable[[str, List[JobRecord], bool], None]
+
+
+def _scrape_board(
+    scraper,
+    company: str,
+    board_since: Optional[datetime],
+    deadline: Deadline,
+    breakers: Optional[SmartPollingManager],
+    policy: RequestPolicy,
+    watermarks: Optional[Union[WatermarkStore, PendingWatermarks]],
+    on_board: Optional[BoardCallback]
+) -> Optional[List[JobRecord]]:
+    """Fetch, parse and report one board (None when the board was skipped or failed)"""
+    url = scraper._build_api_url(company)
+    breaker = breakers.guard(url, f"{scraper.KIND}/{company}") if breakers is not None else nullcontext()
+    try:
+        with breaker:
+            jobs = policy.execute(
+                url,
+                lambda timeout: scraper._fetch_internships(company, since=board_since, timeout=timeout),
+                deadline=deadline
+            )
+    except CircuitOpen:
+        event_log.info('board.skipped', kind=scraper.KIND, board=company, reason='circuit open')
+        return None
+    except Exception as e:
+        # Failed boards keep their watermark and are retried next run
+        event_log.error('board.failed', kind=scraper.KIND, board=company, error=str(e))
+        return None
+
+    with metrics.timed('scraper_parse_seconds'), tracing.span('parse', jobs=len(jobs)):
+        parsed_jobs = [scraper.parse_job(job, company) for job in jobs]
+    if watermarks is not None:
+        watermarks.advance(
+            scraper.KIND, company,
+            (scraper._updated_at(job) for job in jobs),
+            full=board_since is None
+        )
+    if on_board is not None:
+        on_board(company, parsed_jobs, board_since is None)
+    return parsed_jobs
+
+
+def _scrape_boards(
+    scraper,
+    since: Optional[datetime],
+    watermarks: Optional[Union[WatermarkStore, PendingWatermarks]],
+    on_board: Optional[BoardCallback],
+    deadline: Optional[Deadline] = None,
+    breakers: Optional[SmartPollingManager] = None,
+    policy: Optional[RequestPolicy] = None
+) -> List[JobRecord]:
+    """
+    Scrape every board of a Greenhouse/Lever scraper
+
+    With watermarks, each board is fetched after its own watermark (or in
+    full when a reconcile is due) and its watermark advances once the fetch
+    succeeded. Advances are not saved here: the caller saves the store, or
+    commits PendingWatermarks once the scrape's result is stored. A board
+    fetched without a cutoff is a complete listing.
+    Boards not reached before the deadline keep their watermark, and so do
+    boards whose circuit breaker is open (they are skipped without a request).
+    Each board fetch is retried (and hedged) by the request policy.
+    """
+    all_jobs = []
+    deadline = deadline or Deadline.never()
+    policy = policy or RequestPolicy(max_attempts=1)
+
+    for company in scraper.company_boards:
+        if deadline.stop():
+            event_log.warning('board.deadline', kind=scraper.KIND, skipped_from=company)
+            break
+        board_since = watermarks.since(scraper.KIND, company) if watermarks is not None else since
+        mode = 'full reconcile' if board_since is None else f'updated after {board_since.isoformat()}'
+        event_log.info('board.start', kind=scraper.KIND, board=company, mode=mode)
+
+        with tracing.span(company, 'board', kind=scraper.KIND):
+            parsed_jobs = _scrape_board(
+                scraper, company, board_since, deadline, breakers, policy, watermarks, on_board
+            )
+        if parsed_jobs is None:
+            continue
+
+        all_jobs.extend(parsed_jobs)
+        event_log.info('board.done', kind=scraper.KIND, board=company, jobs=len(parsed_jobs))
+
+    return all_jobs
 
 
 class GreenhouseScraper:
@@ -24,6 +130,8 @@ class GreenhouseScraper:
     - Consistent job IDs
     """
 
+    KIND = 'greenhouse'
+
     def __init__(self, company_boards: Optional[List[str]] = None):
         """
         Initialize Greenhouse scraper
@@ -43,49 +151,51 @@ class GreenhouseScraper:
 
         Args:
             company: Company subdomain (e.g., 'meta')
-            since: Only return jobs updated since this datetime (delta)
+            since: Only return jobs updated after this datetime (naive UTC, delta)
 
         Returns:
             List of job dictionaries with updated_at timestamps
         """
-        url = self._build_api_url(company)
-
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            return self._fetch_internships(company, since)
+        except Exception as e:
+            event_log.error('board.failed', kind='greenhouse', board=company, error=str(e))
+            return []
+
+    def _fetch_internships(self, company: str, since: Optional[datetime] = None,
+                           timeout: float = 30) -> List[Dict]:
+        """fetch_jobs without error handling"""
+        filtered_jobs = []
 
-            jobs = data.get('jobs', [])
+        with metrics.fetching() as fetch, \
+                requests.get(self._build_api_url(company), timeout=timeout, stream=True) as response:
+            response.raise_for_status()
 
             # Filter internships and apply delta filter
-            filtered_jobs = []
-            for job in jobs:
+            for job in iter_response_items(response, key='jobs', prefilter=_internship_prefilter):
                 title = job.get('title', '').lower()
 
                 # Check if internship
-                if not any(keyword in title for keyword in ['intern', 'co-op', 'coop']):
+                if not any(keyword in title for keyword in INTERNSHIP_KEYWORDS):
                     continue
 
                 # Apply delta filter if since timestamp provided
                 if since:
-                    updated_at_str = job.get('updated_at')
-                    if updated_at_str:
-                        # Parse ISO timestamp
-                        updated_at = datetime.fromisoformat(
-                            updated_at_str.replace('Z', '+00:00')
-                        )
-                        if updated_at < since:
-                            continue
+                    updated_at = parse_timestamp(self._updated_at(job))
+                    if updated_at is not None and updated_at <= since:
+                        continue
 
                 filtered_jobs.append(job)
 
-            return filtered_jobs
+            fetch['bytes'] = metrics.bytes_read(response)
 
-        except Exception as e:
-            print(f"Error fetching Greenhouse jobs for {company}: {e}")
-            return []
+        return filtered_jobs
 
-    def parse_job(self, job: Dict, company: str) -> Dict:
+    @staticmethod
+    def _updated_at(job: Dict):
+        return job.get('updated_at')
+
+    def parse_job(self, job: Dict, company: str) -> JobRecord:
         """Parse Greenhouse job into standard format"""
         job_id = job.get('id')
         title = job.get('title', '').strip()
@@ -102,20 +212,20 @@ class GreenhouseScraper:
         # Updated timestamp
         updated_at = job.get('updated_at', datetime.utcnow().isoformat())
 
-        return {
-            'id': f'greenhouse-{company}-{job_id}',
-            'company_name': company.title(),
-            'position_title': title,
-            'description': f'{title} at {company.title()}',
-            'job_type': self._categorize_from_title(title),
-            'location': location,
-            'eligible_years': ['Sophomore', 'Junior', 'Senior'],
-            'posted_date': updated_at,
-            'updated_at': updated_at,  # Important for delta detection
-            'application_url': absolute_url,
-            'is_active': True,
-            'source': 'greenhouse',
-        }
+        return JobRecord(
+            id=f'greenhouse-{company}-{job_id}',
+            company_name=company.title(),
+            position_title=title,
+            description=f'{title} at {company.title()}',
+            job_type=self._categorize_from_title(title),
+            location=location,
+            eligible_years=['Sophomore', 'Junior', 'Senior'],
+            posted_date=updated_at,
+            updated_at=updated_at,  # Important for delta detection
+            application_url=absolute_url,
+            is_active=True,
+            source='greenhouse',
+        )
 
     def _categorize_from_title(self, title: str) -> str:
         """Simple job type categorization"""
@@ -134,18 +244,31 @@ class GreenhouseScraper:
         else:
             return 'Software Engineering'
 
-    def scrape_all_boards(self, since: Optional[datetime] = None) -> List[Dict]:
-        """Scrape all configured Greenhouse boards"""
-        all_jobs = []
+    def scrape_all_boards(
+        self,
+        since: Optional[datetime] = None,
+        watermarks: Optional[Union[WatermarkStore, PendingWatermarks]] = None,
+        on_board: Optional[BoardCallback] = None,
+        deadline: Optional[Deadline] = None,
+        breakers: Optional[SmartPollingManager] = None,
+        policy: Optional[RequestPolicy] = None
+    ) -> List[JobRecord]:
+        """
+        Scrape all configured Greenhouse boards
 
-        for company in self.company_boards:
-            print(f"  Scraping Greenhouse: {company}")
-            jobs = self.fetch_jobs(company, since=since)
-            parsed_jobs = [self.parse_job(job, company) for job in jobs]
-            all_jobs.extend(parsed_jobs)
-            print(f"    Found {len(parsed_jobs)} internships")
+        Args:
+            since: Fixed delta cutoff for every board (ignored with watermarks)
+            watermarks: Per-board watermarks (a store, or one scrape's
+                PendingWatermarks); overrides since. Not saved here
+            on_board: Called with (board, jobs, complete) after each board
+            deadline: Budget for all boards; boards left when it runs out are skipped
+            breakers: Polling manager whose circuit breakers guard each board
+            policy: Retry/hedging policy for board fetches (default: one attempt)
 
-        return all_jobs
+        Returns:
+            Jobs from all boards
+        """
+        return _scrape_boards(self, since, watermarks, on_board, deadline, breakers, policy)
 
 
 class LeverScraper:
@@ -158,6 +281,8 @@ class LeverScraper:
     - Team/department filtering
     """
 
+    KIND = 'lever'
+
     def __init__(self, company_boards: Optional[List[str]] = None):
         """
         Initialize Lever scraper
@@ -177,25 +302,32 @@ class LeverScraper:
 
         Args:
             company: Company identifier
-            since: Only return jobs updated since this datetime
+            since: Only return jobs updated after this datetime (naive UTC)
 
         Returns:
             List of job dictionaries
         """
+        try:
+            return self._fetch_internships(company, since)
+        except Exception as e:
+            event_log.error('board.failed', kind='lever', board=company, error=str(e))
+            return []
+
+    def _fetch_internships(self, company: str, since: Optional[datetime] = None,
+                           timeout: float = 30) -> List[Dict]:
+        """fetch_jobs without error handling"""
         url = self._build_api_url(company)
-        params = {'mode': 'json'}
+        filtered_jobs = []
 
-        try:
-            response = requests.get(url, params=params, timeout=30)
+        with metrics.fetching() as fetch, \
+                requests.get(url, params={'mode': 'json'}, timeout=timeout, stream=True) as response:
             response.raise_for_status()
-            jobs = response.json()
 
             # Filter internships and apply delta
-            filtered_jobs = []
-            for job in jobs:
+            for job in iter_response_items(response, prefilter=_internship_prefilter):
                 text = job.get('text', '').lower()
-                categories = job.get('categories', {})
-                commitment = categories.get('commitment', '').lower()
+                categories = job.get('categories') or {}
+                commitment = (categories.get('commitment') or '').lower()
 
                 # Check if internship
                 is_internship = (
@@ -207,23 +339,24 @@ class LeverScraper:
                 if not is_internship:
                     continue
 
-                # Apply delta filter
+                # Apply delta filter on the update time (edits, not just new postings)
                 if since:
-                    created_at_ts = job.get('createdAt')
-                    if created_at_ts:
-                        created_at = datetime.fromtimestamp(created_at_ts / 1000)
-                        if created_at < since:
-                            continue
+                    updated_at = parse_timestamp(self._updated_at(job))
+                    if updated_at is not None and updated_at <= since:
+                        continue
 
                 filtered_jobs.append(job)
 
-            return filtered_jobs
+            fetch['bytes'] = metrics.bytes_read(response)
 
-        except Exception as e:
-            print(f"Error fetching Lever jobs for {company}: {e}")
-            return []
+        return filtered_jobs
 
-    def parse_job(self, job: Dict, company: str) -> Dict:
+    @staticmethod
+    def _updated_at(job: Dict):
+        """Epoch milliseconds of the last update (createdAt for never-edited postings)"""
+        return job.get('updatedAt') or job.get('createdAt')
+
+    def parse_job(self, job: Dict, company: str) -> JobRecord:
         """Parse Lever job into standard format"""
         job_id = job.get('id')
         title = job.get('text', '').strip()
@@ -233,23 +366,25 @@ class LeverScraper:
         location = categories.get('location', 'Various')
         team = categories.get('team', 'Engineering')
 
-        created_at_ts = job.get('createdAt', 0)
-        created_at = datetime.fromtimestamp(created_at_ts / 1000).isoformat() if created_at_ts else datetime.utcnow().isoformat()
-
-        return {
-            'id': f'lever-{company}-{job_id}',
-            'company_name': company.title(),
-            'position_title': title,
-            'description': job.get('descriptionPlain', '')[:500],
-            'job_type': self._categorize_from_title(title),
-            'location': location,
-            'eligible_years': ['Sophomore', 'Junior', 'Senior'],
-            'posted_date': created_at,
-            'updated_at': created_at,
-            'application_url': apply_url,
-            'is_active': True,
-            'source': 'lever',
-        }
+        created_at = parse_timestamp(job.get('createdAt'))
+        created_at = (created_at or datetime.utcnow()).isoformat()
+        updated_at = parse_timestamp(self._updated_at(job))
+        updated_at = updated_at.isoformat() if updated_at else created_at
+
+        return JobRecord(
+            id=f'lever-{company}-{job_id}',
+            company_name=company.title(),
+            position_title=title,
+            description=job.get('descriptionPlain', '')[:500],
+            job_type=self._categorize_from_title(title),
+            location=location,
+            eligible_years=['Sophomore', 'Junior', 'Senior'],
+            posted_date=created_at,
+            updated_at=updated_at,
+            application_url=apply_url,
+            is_active=True,
+            source='lever',
+        )
 
     def _categorize_from_title(self, title: str) -> str:
         """Simple job type categorization"""
@@ -266,18 +401,31 @@ class LeverScraper:
         else:
             return 'Software Engineering'
 
-    def scrape_all_boards(self, since: Optional[datetime] = None) -> List[Dict]:
-        """Scrape all configured Lever boards"""
-        all_jobs = []
+    def scrape_all_boards(
+        self,
+        since: Optional[datetime] = None,
+        watermarks: Optional[Union[WatermarkStore, PendingWatermarks]] = None,
+        on_board: Optional[BoardCallback] = None,
+        deadline: Optional[Deadline] = None,
+        breakers: Optional[SmartPollingManager] = None,
+        policy: Optional[RequestPolicy] = None
+    ) -> List[JobRecord]:
+        """
+        Scrape all configured Lever boards
 
-        for company in self.company_boards:
-            print(f"  Scraping Lever: {company}")
-            jobs = self.fetch_jobs(company, since=since)
-            parsed_jobs = [self.parse_job(job, company) for job in jobs]
-            all_jobs.extend(parsed_jobs)
-            print(f"    Found {len(parsed_jobs)} internships")
+        Args:
+            since: Fixed delta cutoff for every board (ignored with watermarks)
+            watermarks: Per-board watermarks (a store, or one scrape's
+                PendingWatermarks); overrides since. Not saved here
+            on_board: Called with (board, jobs, complete) after each board
+            deadline: Budget for all boards; boards left when it runs out are skipped
+            breakers: Polling manager whose circuit breakers guard each board
+            policy: Retry/hedging policy for board fetches (default: one attempt)
 
-        return all_jobs
+        Returns:
+            Jobs from all boards
+        """
+        return _scrape_boards(self, since, watermarks, on_board, deadline, breakers, policy)
 
 
 class WorkdayScraper:
@@ -325,7 +473,7 @@ class WorkdayScraper:
             Tuple of (new/changed jobs, current hashes)
         """
         try:
-            page = Fetcher.get(url, timeout=30)
+            page = fetch_document(url, 'workday')
 
             # Parse jobs from page (Workday uses specific structure)
             jobs = []
@@ -365,33 +513,34 @@ class WorkdayScraper:
                     jobs.append(job)
 
                 except Exception as e:
-                    print(f"  Error parsing Workday job: {e}")
+                    event_log.warning('parse_error', sample=True, item='job', company=company, error=str(e))
                     continue
 
             if previous_hashes is not None:
-                print(f"  {company} (Workday): {len(new_or_changed_jobs)} new/changed out of {len(jobs)} total")
+                event_log.info('board.done', kind='workday', board=company,
+                               jobs=len(jobs), changed=len(new_or_changed_jobs))
 
             return new_or_changed_jobs, current_hashes
 
         except Exception as e:
-            print(f"Error fetching Workday jobs for {company}: {e}")
+            event_log.error('board.failed', kind='workday', board=company, error=str(e))
             return [], set()
 
-    def parse_job(self, job: Dict, company: str) -> Dict:
+    def parse_job(self, job: Dict, company: str) -> JobRecord:
         """Parse Workday job into standard format"""
-        return {
-            'id': f'workday-{company.lower().replace(" ", "-")}-{job["id"]}',
-            'company_name': company,
-            'position_title': job['title'],
-            'description': f'{job["title"]} at {company}',
-            'job_type': 'Software Engineering',
-            'location': job['location'],
-            'eligible_years': ['Sophomore', 'Junior', 'Senior'],
-            'posted_date': datetime.utcnow().isoformat(),
-            'application_url': '',
-            'is_active': True,
-            'source': 'workday',
-        }
+        return JobRecord(
+            id=f'workday-{company.lower().replace(" ", "-")}-{job["id"]}',
+            company_name=company,
+            position_title=job['title'],
+            description=f'{job["title"]} at {company}',
+            job_type='Software Engineering',
+            location=job['location'],
+            eligible_years=['Sophomore', 'Junior', 'Senior'],
+            posted_date=datetime.utcnow().isoformat(),
+            application_url='',
+            is_active=True,
+            source='workday',
+        )
 
 
 # Pre-configured company lists for major tech companies
@@ -0,0 +1,229 @@
+"""
+Structured event logging for hot paths
+
+Per-row debug output and per-item parse errors used to be print() calls,
+one unbuffered write syscall each (the Dockerfile sets PYTHONUNBUFFERED=1).
+Events replace them:
+
+    event_log.warning('parse_error', sample=True, error=str(e))
+    if event_log.enabled(event_log.DEBUG):
+        event_log.debug('github.row', company=company, role=role)
+
+- level gating: below LOG_LEVEL (debug, info, warning, error, off;
+  default info) a call returns after one integer comparison, before any
+  formatting. Hot loops that would build expensive fields check enabled()
+  first, so a disabled level costs nothing but that comparison.
+- sampling: events logged with sample=True (repeated parse errors) are
+  rate limited per event name and source to LOG_SAMPLE_BURST per
+  LOG_SAMPLE_WINDOW_SECONDS; the next event logged after a quiet period
+  reports how many were suppressed.
+- output: one line per event on stdout, JSON (LOG_FORMAT=json) or
+  `level event key=value` text (default). Lines are buffered and written
+  together once the buffer fills, a second has passed, a warning or error
+  arrives, or flush() is called (the end of every scrape, and exit).
+
+Events carry the source being scraped (metrics.current_source, left out
+outside a scrape), so call sites do not pass it.
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import env_float
+from metrics import current_source
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning', ERROR: 'error'}
+
+# Buffered output is written once it reaches this size or age
+FLUSH_BYTES = 64 * 1024
+FLUSH_SECONDS = 1.0
+
+
+class EventSampler:
+    """Token bucket per event key: a burst of events per window, the rest counted"""
+
+    def __init__(self, burst: int = 5, window_seconds: float = 60.0):
+        """
+        Initialize sampler
+
+        Args:
+            burst: Events of one key logged per window
+            window_seconds: Window length
+        """
+        self.burst = burst
+        self.window_seconds = window_seconds
+        # key -> [window start, logged in window, suppressed in window]
+        self._windows: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, key: Tuple, now: float) -> Tuple[bool, int]:
+        """Whether to log an event of key, and how many were suppressed before it"""
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                return True, suppressed
+            if window[1] < self.burst:
+                window[1] += 1
+                return True, 0
+            window[2] += 1
+            return False, 0
+
+
+class EventLog:
+    """Level-gated, sampled, buffered event writer"""
+
+    def __init__(self, level: int = INFO, json_format: bool = False,
+                 sampler: Optional[EventSampler] = None, stream=None):
+        """
+        Initialize event log
+
+        Args:
+            level: Lowest level written
+            json_format: JSON lines instead of `level event key=value` text
+            sampler: Rate limit for events logged with sample=True
+            stream: Where lines go (default: sys.stdout at write time)
+        """
+        self.level = level
+        self.json_format = json_format
+        self.sampler = sampler or EventSampler()
+        self.stream = stream
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self._buffered_since = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'EventLog':
+        """Event log configured from LOG_* env vars"""
+        return cls(
+            level=LEVELS.get(os.environ.get('LOG_LEVEL', 'info').lower(), INFO),
+            json_format=os.environ.get('LOG_FORMAT', 'text').lower() == 'json',
+            sampler=EventSampler(
+                burst=int(env_float('LOG_SAMPLE_BURST', 5)),
+                window_seconds=env_float('LOG_SAMPLE_WINDOW_SECONDS', 60),
+            ),
+        )
+
+    def log(self, level: int, event: str, sample: bool = False, **fields):
+        if level < self.level:
+            return
+        source = current_source.get()
+        now = time.time()
+        if sample:
+            admitted, suppressed = self.sampler.admit((event, source), now)
+            if not admitted:
+                return
+            if suppressed:
+                fields['suppressed'] = suppressed
+        self._write(self._format(level, event, source, now, fields), flush=level >= WARNING)
+
+    def _format(self, level: int, event: str, source: str, now: float, fields: Dict) -> str:
+        if self.json_format:
+            record = {
+                'ts': datetime.utcfromtimestamp(now).isoformat(timespec='milliseconds') + 'Z',
+                'level': LEVEL_NAMES.get(level, str(level)),
+                'event': event,
+            }
+            if source != 'none':
+                record['source'] = source
+            record.update(fields)
+            return json.dumps(record, default=str, ensure_ascii=False)
+        parts = [f"{LEVEL_NAMES.get(level, level):<7}", event]
+        if source != 'none':
+            parts.append(f"source={source}")
+        parts.extend(f"{key}={value!r}" if isinstance(value, str) else f"{key}={value}"
+                     for key, value in fields.items())
+        return ' '.join(parts)
+
+    def _write(self, line: str, flush: bool = False):
+        with self._lock:
+            if not self._buffer:
+                self._buffered_since = time.monotonic()
+            self._buffer.append(line)
+            self._buffered_bytes += len(line) + 1
+            if (flush or self._buffered_bytes >= FLUSH_BYTES or
+                    time.monotonic() - self._buffered_since >= FLUSH_SECONDS):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        data = '\n'.join(self._buffer) + '\n'
+        self._buffer.clear()
+        self._buffered_bytes = 0
+        stream = self.stream or sys.stdout
+        try:
+            stream.write(data)
+            stream.flush()
+        except (OSError, ValueError):  # closed stream at shutdown
+            pass
+
+
+_shared_log: Optional[EventLog] = None
+_shared_log_lock = threading.Lock()
+
+
+def get_event_log() -> EventLog:
+    """
+    Get the process-wide event log
+
+    Configured with LOG_LEVEL (default info), LOG_FORMAT (text or json),
+    LOG_SAMPLE_BURST (default 5) and LOG_SAMPLE_WINDOW_SECONDS (default 60).
+    """
+    global _shared_log
+
+    with _shared_log_lock:
+        if _shared_log is None:
+            _shared_log = EventLog.from_env()
+            atexit.register(_shared_log.flush)
+        return _shared_log
+
+
+def _log() -> EventLog:
+    # Skips the lock once the shared log exists; these run in hot loops
+    return _shared_log or get_event_log()
+
+
+def enabled(level: int) -> bool:
+    """Whether events of level are written (check before building costly fields)"""
+    return level >= _log().level
+
+
+def debug(event: str, sample: bool = False, **fields):
+    _log().log(DEBUG, event, sample, **fields)
+
+
+def info(event: str, sample: bool = False, **fields):
+    _log().log(INFO, event, sample, **fields)
+
+
+def warning(event: str, sample: bool = False, **fields):
+    _log().log(WARNING, event, sample, **fields)
+
+
+def error(event: str, sample: bool = False, **fields):
+    _log().log(ERROR, event, sample, **fields)
+
+
+def flush():
+    """Write out buffered events"""
+    if _shared_log is not None:
+        _shared_log.flush()
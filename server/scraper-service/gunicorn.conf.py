@@ -0,0 +1,47 @@
+"""
+gunicorn settings for the scraper service
+
+Several threaded request workers serve reads from the shared JobStore; the
+master also runs one scrape worker process (scrape_worker.py) so long
+scrapes never occupy a request worker. On shutdown request workers finish
+in-flight requests within graceful_timeout, then the scrape worker gets
+SIGTERM and SCRAPE_WORKER_GRACE_SECONDS to finish its scrape.
+
+Environment: PORT, WEB_CONCURRENCY (worker processes, default 2),
+GUNICORN_THREADS (threads per worker, default 8),
+SCRAPE_WORKER_GRACE_SECONDS (default 20), SCRAPE_WORKER=0 to run the scrape
+worker elsewhere (e.g. its own container).
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '3002')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+# Worker heartbeat timeout; with gthread, requests waiting for a first scrape
+# (up to SCRAPE_WAIT_SECONDS) run in request threads and do not trip it
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
+
+_supervisor = None
+
+
+def on_starting(server):
+    global _supervisor
+
+    if os.environ.get('SCRAPE_WORKER', '1').lower() in ('0', 'false', 'no', 'off'):
+        return
+
+    from scrape_worker import ScrapeWorkerSupervisor
+
+    _supervisor = ScrapeWorkerSupervisor(
+        grace_seconds=float(os.environ.get('SCRAPE_WORKER_GRACE_SECONDS', '20'))
+    )
+    _supervisor.start()
+
+
+def on_exit(server):
+    if _supervisor is not None:
+        _supervisor.stop()
@@ -0,0 +1,261 @@
+"""
+Pluggable HTML parser backends for the HTML scrapers
+
+Every backend exposes the same small node API used by the scrapers:
+- node.css(selector) -> List[node]
+- node.css_first(selector) -> Optional[node]
+- node.text -> full text content of the node (including descendants)
+- node.attrs -> dict of attributes
+
+Backends:
+- scrapling: Scrapling Adaptor/Fetcher (default; needed for StealthyFetcher pages)
+- lxml: lxml.html with cached compiled CSS selectors (fast, for static tables)
+- selectolax: selectolax Lexbor parser (fastest, optional dependency)
+
+The backend is selectable per source with HTML_PARSER_<SOURCE> (e.g.
+HTML_PARSER_GITHUB=selectolax) or globally with HTML_PARSER.
+"""
+import os
+import threading
+from typing import Dict, List, Optional
+import requests
+
+import event_log
+import metrics
+
+
+DEFAULT_BACKEND = 'scrapling'
+
+# Static table sources default to the lightweight backend
+DEFAULT_SOURCE_BACKENDS = {
+    'github': 'lxml',
+    'levels': 'lxml',
+}
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; InternshipScraper/1.0)',
+}
+
+
+class ScraplingNode:
+    """Node wrapper around a Scrapling Adaptor"""
+
+    __slots__ = ('_adaptor',)
+
+    def __init__(self, adaptor):
+        self._adaptor = adaptor
+
+    def css(self, selector: str) -> List['ScraplingNode']:
+        return [ScraplingNode(elem) for elem in self._adaptor.css(selector)]
+
+    def css_first(self, selector: str) -> Optional['ScraplingNode']:
+        elem = self._adaptor.css_first(selector)
+        return ScraplingNode(elem) if elem is not None else None
+
+    @property
+    def text(self) -> str:
+        # get_all_text() only joins descendant elements' text and drops the
+        # node's own text (<td>Coinbase</td> -> ''); every text node is
+        return ''.join(self._adaptor.xpath('.//text()'))
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return dict(self._adaptor.attrib)
+
+
+class LxmlNode:
+    """Node wrapper around an lxml.html element"""
+
+    __slots__ = ('_elem',)
+
+    # Compiled selectors are shared by every document
+    _selectors: Dict[str, object] = {}
+    _selectors_lock = threading.Lock()
+
+    def __init__(self, elem):
+        self._elem = elem
+
+    @classmethod
+    def _compile(cls, selector: str):
+        compiled = cls._selectors.get(selector)
+        if compiled is None:
+            from lxml.cssselect import CSSSelector
+            compiled = CSSSelector(selector)
+            with cls._selectors_lock:
+                cls._selectors[selector] = compiled
+        return compiled
+
+    def css(self, selector: str) -> List['LxmlNode']:
+        return [LxmlNode(elem) for elem in self._compile(selector)(self._elem)]
+
+    def css_first(self, selector: str) -> Optional['LxmlNode']:
+        matches = self._compile(selector)(self._elem)
+        return LxmlNode(matches[0]) if matches else None
+
+    @property
+    def text(self) -> str:
+        return self._elem.text_content()
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return dict(self._elem.attrib)
+
+
+class SelectolaxNode:
+    """Node wrapper around a selectolax node"""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def css(self, selector: str) -> List['SelectolaxNode']:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def css_first(self, selector: str) -> Optional['SelectolaxNode']:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True) or ''
+
+    @property
+    def attrs(self) -> Dict[str, str]:
+        return {key: value or '' for key, value in self._node.attributes.items()}
+
+
+class HTMLParserBackend:
+    """Base class for parser backends"""
+
+    name = ''
+
+    def parse(self, html: str, url: str = ''):
+        """Parse an HTML document and return its root node"""
+        raise NotImplementedError
+
+    def fetch(self, url: str, timeout: int = 30):
+        """Fetch a static page and parse it"""
+        with metrics.fetching() as fetch:
+            response = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
+            response.raise_for_status()
+            fetch['bytes'] = len(response.content)
+        return self.parse(response.text, url)
+
+    def from_scrapling(self, page):
+        """Convert a page returned by a Scrapling fetcher"""
+        return self.parse(page.html_content, getattr(page, 'url', '') or '')
+
+
+class ScraplingBackend(HTMLParserBackend):
+    """Scrapling Adaptor backend (keeps Scrapling's fetcher and headers)"""
+
+    name = 'scrapling'
+
+    def parse(self, html: str, url: str = ''):
+        from scrapling import Adaptor
+        return ScraplingNode(Adaptor(html, url=url or None))
+
+    def fetch(self, url: str, timeout: int = 30):
+        from scrapling.fetchers import Fetcher
+        with metrics.fetching():
+            page = Fetcher.get(url, timeout=timeout)
+        return ScraplingNode(page)
+
+    def from_scrapling(self, page):
+        return ScraplingNode(page)
+
+
+class LxmlBackend(HTMLParserBackend):
+    """lxml.html backend"""
+
+    name = 'lxml'
+
+    def parse(self, html: str, url: str = ''):
+        import lxml.html
+        return LxmlNode(lxml.html.document_fromstring(html, base_url=url or None))
+
+
+class SelectolaxBackend(HTMLParserBackend):
+    """selectolax (Lexbor) backend"""
+
+    name = 'selectolax'
+
+    def parse(self, html: str, url: str = ''):
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxNode(LexborHTMLParser(html).root)
+
+
+BACKENDS = {
+    'scrapling': ScraplingBackend,
+    'lxml': LxmlBackend,
+    'selectolax': SelectolaxBackend,
+}
+
+_instances: Dict[str, HTMLParserBackend] = {}
+
+
+def _backend_available(name: str) -> bool:
+    """Check that a backend's optional dependency is importable"""
+    modules = {
+        'scrapling': 'scrapling',
+        'lxml': 'lxml.cssselect',
+        'selectolax': 'selectolax.lexbor',
+    }
+    try:
+        __import__(modules[name])
+        return True
+    except ImportError:
+        return False
+
+
+def get_backend(name: str) -> HTMLParserBackend:
+    """
+    Get a parser backend by name
+
+    Falls back to lxml, then scrapling, when the requested backend's
+    dependency is not installed.
+
+    Raises:
+        ValueError: Unknown backend name
+        RuntimeError: None of the fallback backends is installed either
+    """
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+
+    if name not in _instances:
+        resolved = name
+        if not _backend_available(resolved):
+            resolved = next(
+                (candidate for candidate in ('lxml', 'scrapling') if _backend_available(candidate)),
+                None
+            )
+            if resolved is None:
+                raise RuntimeError(
+                    f"HTML parser backend '{name}' is not installed, and neither is lxml or scrapling"
+                )
+            event_log.warning('parser.fallback', backend=name, using=resolved)
+        _instances[name] = BACKENDS[resolved]()
+
+    return _instances[name]
+
+
+def get_parser(source: str) -> HTMLParserBackend:
+    """
+    Get the parser backend configured for a source
+
+    Args:
+        source: Source key (e.g. 'github', 'levels', 'linkedin', 'indeed', 'workday')
+    """
+    name = (
+        os.environ.get(f"HTML_PARSER_{source.upper()}") or
+        os.environ.get('HTML_PARSER') or
+        DEFAULT_SOURCE_BACKENDS.get(source, DEFAULT_BACKEND)
+    )
+    return get_backend(name)
+
+
+def fetch_document(url: str, source: str, timeout: int = 30):
+    """Fetch a static page and parse it with the source's backend"""
+    return get_parser(source).fetch(url, timeout=timeout)
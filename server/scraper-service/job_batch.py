@@ -0,0 +1,277 @@
+"""
+Columnar job batches for the scrape pipeline and API
+
+A JobBatch stores a list of jobs column by column:
+- categorical columns (source, job_type, company_name) are dictionary
+  encoded: a small list of distinct values plus an array of int codes
+- is_active is a byte array
+- every other field is a plain list
+
+Filters, sorts and projections work on whole columns (predicates run once
+per distinct dictionary value, rows are selected with itertools.compress),
+and the batch serializes directly to compact JSON columns or to an Apache
+Arrow IPC stream (needs pyarrow, which requirements.txt installs).
+"""
+import io
+from array import array
+from itertools import compress
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from job_record import FIELD_NAMES, JobRecord
+
+CATEGORICAL_COLUMNS = ('source', 'job_type', 'company_name')
+BOOLEAN_COLUMNS = ('is_active',)
+
+ARROW_MIME_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+class DictionaryColumn:
+    """Dictionary-encoded string column"""
+
+    __slots__ = ('dictionary', 'codes')
+
+    def __init__(self, dictionary: List[Optional[str]], codes: array):
+        self.dictionary = dictionary
+        self.codes = codes
+
+    @classmethod
+    def encode(cls, values: Iterable[Optional[str]]) -> 'DictionaryColumn':
+        """Dictionary-encode a sequence of values"""
+        index: Dict[Optional[str], int] = {}
+        dictionary: List[Optional[str]] = []
+        codes = array('i')
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(dictionary)
+                dictionary.append(value)
+            codes.append(code)
+        return cls(dictionary, codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        return self.dictionary[self.codes[i]]
+
+    def to_list(self) -> List[Optional[str]]:
+        return [self.dictionary[code] for code in self.codes]
+
+    def mask(self, predicate: Callable[[Optional[str]], bool]) -> List[bool]:
+        """Evaluate predicate once per dictionary value, then map codes"""
+        matches = [bool(predicate(value)) for value in self.dictionary]
+        return [matches[code] for code in self.codes]
+
+    def sort_keys(self) -> List[int]:
+        """Per-row sort keys: the rank of each row's value in sorted dictionary order"""
+        dictionary = self.dictionary
+        order = sorted(
+            range(len(dictionary)),
+            key=lambda code: (dictionary[code] is None, dictionary[code] or '')
+        )
+        ranks = [0] * len(self.dictionary)
+        for rank, code in enumerate(order):
+            ranks[code] = rank
+        return [ranks[code] for code in self.codes]
+
+    def take(self, indices: Sequence[int]) -> 'DictionaryColumn':
+        """Select rows (keeps the dictionary; unused values are harmless)"""
+        codes = self.codes
+        return DictionaryColumn(self.dictionary, array('i', [codes[i] for i in indices]))
+
+    def compress(self, mask: Sequence[bool]) -> 'DictionaryColumn':
+        return DictionaryColumn(self.dictionary, array('i', compress(self.codes, mask)))
+
+    def distinct(self) -> List[Optional[str]]:
+        """Values that actually occur in the column"""
+        used = set(self.codes)
+        return [value for code, value in enumerate(self.dictionary) if code in used]
+
+
+Column = Union[DictionaryColumn, array, list]
+
+
+def _column_to_list(column: Column) -> list:
+    if isinstance(column, DictionaryColumn):
+        return column.to_list()
+    if isinstance(column, array):
+        return [bool(value) for value in column]
+    return column
+
+
+def _take(column: Column, indices: Sequence[int]) -> Column:
+    if isinstance(column, DictionaryColumn):
+        return column.take(indices)
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in indices])
+    return [column[i] for i in indices]
+
+
+def _compress(column: Column, mask: Sequence[bool]) -> Column:
+    if isinstance(column, DictionaryColumn):
+        return column.compress(mask)
+    if isinstance(column, array):
+        return array(column.typecode, compress(column, mask))
+    return list(compress(column, mask))
+
+
+class JobBatch:
+    """Column-oriented batch of jobs"""
+
+    def __init__(self, columns: Dict[str, Column], length: int):
+        """
+        Initialize job batch
+
+        Args:
+            columns: Column name -> column data (all of the same length)
+            length: Number of rows
+        """
+        self.columns = columns
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    @classmethod
+    def from_records(cls, jobs: Sequence[Union[JobRecord, Dict]]) -> 'JobBatch':
+        """Build a batch from job records (or plain job dicts)"""
+        columns: Dict[str, Column] = {}
+        for name in FIELD_NAMES:
+            values = [job.get(name) for job in jobs]
+            if name in CATEGORICAL_COLUMNS:
+                columns[name] = DictionaryColumn.encode(values)
+            elif name in BOOLEAN_COLUMNS:
+                columns[name] = array('b', [1 if value else 0 for value in values])
+            else:
+                columns[name] = values
+        return cls(columns, len(jobs))
+
+    def column(self, name: str) -> list:
+        """Decode a column into a plain list"""
+        return _column_to_list(self.columns[name])
+
+    def mask(self, name: str, predicate: Callable) -> List[bool]:
+        """Row mask for a predicate on one column"""
+        column = self.columns[name]
+        if isinstance(column, DictionaryColumn):
+            return column.mask(predicate)
+        return [bool(predicate(value)) for value in _column_to_list(column)]
+
+    def filter(self, mask: Sequence[bool]) -> 'JobBatch':
+        """Keep the rows where mask is true"""
+        return JobBatch(
+            {name: _compress(column, mask) for name, column in self.columns.items()},
+            sum(1 for keep in mask if keep),
+        )
+
+    def where(self, name: str, values: Iterable) -> 'JobBatch':
+        """Keep rows whose column value is one of `values`"""
+        wanted = set(values)
+        return self.filter(self.mask(name, wanted.__contains__))
+
+    def take(self, indices: Sequence[int]) -> 'JobBatch':
+        """Select rows by index, in the given order"""
+        return JobBatch(
+            {name: _take(column, indices) for name, column in self.columns.items()},
+            len(indices),
+        )
+
+    def sort(self, name: str, reverse: bool = False) -> 'JobBatch':
+        """Sort rows by one column (stable, None values last in either direction)"""
+        column = self.columns[name]
+        if isinstance(column, DictionaryColumn):
+            keys = column.sort_keys()
+            missing = column.mask(lambda value: value is None)
+        else:
+            keys = _column_to_list(column)
+            missing = [value is None for value in keys]
+        # reverse applies to the values only; None rows follow in their original order
+        order = sorted((i for i in range(self.length) if not missing[i]), key=keys.__getitem__, reverse=reverse)
+        order.extend(i for i in range(self.length) if missing[i])
+        return self.take(order)
+
+    def project(self, names: Iterable[str]) -> 'JobBatch':
+        """Keep only the named columns (columns are shared, not copied)"""
+        return JobBatch({name: self.columns[name] for name in names if name in self.columns}, self.length)
+
+    def dedupe(self, name: str = 'application_url') -> 'JobBatch':
+        """Keep the first row for each distinct value of a column"""
+        seen = set()
+        mask = []
+        for value in _column_to_list(self.columns[name]):
+            mask.append(value not in seen)
+            seen.add(value)
+        return self.filter(mask)
+
+    def distinct(self, name: str) -> list:
+        """Distinct values of a column, in first-seen order"""
+        column = self.columns[name]
+        if isinstance(column, DictionaryColumn):
+            return column.distinct()
+        return list(dict.fromkeys(_column_to_list(column)))
+
+    def to_records(self) -> List[JobRecord]:
+        """Convert back into job records (requires all columns)"""
+        decoded = [self.column(name) for name in FIELD_NAMES]
+        return [JobRecord(*values) for values in zip(*decoded)]
+
+    def to_dicts(self) -> List[Dict]:
+        """Convert into row dicts with the batch's columns"""
+        names = list(self.columns)
+        decoded = [self.column(name) for name in names]
+        rows = []
+        for values in zip(*decoded):
+            row = dict(zip(names, values))
+            if 'eligible_years' in row:
+                row['eligible_years'] = list(row['eligible_years'] or [])
+            rows.append(row)
+        return rows
+
+    def to_columns_json(self) -> Dict:
+        """
+        Compact JSON-ready column layout
+
+        Categorical columns are emitted as {"dictionary": [...], "codes": [...]},
+        other columns as plain value lists.
+        """
+        columns = {}
+        for name, column in self.columns.items():
+            if isinstance(column, DictionaryColumn):
+                columns[name] = {'dictionary': column.dictionary, 'codes': column.codes.tolist()}
+            elif name == 'eligible_years':
+                columns[name] = [list(years or []) for years in column]
+            else:
+                columns[name] = _column_to_list(column)
+        return {'length': self.length, 'columns': columns}
+
+    def to_arrow(self):
+        """Convert into a pyarrow Table with dictionary-encoded categoricals"""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise RuntimeError('Arrow output requires the pyarrow package') from e
+
+        arrays = {}
+        for name, column in self.columns.items():
+            if isinstance(column, DictionaryColumn):
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(column.codes, type=pa.int32()),
+                    pa.array(column.dictionary, type=pa.string()),
+                )
+            elif name in BOOLEAN_COLUMNS:
+                arrays[name] = pa.array(_column_to_list(column), type=pa.bool_())
+            elif name == 'eligible_years':
+                arrays[name] = pa.array([list(years or []) for years in column], type=pa.list_(pa.string()))
+            else:
+                arrays[name] = pa.array(column, type=pa.string())
+        return pa.table(arrays)
+
+    def to_arrow_ipc(self) -> bytes:
+        """Serialize as an Arrow IPC stream"""
+        table = self.to_arrow()
+
+        import pyarrow as pa
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
@@ -0,0 +1,282 @@
+"""
+Job lifecycle ledger: first seen, last seen, removals
+
+Most sources do not say when a posting went up, so scrapers stamp
+posted_date with the scrape time and every job looks new on every run.
+The ledger remembers, per stable job id:
+- first_seen / last_seen: posted_date becomes the earlier of the source's
+  own date and first_seen, so it stays put across runs
+- missed polls: when a complete listing of a source no longer contains a
+  job for JOB_LEDGER_MISSES consecutive polls, a removal tombstone is
+  recorded so the downstream store can deactivate just that job
+- removal sequence: every tombstone gets the next number of one increasing
+  sequence, so consumers read removals as a feed (removals_after) from
+  their own cursor and never miss one, whichever scrape recorded it
+
+Partial listings (searches, delta windows, seen-filtered results) update
+first/last seen but never count as misses. A complete listing can cover a
+narrower scope than its source (one Greenhouse board out of many); misses
+are then only counted within that scope.
+"""
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import env_int
+from state_store import state_path
+
+DEFAULT_MISSES_BEFORE_REMOVAL = 3
+
+
+@dataclass
+class LedgerUpdate:
+    """Outcome of observing one source's listing"""
+    source: str
+    seen: int = 0
+    new_ids: List[str] = field(default_factory=list)
+    tombstones: List[Dict] = field(default_factory=list)
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO timestamp into naive UTC (None if unparseable)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _get(job, name: str):
+    return job.get(name) if isinstance(job, dict) else getattr(job, name)
+
+
+def _set(job, name: str, value):
+    if isinstance(job, dict):
+        job[name] = value
+    else:
+        setattr(job, name, value)
+
+
+class JobLedger:
+    """sqlite-backed first/last-seen ledger"""
+
+    def __init__(self, path: str, misses_before_removal: int = DEFAULT_MISSES_BEFORE_REMOVAL):
+        """
+        Initialize job ledger
+
+        Args:
+            path: sqlite database file (':memory:' for tests)
+            misses_before_removal: Consecutive complete polls a job must be
+                missing from before it is tombstoned
+        """
+        self.misses_before_removal = max(1, misses_before_removal)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' id TEXT PRIMARY KEY,'
+            ' source TEXT NOT NULL,'
+            ' first_seen TEXT NOT NULL,'
+            ' last_seen TEXT NOT NULL,'
+            ' missed_polls INTEGER NOT NULL DEFAULT 0,'
+            ' removed_at TEXT,'
+            ' scope TEXT,'
+            ' removed_seq INTEGER)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_source ON jobs (source)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_scope ON jobs (scope)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_removed_at ON jobs (removed_at)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_removed_seq ON jobs (removed_seq)')
+        self._conn.commit()
+
+    def observe(
+        self,
+        source: str,
+        jobs: Sequence,
+        complete: bool = True,
+        now: Optional[datetime] = None,
+        scope: Optional[str] = None
+    ) -> LedgerUpdate:
+        """
+        Record one poll of a source
+
+        Fills posted_date on the given jobs (in place) from first_seen.
+
+        Args:
+            source: Source key (the jobs' `source` field)
+            jobs: Job records (or dicts) returned by this poll
+            complete: Whether the poll listed every current job of the source;
+                only complete polls count misses and produce tombstones
+            now: Poll time (UTC)
+            scope: Part of the source this poll covers (defaults to the whole
+                source), e.g. 'greenhouse/stripe'
+
+        Returns:
+            LedgerUpdate with new job ids and any tombstones
+        """
+        now = now or datetime.utcnow()
+        now_iso = now.isoformat()
+        scope = scope or source
+        update = LedgerUpdate(source=source, seen=len(jobs))
+
+        with self._lock:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in self._conn.execute(
+                    'SELECT id, first_seen, removed_at FROM jobs WHERE scope = ?', (scope,)
+                )
+            }
+            # Jobs first recorded under another scope keep their first_seen
+            known_elsewhere = {}
+            outside = [job_id for job_id in (_get(job, 'id') for job in jobs) if job_id and job_id not in known]
+            for start in range(0, len(outside), 500):
+                chunk = outside[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for job_id, first_seen in self._conn.execute(
+                    f'SELECT id, first_seen FROM jobs WHERE id IN ({placeholders})', chunk
+                ):
+                    known_elsewhere[job_id] = first_seen
+
+            present = set()
+            rows = []
+            for job in jobs:
+                job_id = _get(job, 'id')
+                if not job_id or job_id in present:
+                    continue
+                present.add(job_id)
+
+                if job_id in known:
+                    first_seen = known[job_id][0]
+                elif job_id in known_elsewhere:
+                    first_seen = known_elsewhere[job_id]
+                else:
+                    first_seen = now_iso
+                    update.new_ids.append(job_id)
+                rows.append((job_id, source, scope, first_seen, now_iso))
+
+                # A date later than first_seen is just the scrape time
+                posted = _parse_timestamp(_get(job, 'posted_date'))
+                first = _parse_timestamp(first_seen)
+                if posted is None or (first is not None and posted > first):
+                    _set(job, 'posted_date', first_seen)
+
+            self._conn.executemany(
+                'INSERT INTO jobs (id, source, scope, first_seen, last_seen, missed_polls, removed_at)'
+                ' VALUES (?, ?, ?, ?, ?, 0, NULL)'
+                ' ON CONFLICT (id) DO UPDATE SET'
+                ' scope = excluded.scope, last_seen = excluded.last_seen,'
+                ' missed_polls = 0, removed_at = NULL',
+                rows
+            )
+
+            if complete:
+                missing = [
+                    (job_id,) for job_id, (_, removed_at) in known.items()
+                    if job_id not in present and removed_at is None
+                ]
+                self._conn.executemany(
+                    'UPDATE jobs SET missed_polls = missed_polls + 1 WHERE id = ?', missing
+                )
+                removed = [
+                    row[0] for row in self._conn.execute(
+                        'SELECT id FROM jobs WHERE scope = ? AND removed_at IS NULL AND missed_polls >= ?'
+                        ' ORDER BY id', (scope, self.misses_before_removal)
+                    )
+                ]
+                if removed:
+                    # A reappeared job keeps its old number, so the sequence never goes back
+                    last_seq = self._conn.execute('SELECT COALESCE(MAX(removed_seq), 0) FROM jobs').fetchone()[0]
+                    self._conn.executemany(
+                        'UPDATE jobs SET removed_at = ?, removed_seq = ? WHERE id = ?',
+                        [(now_iso, last_seq + i, job_id) for i, job_id in enumerate(removed, 1)]
+                    )
+                update.tombstones = self._tombstones('scope = ? AND removed_at = ?', (scope, now_iso))
+
+            self._conn.commit()
+
+        return update
+
+    def removals_after(self, cursor: int = 0, limit: int = 1000) -> Tuple[List[Dict], int]:
+        """
+        Removal feed: tombstones recorded after a consumer's cursor
+
+        Args:
+            cursor: Last cursor the consumer processed (0 for everything);
+                a cursor past the end of the sequence (a reset ledger)
+                starts over from 0
+            limit: Max tombstones returned; call again with the new cursor
+                until fewer come back
+
+        Returns:
+            (tombstones oldest first, cursor to pass next time)
+        """
+        with self._lock:
+            last_seq = self._conn.execute('SELECT COALESCE(MAX(removed_seq), 0) FROM jobs').fetchone()[0]
+            if cursor > last_seq:
+                cursor = 0
+            rows = self._conn.execute(
+                'SELECT id, source, last_seen, removed_at, removed_seq FROM jobs'
+                ' WHERE removed_seq > ? AND removed_at IS NOT NULL ORDER BY removed_seq LIMIT ?',
+                (cursor, max(1, limit))
+            ).fetchall()
+        tombstones = [
+            {'id': job_id, 'source': source, 'last_seen': last_seen, 'removed_at': removed_at}
+            for job_id, source, last_seen, removed_at, _ in rows
+        ]
+        return tombstones, rows[-1][4] if rows else cursor
+
+    def first_seen(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT first_seen FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            active, removed = self._conn.execute(
+                'SELECT COUNT(*) - COUNT(removed_at), COUNT(removed_at) FROM jobs'
+            ).fetchone()
+        return {'active': active, 'removed': removed}
+
+    def _tombstones(self, where: str, params: tuple) -> List[Dict]:
+        return [
+            {'id': job_id, 'source': source, 'last_seen': last_seen, 'removed_at': removed_at}
+            for job_id, source, last_seen, removed_at in self._conn.execute(
+                f'SELECT id, source, last_seen, removed_at FROM jobs WHERE {where} ORDER BY id', params
+            )
+        ]
+
+
+_shared_ledger: Optional[JobLedger] = None
+_shared_ledger_lock = threading.Lock()
+
+
+def get_job_ledger() -> Optional[JobLedger]:
+    """
+    Get the process-wide job ledger
+
+    Configured with JOB_LEDGER_PATH (default: job_ledger.sqlite3 in
+    SCRAPER_STATE_DIR) and JOB_LEDGER_MISSES (default 3); JOB_LEDGER=0
+    disables it.
+
+    Returns:
+        Shared JobLedger, or None when disabled
+    """
+    global _shared_ledger
+
+    if os.environ.get('JOB_LEDGER', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    with _shared_ledger_lock:
+        if _shared_ledger is None:
+            misses = env_int('JOB_LEDGER_MISSES', DEFAULT_MISSES_BEFORE_REMOVAL)
+            path = os.environ.get('JOB_LEDGER_PATH') or state_path('job_ledger.sqlite3')
+            _shared_ledger = JobLedger(path, misses_before_removal=misses)
+        return _shared_ledger
@@ -0,0 +1,104 @@
+"""
+Compact job record shared by every scraper
+
+A full multi-source catalog holds thousands of jobs whose categorical
+fields (source, job_type, company_name, location, eligible_years) repeat
+constantly. JobRecord stores them in a slotted dataclass, interns the
+categorical strings and shares one tuple per distinct eligible-years
+combination, so each record costs a fraction of a 13-key dict.
+
+Records still support dict-style reads (job['id'], job.get('source')) so
+existing consumers keep working; use to_dict() at the JSON boundary.
+"""
+import hashlib
+import sys
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# One shared tuple per distinct eligible-years combination
+_ELIGIBLE_YEARS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def shared_eligible_years(years: Iterable[str]) -> Tuple[str, ...]:
+    """Return the shared, interned tuple for an eligible-years sequence"""
+    key = tuple(years)
+    shared = _ELIGIBLE_YEARS.get(key)
+    if shared is None:
+        shared = tuple(sys.intern(year) for year in key)
+        _ELIGIBLE_YEARS[shared] = shared
+    return shared
+
+
+def stable_id(*parts) -> str:
+    """
+    Short id derived from identifying fields
+
+    Unlike hash(), which is salted per process, the same parts give the same
+    id in every process and every run.
+    """
+    key = '\x1f'.join(' '.join(str(part or '').split()).lower() for part in parts)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a categorical string value"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
+class JobRecord:
+    """A normalized internship posting"""
+    id: str
+    company_name: str
+    position_title: str
+    description: str
+    job_type: str
+    location: str
+    eligible_years: Tuple[str, ...]
+    posted_date: str
+    application_url: str
+    source: str
+    application_deadline: Optional[str] = None
+    updated_at: Optional[str] = None
+    is_active: bool = True
+
+    def __post_init__(self):
+        self.company_name = _intern(self.company_name)
+        self.job_type = _intern(self.job_type)
+        self.location = _intern(self.location)
+        self.source = _intern(self.source)
+        self.eligible_years = shared_eligible_years(self.eligible_years)
+
+    def __reduce__(self):
+        # Rebuild through __init__ so unpickled records (e.g. from the parse
+        # pool) are interned in the receiving process too
+        return (JobRecord, tuple(getattr(self, name) for name in FIELD_NAMES))
+
+    def __getitem__(self, key: str):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELD_SET
+
+    def get(self, key: str, default=None):
+        """Dict-style read with a default"""
+        if key not in _FIELD_SET:
+            return default
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-ready dict"""
+        data = {name: getattr(self, name) for name in FIELD_NAMES}
+        data['eligible_years'] = list(self.eligible_years)
+        return data
+
+
+FIELD_NAMES: Tuple[str, ...] = tuple(f.name for f in fields(JobRecord))
+_FIELD_SET = frozenset(FIELD_NAMES)
+
+
+def jobs_to_dicts(jobs: Iterable) -> List[Dict]:
+    """Convert job records (or plain dicts) into JSON-ready dicts"""
+    return [job.to_dict() if isinstance(job, JobRecord) else job for job in jobs]
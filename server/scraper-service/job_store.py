@@ -0,0 +1,263 @@
+"""
+On-disk scrape result store shared by every serving process
+
+Under gunicorn each request worker is its own process, and scraping runs in
+a separate scrape worker. They only share the filesystem:
+
+- results/<key>.json: latest result per keyword set (jobs, truncated
+  sources, timestamp, version), replaced atomically; readers keep the
+  decoded batch of the most recently used keyword sets in memory until the
+  file changes
+- requests/<key>.json: a pending scrape request, written by request
+  workers and removed by the scrape worker once a newer result is saved
+- worker.json: the scrape worker's heartbeat
+
+Clients may ask for any keywords, so per-keyword state is bounded: a
+stale result is only rescraped when someone asks for it, so a result's
+age is the time since its keyword set was last wanted. Results older
+than result_ttl_seconds, and beyond the max_results most recently saved,
+are deleted on every save. At most max_pending requests wait for the
+scrape worker; further keyword sets are refused until the queue drains.
+
+Versions are nanosecond timestamps, so they are unique across processes
+and payload caches keyed by version stay coherent.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from config import env_float, env_int
+from job_batch import JobBatch
+from state_store import atomic_write_json, load_json, state_path
+
+DEFAULT_MAX_RESULTS = 64
+DEFAULT_RESULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_PENDING = 16
+
+
+def _key(keywords: str) -> str:
+    return hashlib.sha1(' '.join(keywords.split()).lower().encode('utf-8')).hexdigest()[:16]
+
+
+class JobStore:
+    """Shared scrape results, scrape requests and worker heartbeat"""
+
+    def __init__(self, directory: str, max_loaded: int = 16, max_results: int = DEFAULT_MAX_RESULTS,
+                 result_ttl_seconds: float = DEFAULT_RESULT_TTL_SECONDS, max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Initialize job store
+
+        Args:
+            directory: Root directory (created if missing)
+            max_loaded: Decoded results kept in memory (least recently used go first)
+            max_results: Stored results kept (least recently saved go first)
+            result_ttl_seconds: Age after which a stored result is deleted
+            max_pending: Scrape requests that may wait for the scrape worker
+        """
+        self.directory = directory
+        self.results_dir = os.path.join(directory, 'results')
+        self.requests_dir = os.path.join(directory, 'requests')
+        self.heartbeat_path = os.path.join(directory, 'worker.json')
+        os.makedirs(self.results_dir, exist_ok=True)
+        os.makedirs(self.requests_dir, exist_ok=True)
+        self.max_loaded = max(1, max_loaded)
+        self.max_results = max(1, max_results)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_pending = max(1, max_pending)
+        self._lock = threading.Lock()
+        # key -> ((mtime_ns, size), entry), least recently used first
+        self._loaded: 'OrderedDict[str, tuple]' = OrderedDict()
+
+    def _result_path(self, keywords: str) -> str:
+        return os.path.join(self.results_dir, f"{_key(keywords)}.json")
+
+    def _request_path(self, keywords: str) -> str:
+        return os.path.join(self.requests_dir, f"{_key(keywords)}.json")
+
+    def load(self, keywords: str) -> Optional[Dict]:
+        """
+        Latest stored result for keywords
+
+        Returns:
+            {'batch', 'truncated', 'timestamp', 'version'}, or None if never scraped
+        """
+        path = self._result_path(keywords)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        key = _key(keywords)
+        with self._lock:
+            cached = self._loaded.get(key)
+            if cached is not None:
+                self._loaded.move_to_end(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        data = load_json(path)
+        if not data:
+            return cached[1] if cached else None
+        entry = {
+            'batch': JobBatch.from_records(data.get('internships', [])),
+            'truncated': data.get('truncated', []),
+            'timestamp': data['timestamp'],
+            'version': data['version'],
+        }
+        with self._lock:
+            self._loaded[key] = (signature, entry)
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+        return entry
+
+    def save(self, keywords: str, batch: JobBatch, truncated: Sequence[str] = ()) -> Dict:
+        """Store a new result for keywords and return it as load() would"""
+        entry = {
+            'batch': batch,
+            'truncated': list(truncated),
+            'timestamp': time.time(),
+            'version': time.time_ns(),
+        }
+        atomic_write_json(self._result_path(keywords), {
+            'keywords': keywords,
+            'internships': batch.to_dicts(),
+            'truncated': entry['truncated'],
+            'timestamp': entry['timestamp'],
+            'version': entry['version'],
+        })
+        self.prune()
+        return entry
+
+    def prune(self) -> int:
+        """
+        Delete results past the TTL or beyond max_results, and requests past the TTL
+
+        Returns:
+            Number of files deleted
+        """
+        cutoff = time.time() - self.result_ttl_seconds
+        results = []
+        for name in os.listdir(self.results_dir):
+            if name.endswith('.json') and not name.startswith('.'):
+                path = os.path.join(self.results_dir, name)
+                try:
+                    results.append((os.stat(path).st_mtime, path))
+                except FileNotFoundError:
+                    continue
+        results.sort(reverse=True)
+        expired = [path for position, (mtime, path) in enumerate(results)
+                   if mtime < cutoff or position >= self.max_results]
+        for name in os.listdir(self.requests_dir):
+            path = os.path.join(self.requests_dir, name)
+            data = load_json(path) if name.endswith('.json') and not name.startswith('.') else None
+            if data is not None and data.get('requested_at', 0) < cutoff:
+                expired.append(path)
+
+        deleted = 0
+        for path in expired:
+            try:
+                os.unlink(path)
+                deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    def request_scrape(self, keywords: str) -> bool:
+        """
+        Ask the scrape worker for a fresh result (idempotent while pending)
+
+        Returns:
+            False when max_pending other requests are already waiting
+        """
+        path = self._request_path(keywords)
+        if os.path.exists(path):
+            return True
+        pending = sum(1 for name in os.listdir(self.requests_dir)
+                      if name.endswith('.json') and not name.startswith('.'))
+        if pending >= self.max_pending:
+            return False
+        atomic_write_json(path, {'keywords': keywords, 'requested_at': time.time()})
+        return True
+
+    def pending_requests(self) -> List[Dict]:
+        """Pending scrape requests, oldest first"""
+        pending = []
+        for name in os.listdir(self.requests_dir):
+            if name.endswith('.json') and not name.startswith('.'):
+                data = load_json(os.path.join(self.requests_dir, name))
+                if data and data.get('keywords'):
+                    pending.append(data)
+        return sorted(pending, key=lambda data: data.get('requested_at', 0))
+
+    def complete_request(self, keywords: str, started_at: float):
+        """Drop a request the scrape started at started_at satisfied"""
+        path = self._request_path(keywords)
+        data = load_json(path)
+        # A request made after the scrape started wants a newer result
+        if data is not None and data.get('requested_at', 0) > started_at:
+            return
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def wait_for(self, keywords: str, newer_than: int = 0, timeout: float = 600,
+                 poll_seconds: float = 0.5) -> Optional[Dict]:
+        """
+        Block until a result newer than a version is stored
+
+        Returns:
+            The new result, or None on timeout or when the scrape worker stops
+            sending heartbeats
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self.load(keywords)
+            if entry is not None and entry['version'] > newer_than:
+                return entry
+            if time.monotonic() >= deadline or not self.worker_alive():
+                return None
+            time.sleep(poll_seconds)
+
+    def heartbeat(self, busy: Optional[str] = None):
+        """Record that the scrape worker is alive (and what it is scraping)"""
+        atomic_write_json(self.heartbeat_path, {'pid': os.getpid(), 'at': time.time(), 'busy': busy})
+
+    def worker_status(self) -> Optional[Dict]:
+        return load_json(self.heartbeat_path)
+
+    def worker_alive(self, max_age: float = 60) -> bool:
+        status = self.worker_status()
+        return bool(status) and time.time() - status.get('at', 0) < max_age
+
+
+_shared_store: Optional[JobStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """
+    Get the process-wide job store
+
+    Lives in JOB_STORE_DIR (default: job_store in SCRAPER_STATE_DIR); every
+    serving process and the scrape worker must point at the same directory.
+    Bounded by JOB_STORE_MAX_RESULTS (default 64), JOB_STORE_RESULT_TTL_HOURS
+    (default 168) and JOB_STORE_MAX_PENDING (default 16).
+    """
+    global _shared_store
+
+    with _shared_store_lock:
+        if _shared_store is None:
+            directory = os.environ.get('JOB_STORE_DIR') or state_path('job_store')
+            _shared_store = JobStore(
+                directory,
+                max_results=env_int('JOB_STORE_MAX_RESULTS', DEFAULT_MAX_RESULTS),
+                result_ttl_seconds=env_float('JOB_STORE_RESULT_TTL_HOURS', DEFAULT_RESULT_TTL_SECONDS / 3600) * 3600,
+                max_pending=env_int('JOB_STORE_MAX_PENDING', DEFAULT_MAX_PENDING),
+            )
+        return _shared_store
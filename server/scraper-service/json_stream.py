@@ -0,0 +1,184 @@
+"""
+Streaming decode of large JSON job arrays
+
+Job board APIs return every posting of a board in one JSON document, and
+only a few of them are internships. Instead of `response.json()` building
+the whole document, the scanner walks the byte stream, cuts out one array
+item at a time and only decodes items whose raw bytes pass a cheap
+prefilter, so peak memory is one chunk plus one item regardless of board
+size.
+
+The scanner only tracks strings and bracket depth (regex jumps between
+structural characters); a malformed or truncated document raises
+ValueError once the stream ends.
+"""
+import json
+import re
+from typing import Callable, Iterable, Iterator, List, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_QUOTE, _BACKSLASH = ord('"'), ord('\\')
+_OPENERS = (ord('{'), ord('['))
+_ARRAY_OPEN = ord('[')
+
+
+class ArrayItemScanner:
+    """Incrementally splits a JSON array (top-level or under a top-level key) into raw items"""
+
+    def __init__(self, key: Optional[str] = None):
+        """
+        Initialize scanner
+
+        Args:
+            key: Top-level object key holding the array (e.g. 'jobs');
+                None when the document itself is the array
+        """
+        self.key = key.encode('utf-8') if key is not None else None
+        self.done = False
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start: Optional[int] = None
+        self._last_key: Optional[bytes] = None
+        self._target_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Scan the next chunk of the document
+
+        Returns:
+            Raw bytes of every array item completed by this chunk
+        """
+        if self.done or not chunk:
+            return []
+
+        buf = self._buf
+        buf += chunk
+        pos = self._pos
+        items = []
+
+        while not self.done:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                index = match.start()
+                if buf[index] == _BACKSLASH:
+                    if index + 1 >= len(buf):
+                        # Escape split across chunks: rescan it with the next one
+                        pos = index
+                        break
+                    pos = index + 2
+                    continue
+                self._in_string = False
+                pos = index + 1
+                if self._string_start is not None:
+                    self._last_key = bytes(buf[self._string_start:index])
+                    self._string_start = None
+                continue
+
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            index = match.start()
+            char = buf[index]
+            pos = index + 1
+
+            if char == _QUOTE:
+                self._in_string = True
+                # Strings directly inside the top-level object may be the key we want
+                if self.key is not None and self._target_depth is None and self._depth == 1:
+                    self._string_start = pos
+                continue
+
+            if char in _OPENERS:
+                if self._target_depth is not None and self._depth == self._target_depth and self._item_start is None:
+                    self._item_start = index
+                self._depth += 1
+                if self._target_depth is None and char == _ARRAY_OPEN and (
+                    (self.key is None and self._depth == 1) or
+                    (self.key is not None and self._depth == 2 and self._last_key == self.key)
+                ):
+                    self._target_depth = self._depth
+                continue
+
+            self._depth -= 1
+            if self._target_depth is None:
+                continue
+            if self._depth == self._target_depth and self._item_start is not None:
+                items.append(bytes(buf[self._item_start:pos]))
+                self._item_start = None
+            elif self._depth < self._target_depth:
+                self.done = True
+
+        # Keep only what is still needed: the open item or a key being read
+        keep = min(i for i in (self._item_start, self._string_start, pos) if i is not None)
+        if keep:
+            del buf[:keep]
+            pos -= keep
+            if self._item_start is not None:
+                self._item_start -= keep
+            if self._string_start is not None:
+                self._string_start -= keep
+        self._pos = pos
+        return items
+
+    def close(self):
+        """Raise ValueError unless the whole target array was seen"""
+        if not self.done:
+            target = f"'{self.key.decode('utf-8')}' array" if self.key is not None else 'array'
+            raise ValueError(f"JSON stream ended before the end of the {target}")
+
+
+def contains_any(keywords: Iterable[str]) -> Callable[[bytes], bool]:
+    """Prefilter passing raw items that contain any keyword (ASCII case-insensitive)"""
+    needles = [keyword.lower().encode('utf-8') for keyword in keywords]
+
+    def check(raw: bytes) -> bool:
+        lowered = raw.lower()
+        return any(needle in lowered for needle in needles)
+
+    return check
+
+
+def iter_json_items(
+    chunks: Iterable[bytes],
+    key: Optional[str] = None,
+    prefilter: Optional[Callable[[bytes], bool]] = None
+) -> Iterator:
+    """
+    Decode the items of a streamed JSON array one at a time
+
+    Args:
+        chunks: Byte chunks of the document (e.g. response.iter_content())
+        key: Top-level key holding the array, or None for a top-level array
+        prefilter: Called with each raw item; items it rejects are never decoded
+
+    Yields:
+        Decoded array items
+    """
+    scanner = ArrayItemScanner(key)
+    for chunk in chunks:
+        for raw in scanner.feed(chunk):
+            if prefilter is None or prefilter(raw):
+                yield json.loads(raw)
+        if scanner.done:
+            break
+    scanner.close()
+
+
+def iter_response_items(
+    response,
+    key: Optional[str] = None,
+    prefilter: Optional[Callable[[bytes], bool]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator:
+    """iter_json_items over a streamed requests response (request it with stream=True)"""
+    return iter_json_items(response.iter_content(chunk_size=chunk_size), key=key, prefilter=prefilter)
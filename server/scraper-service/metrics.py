@@ -0,0 +1,389 @@
+"""
+Prometheus-style metrics for scrapes and serving
+
+Cheap in-process instrumentation: hooks around fetches, parses, caches and
+sources update counters and fixed-bucket histograms under one lock. The
+label `source` defaults to the source being scraped (set by
+scrape_all_sources through a context variable), so deep hooks such as
+fetch_document need no extra arguments.
+
+Scrapes run in the scrape worker and requests are served by several
+gunicorn workers, so every process writes its metrics to
+<job store>/metrics/<pid>.json (at most every FLUSH_INTERVAL_SECONDS, and
+after every scrape). GET /metrics merges the files of all processes; files
+of processes that exited are folded into retired.json so totals never go
+backwards. METRICS=0 turns every hook into a no-op.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: folding retired files is only serialized within the process
+    fcntl = None
+
+import tracing
+from state_store import atomic_write_json, load_json
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 3e5, 1e6, 3e6, 1e7, 3e7, 1e8)
+FLUSH_INTERVAL_SECONDS = 15.0
+RETIRE_AFTER_SECONDS = 3600.0
+
+# name -> (type, help, buckets)
+METRICS = {
+    'scraper_source_seconds': ('histogram', 'Wall time of one source within a scrape', SECONDS_BUCKETS),
+    'scraper_fetch_seconds': ('histogram', 'Latency of one upstream fetch', SECONDS_BUCKETS),
+    'scraper_parse_seconds': ('histogram', 'Time spent parsing one fetched page or board', SECONDS_BUCKETS),
+    'scraper_fetch_bytes': ('histogram', 'Bytes downloaded by one upstream fetch', BYTES_BUCKETS),
+    'scraper_fetches_total': ('counter', 'Upstream fetches by outcome (ok, not_modified, error, circuit_open)', None),
+    'scraper_jobs_emitted_total': ('counter', 'Jobs returned by a source', None),
+    'scraper_errors_total': ('counter', 'Scraper errors (failed sources, fetches and parses)', None),
+    'scraper_truncated_total': ('counter', 'Sources stopped early by their deadline', None),
+    'scraper_cache_requests_total': ('counter', 'Cache lookups by cache and result (hit, miss)', None),
+    'scraper_scrapes_total': ('counter', 'Completed scrapes', None),
+}
+
+# Source label for hooks that do not pass one (set per source by scrape_all_sources)
+current_source: contextvars.ContextVar[str] = contextvars.ContextVar('current_source', default='none')
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _encode_key(key: LabelKey) -> str:
+    return json.dumps(key, separators=(',', ':'))
+
+
+def _decode_key(text: str) -> LabelKey:
+    return tuple(tuple(pair) for pair in json.loads(text))
+
+
+class MetricsRegistry:
+    """Counters and histograms of one process, mergeable across processes"""
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        """
+        Initialize registry
+
+        Args:
+            directory: Where per-process snapshots are written (None: this process only)
+            flush_interval: Minimum seconds between automatic snapshot writes
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> label key -> [bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Add to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+        self._maybe_flush()
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one histogram observation"""
+        buckets = METRICS[name][2]
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            values = series.get(key)
+            if values is None:
+                values = series[key] = [0.0] * (len(buckets) + 2)
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    values[index] += 1
+                    break
+            values[-2] += value
+            values[-1] += 1
+        self._maybe_flush()
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of every series"""
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'updated_at': time.time(),
+                'counters': {
+                    name: {_encode_key(key): value for key, value in series.items()}
+                    for name, series in self._counters.items()
+                },
+                'histograms': {
+                    name: {_encode_key(key): list(values) for key, values in series.items()}
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def flush(self):
+        """Write this process's snapshot for the other processes"""
+        self._flushed_at = time.monotonic()
+        if not self.directory:
+            return
+        try:
+            atomic_write_json(os.path.join(self.directory, f"{os.getpid()}.json"), self.snapshot())
+        except OSError as e:
+            import event_log  # event_log imports this module
+            event_log.error('metrics.snapshot_failed', error=str(e))
+
+    def _maybe_flush(self):
+        if self.directory and time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def collect(self) -> List[Dict]:
+        """Snapshots of every process (this one live, the others from disk)"""
+        snapshots = [self.snapshot()]
+        if not self.directory:
+            return snapshots
+        self.flush()
+        self._retire_dead()
+        own = f"{os.getpid()}.json"
+        for name in os.listdir(self.directory):
+            if name.endswith('.json') and name != own and not name.startswith('.'):
+                data = load_json(os.path.join(self.directory, name))
+                if data:
+                    snapshots.append(data)
+        return snapshots
+
+    def render(self) -> str:
+        """Prometheus text exposition of all processes' metrics"""
+        return render_snapshots(self.collect())
+
+    def _retire_dead(self):
+        """Fold snapshots of exited processes into retired.json"""
+        now = time.time()
+        retired_path = os.path.join(self.directory, 'retired.json')
+        with open(f"{retired_path}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                stale = []
+                for name in os.listdir(self.directory):
+                    stem = name[:-len('.json')]
+                    if not name.endswith('.json') or not stem.isdigit() or int(stem) == os.getpid():
+                        continue
+                    path = os.path.join(self.directory, name)
+                    data = load_json(path)
+                    if data and now - data.get('updated_at', now) > RETIRE_AFTER_SECONDS and not _alive(int(stem)):
+                        stale.append((path, data))
+                if not stale:
+                    return
+                merged = merge_snapshots([load_json(retired_path) or {}] + [data for _, data in stale])
+                atomic_write_json(retired_path, merged)
+                for path, _ in stale:
+                    os.unlink(path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: List[Dict]) -> Dict:
+    """Sum counters and histogram buckets across snapshots"""
+    merged = {'counters': {}, 'histograms': {}, 'updated_at': time.time()}
+    for snapshot in snapshots:
+        for name, series in snapshot.get('counters', {}).items():
+            target = merged['counters'].setdefault(name, {})
+            for key, value in series.items():
+                target[key] = target.get(key, 0) + value
+        for name, series in snapshot.get('histograms', {}).items():
+            target = merged['histograms'].setdefault(name, {})
+            for key, values in series.items():
+                if key in target and len(target[key]) == len(values):
+                    target[key] = [a + b for a, b in zip(target[key], values)]
+                else:
+                    target[key] = list(values)
+    return merged
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _ratio_lines(name: str, help_text: str, counter: Dict[str, float], group: str, outcome: str,
+                 hit: str) -> List[str]:
+    """Gauge of hit/total per `group` label, derived from an outcome counter"""
+    totals: Dict[str, float] = {}
+    hits: Dict[str, float] = {}
+    for text, value in counter.items():
+        labels = dict(_decode_key(text))
+        totals[labels.get(group, '')] = totals.get(labels.get(group, ''), 0) + value
+        if labels.get(outcome) == hit:
+            hits[labels.get(group, '')] = hits.get(labels.get(group, ''), 0) + value
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for label, total in sorted(totals.items()):
+        if total:
+            lines.append(f"{name}{_format_labels(((group, label),))} {_format_value(hits.get(label, 0) / total)}")
+    return lines
+
+
+def render_snapshots(snapshots: List[Dict]) -> str:
+    """Prometheus text format (0.0.4) for merged snapshots"""
+    merged = merge_snapshots(snapshots)
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == 'counter':
+            for text, value in sorted(merged['counters'].get(name, {}).items()):
+                lines.append(f"{name}{_format_labels(_decode_key(text))} {_format_value(value)}")
+            continue
+        for text, values in sorted(merged['histograms'].get(name, {}).items()):
+            key = _decode_key(text)
+            cumulative = 0.0
+            for bound, count in zip(buckets, values):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(key, (('le', repr(float(bound))),))} {_format_value(cumulative)}")
+            lines.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {_format_value(values[-1])}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(values[-2])}")
+            lines.append(f"{name}_count{_format_labels(key)} {_format_value(values[-1])}")
+
+    lines.extend(_ratio_lines(
+        'scraper_not_modified_ratio', 'Share of conditional fetches answered 304 Not Modified',
+        merged['counters'].get('scraper_fetches_total', {}), 'source', 'outcome', 'not_modified'
+    ))
+    lines.extend(_ratio_lines(
+        'scraper_cache_hit_ratio', 'Share of cache lookups that were hits',
+        merged['counters'].get('scraper_cache_requests_total', {}), 'cache', 'result', 'hit'
+    ))
+    return '\n'.join(lines) + '\n'
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+_disabled = os.environ.get('METRICS', '1').lower() in ('0', 'false', 'no')
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """
+    Get the process-wide metrics registry
+
+    Snapshots go to METRICS_DIR (default: `metrics` next to the job store),
+    which every serving process and the scrape worker must share. Returns
+    None when METRICS=0.
+    """
+    global _registry
+
+    if _disabled:
+        return None
+    if _registry is not None:
+        return _registry
+
+    from job_store import get_job_store
+
+    with _registry_lock:
+        if _registry is None:
+            directory = os.environ.get('METRICS_DIR') or os.path.join(get_job_store().directory, 'metrics')
+            _registry = MetricsRegistry(directory)
+        return _registry
+
+
+def inc(name: str, amount: float = 1, source: Optional[str] = None, **labels):
+    """Add to a counter labelled with source (default: the source being scraped)"""
+    registry = get_metrics()
+    if registry is not None:
+        registry.inc(name, amount, source=source or current_source.get(), **labels)
+
+
+def observe(name: str, value: float, source: Optional[str] = None, **labels):
+    """Record a histogram observation labelled with source (default: the source being scraped)"""
+    registry = get_metrics()
+    if registry is not None:
+        registry.observe(name, value, source=source or current_source.get(), **labels)
+
+
+def count_cache(cache: str, hit: bool):
+    """Count one cache lookup (not labelled by source)"""
+    registry = get_metrics()
+    if registry is not None:
+        registry.inc('scraper_cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+
+@contextmanager
+def timed(name: str, source: Optional[str] = None) -> Iterator[None]:
+    """Observe the duration of the block in a seconds histogram"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, source=source)
+
+
+@contextmanager
+def fetching(source: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Record one upstream fetch: latency, bytes and outcome
+
+    Yields a dict the block may fill in: 'bytes' (downloaded size) and
+    'outcome' ('ok' by default, e.g. 'not_modified'); an exception escaping
+    the block records outcome 'error'. Inside a sampled trace the fetch is
+    also a 'fetch' span.
+    """
+    fetch = {'bytes': None, 'outcome': 'ok'}
+    started = time.perf_counter()
+    try:
+        with tracing.span('fetch', 'fetch') as fetch_span:
+            try:
+                yield fetch
+            finally:
+                if fetch_span is not None:
+                    fetch_span.args.update(fetch)
+    except Exception:
+        fetch['outcome'] = 'error'
+        raise
+    finally:
+        observe('scraper_fetch_seconds', time.perf_counter() - started, source=source)
+        if fetch['bytes'] is not None:
+            observe('scraper_fetch_bytes', fetch['bytes'], source=source)
+        inc('scraper_fetches_total', source=source, outcome=fetch['outcome'])
+        if fetch['outcome'] == 'error':
+            inc('scraper_errors_total', source=source, stage='fetch')
+
+
+def bytes_read(response) -> Optional[int]:
+    """Bytes a streamed requests response has read off the wire (None if unknown)"""
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        return None
+
+
+@contextmanager
+def scraping(source: str) -> Iterator[None]:
+    """Label hooks inside the block with source"""
+    token = current_source.set(source)
+    try:
+        yield
+    finally:
+        current_source.reset(token)
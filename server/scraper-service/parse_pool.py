@@ -0,0 +1,208 @@
+"""
+Process-pool parsing stage for large HTML sources (GitHub READMEs, Levels.fyi)
+
+Parsing a README with thousands of table rows is CPU-bound (DOM walking,
+title cleaning, deadline extraction, classification) and holds the GIL,
+which stalls every other Flask request thread. This module moves that work
+into worker processes:
+
+1. Each raw page body is shipped to a worker that flattens its tables into
+   plain row records (cell text + first link per cell).
+2. The rows are split into chunks and normalized into job records across
+   all workers in parallel.
+"""
+import contextvars
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import env_int
+from deadlines import Deadline
+import event_log
+
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+def _build_scraper(kind: str):
+    """Create the scraper that owns the row-normalization logic for a source kind"""
+    # Imported lazily: scrapers imports this module at load time
+    from scrapers import GitHubInternshipScraper, LevelsFyiScraper
+
+    if kind == 'github':
+        return GitHubInternshipScraper()
+    if kind == 'levels':
+        return LevelsFyiScraper()
+    raise ValueError(f"Unknown parse kind: {kind}")
+
+
+def _extract_rows_task(kind: str, html: str, url: str) -> List[Dict]:
+    """Worker task: parse a raw page and flatten its tables into row records"""
+    scraper = _build_scraper(kind)
+    return scraper.extract_rows_from_html(html, url)
+
+
+def _normalize_chunk_task(kind: str, context: Any, rows: List[Dict]) -> List[Dict]:
+    """Worker task: turn a chunk of row records into normalized job records"""
+    scraper = _build_scraper(kind)
+    try:
+        return scraper.parse_rows(context, rows)
+    finally:
+        # Workers are long-lived: write this chunk's events now
+        event_log.flush()
+
+
+class ParsePool:
+    """
+    Parses raw HTML pages in a process pool
+
+    Pages are parsed concurrently (one task per page), then their rows are
+    fanned out in chunks so a single very large page still uses every core.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize parse pool
+
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+            chunk_size: Maximum number of rows per normalization task
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Lazily start worker processes on first use"""
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a multi-threaded Flask process
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._executor
+
+    def _chunk_rows(self, rows: List[Dict]) -> List[List[Dict]]:
+        """Split rows into chunks sized to spread work across all workers"""
+        if not rows:
+            return []
+        per_worker = -(-len(rows) // self.max_workers)  # ceiling division
+        size = max(1, min(self.chunk_size, per_worker))
+        return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+    def parse_pages(self, kind: str, pages: List[Tuple[Any, str, str]],
+                    deadline: Optional[Deadline] = None) -> List[List[Dict]]:
+        """
+        Parse pages into normalized job records
+
+        Args:
+            kind: Source kind ('github' or 'levels')
+            pages: List of (context, html, url) tuples; context is passed
+                through to the scraper's parse_rows (e.g. the repo config)
+            deadline: Stop waiting when it expires: unfinished pages and chunks
+                are dropped and the deadline is marked truncated
+
+        Returns:
+            One list of job records per input page, in input order
+        """
+        deadline = deadline or Deadline.never()
+        executor = self._get_executor()
+
+        def result(future: Future):
+            if deadline.expires_at == float('inf'):
+                return future.result()
+            try:
+                return future.result(timeout=deadline.remaining())
+            except FutureTimeout:
+                future.cancel()
+                deadline.truncated = True
+                raise
+
+        extract_futures: List[Future] = [
+            executor.submit(_extract_rows_task, kind, html, url)
+            for _, html, url in pages
+        ]
+
+        chunk_futures: List[List[Future]] = []
+        for (context, _, _), future in zip(pages, extract_futures):
+            try:
+                rows = result(future)
+            except FutureTimeout:
+                rows = []
+            except Exception as e:
+                event_log.warning('parse_pool.extract_failed', sample=True, error=str(e))
+                rows = []
+            chunk_futures.append([
+                executor.submit(_normalize_chunk_task, kind, context, chunk)
+                for chunk in self._chunk_rows(rows)
+            ])
+
+        results: List[List[Dict]] = []
+        for futures in chunk_futures:
+            jobs: List[Dict] = []
+            for future in futures:
+                try:
+                    jobs.extend(result(future))
+                except FutureTimeout:
+                    continue
+                except Exception as e:
+                    event_log.warning('parse_pool.normalize_failed', sample=True, error=str(e))
+            results.append(jobs)
+
+        return results
+
+    def shutdown(self):
+        """Stop worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_shared_pool: Optional[ParsePool] = None
+_shared_pool_lock = threading.Lock()
+_inline: contextvars.ContextVar[bool] = contextvars.ContextVar('parse_inline', default=False)
+
+
+@contextmanager
+def inline_parsing() -> Iterator[None]:
+    """Parse inline in the calling process inside the block (e.g. while profiling it)"""
+    token = _inline.set(True)
+    try:
+        yield
+    finally:
+        _inline.reset(token)
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """
+    Get the process-wide parse pool
+
+    Configured with PARSE_POOL_WORKERS (defaults to CPU count; 0 or 1 parses
+    inline in the calling thread) and PARSE_POOL_CHUNK_SIZE.
+
+    Returns:
+        Shared ParsePool, or None when parsing should stay inline (also
+        inside inline_parsing())
+    """
+    global _shared_pool
+
+    if _inline.get():
+        return None
+
+    workers = env_int('PARSE_POOL_WORKERS', os.cpu_count() or 1)
+
+    if workers <= 1:
+        return None
+
+    chunk_size = env_int('PARSE_POOL_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ParsePool(max_workers=workers, chunk_size=chunk_size)
+        return _shared_pool
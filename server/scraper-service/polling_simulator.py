@@ -0,0 +1,317 @@
+"""
+Offline simulator for SmartPollingManager polling policies
+
+Replays change timelines (synthetic, or recorded to a JSON file) for
+thousands of sources through one SmartPollingManager running on a virtual
+clock, driven by its due-time scheduler, and reports per policy:
+- total requests
+- mean and p95 staleness (minutes between a change and the poll that saw it)
+- 304 rate (share of polls that found nothing new)
+
+Usage:
+    python polling_simulator.py [--sources 1000] [--days 14] [--seed 7] [--target 30]
+    python polling_simulator.py --save-timeline timeline.json   # write the synthetic timeline
+    python polling_simulator.py --timeline timeline.json        # replay a recorded timeline
+
+Timeline files look like:
+    {"start": "2026-01-05T00:00:00", "end": "2026-01-19T00:00:00",
+     "sources": [{"name": "...", "url": "...", "change_times": ["2026-01-05T08:12:00", ...]}]}
+"""
+import argparse
+import bisect
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import event_log
+from smart_polling import (
+    POLICY_ADAPTIVE,
+    POLICY_PREDICTIVE,
+    PollScheduler,
+    PredictivePollingModel,
+    SmartPollingManager,
+)
+
+
+@dataclass
+class SimulatedSource:
+    """A source and the times its content changed"""
+    name: str
+    url: str
+    change_times: List[datetime] = field(default_factory=list)
+
+
+@dataclass
+class PolicyResult:
+    """Outcome of simulating one policy"""
+    policy: str
+    requests: int
+    changes: int
+    mean_staleness_minutes: float
+    p95_staleness_minutes: float
+    not_modified_rate: float
+    elapsed_seconds: float = 0.0
+
+
+class VirtualClock:
+    """Settable clock passed to SmartPollingManager"""
+
+    def __init__(self, start: datetime):
+        self.current = start
+
+    def now(self) -> datetime:
+        return self.current
+
+
+# Change profiles: hour-of-week -> expected changes in that hour
+def _weekday_morning(hour: int) -> float:
+    day, hour_of_day = divmod(hour, 24)
+    return 1.5 if day < 5 and 8 <= hour_of_day < 11 else 0.01
+
+
+def _busy(hour: int) -> float:
+    return 2.0
+
+
+def _quiet(hour: int) -> float:
+    return 1 / 48
+
+
+def _business_hours(hour: int) -> float:
+    day, hour_of_day = divmod(hour, 24)
+    return 0.5 if day < 5 and 9 <= hour_of_day < 18 else 0.02
+
+
+PROFILES = {
+    'weekday_morning': _weekday_morning,
+    'busy': _busy,
+    'quiet': _quiet,
+    'business_hours': _business_hours,
+}
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """Draw from a Poisson distribution (Knuth; means here are small)"""
+    limit = math.exp(-mean)
+    count = 0
+    product = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def synthetic_sources(count: int, start: datetime, days: int, seed: int = 7) -> List[SimulatedSource]:
+    """Generate sources with seasonal Poisson change timelines"""
+    rng = random.Random(seed)
+    names = sorted(PROFILES)
+    sources = []
+
+    for i in range(count):
+        profile = names[i % len(names)]
+        rate_for_hour = PROFILES[profile]
+        changes = []
+        for hour_index in range(days * 24):
+            hour_start = start + timedelta(hours=hour_index)
+            bucket = hour_start.weekday() * 24 + hour_start.hour
+            for _ in range(_poisson(rng, rate_for_hour(bucket))):
+                changes.append(hour_start + timedelta(seconds=rng.uniform(0, 3600)))
+        changes.sort()
+        sources.append(SimulatedSource(
+            name=f'{profile}-{i}',
+            url=f'https://sim.invalid/{profile}/{i}',
+            change_times=changes,
+        ))
+
+    return sources
+
+
+def save_timeline(path: str, sources: List[SimulatedSource], start: datetime, end: datetime):
+    """Write change timelines to a JSON file"""
+    data = {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'sources': [
+            {
+                'name': source.name,
+                'url': source.url,
+                'change_times': [moment.isoformat() for moment in source.change_times],
+            }
+            for source in sources
+        ],
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def load_timeline(path: str) -> Tuple[List[SimulatedSource], datetime, datetime]:
+    """Read change timelines written by save_timeline (or recorded elsewhere)"""
+    with open(path) as f:
+        data = json.load(f)
+
+    sources = [
+        SimulatedSource(
+            name=entry['name'],
+            url=entry.get('url') or entry['name'],
+            change_times=sorted(datetime.fromisoformat(moment) for moment in entry['change_times']),
+        )
+        for entry in data['sources']
+    ]
+    return sources, datetime.fromisoformat(data['start']), datetime.fromisoformat(data['end'])
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(math.ceil(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[max(0, index)]
+
+
+def simulate_policy(
+    policy: str,
+    sources: List[SimulatedSource],
+    start: datetime,
+    end: datetime,
+    model: Optional[PredictivePollingModel] = None,
+    seed: int = 7
+) -> PolicyResult:
+    """
+    Replay every source's timeline through one manager using `policy`
+
+    Discrete-event loop: the virtual clock jumps straight to the earliest
+    due time in the manager's scheduler, every due source is polled (its
+    change timeline decides 200 vs 304) and rescheduled by the policy.
+    """
+    started = time.perf_counter()
+    clock = VirtualClock(start)
+    manager = SmartPollingManager(
+        policy=policy,
+        model=model,
+        clock=clock.now,
+        scheduler=PollScheduler(seed=seed)
+    )
+    timelines = {source.url: source.change_times for source in sources}
+    seen = {source.url: bisect.bisect_left(source.change_times, start) for source in sources}
+
+    staleness: List[float] = []
+    requests = 0
+    not_modified = 0
+    total_changes = 0
+
+    for source in sources:
+        manager.register_source(source.url, source.name)
+
+    # Per-poll events would bury the report; the event log buffers, so
+    # switching it off (not redirecting stdout) is what keeps them out
+    log = event_log.get_event_log()
+    level, log.level = log.level, event_log.OFF
+    try:
+        while True:
+            due_at = manager.scheduler.peek_next_due()
+            if due_at is None or due_at >= end:
+                break
+            clock.current = due_at
+
+            for source_url, source_name in manager.due_sources():
+                changes = timelines[source_url]
+                detected = bisect.bisect_right(changes, due_at)
+                changed = detected > seen[source_url]
+                for change in changes[seen[source_url]:detected]:
+                    staleness.append((due_at - change).total_seconds() / 60)
+                seen[source_url] = detected
+
+                requests += 1
+                if not changed:
+                    not_modified += 1
+
+                manager.record_observation(
+                    source_url,
+                    source_name,
+                    changed,
+                    status_code=200 if changed else 304
+                )
+    finally:
+        log.level = level
+
+    # Changes never picked up before the end count as stale until then
+    for source in sources:
+        changes = source.change_times
+        in_window = bisect.bisect_left(changes, end)
+        for change in changes[seen[source.url]:in_window]:
+            staleness.append((end - change).total_seconds() / 60)
+        total_changes += in_window - bisect.bisect_left(changes, start)
+
+    staleness.sort()
+    return PolicyResult(
+        policy=policy,
+        requests=requests,
+        changes=total_changes,
+        mean_staleness_minutes=sum(staleness) / len(staleness) if staleness else 0.0,
+        p95_staleness_minutes=_percentile(staleness, 95),
+        not_modified_rate=not_modified / requests if requests else 0.0,
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
+
+def compare_policies(
+    sources: List[SimulatedSource],
+    start: datetime,
+    end: datetime,
+    model: Optional[PredictivePollingModel] = None,
+    seed: int = 7
+) -> Dict[str, PolicyResult]:
+    """Simulate the adaptive and predictive policies on the same timelines"""
+    return {
+        policy: simulate_policy(policy, sources, start, end, model=model, seed=seed)
+        for policy in (POLICY_ADAPTIVE, POLICY_PREDICTIVE)
+    }
+
+
+def format_results(results: Dict[str, PolicyResult]) -> str:
+    lines = [
+        f"{'policy':<12}{'requests':>10}{'changes':>9}{'mean stale':>12}{'p95 stale':>11}"
+        f"{'304 rate':>10}{'sim time':>10}"
+    ]
+    for result in results.values():
+        lines.append(
+            f"{result.policy:<12}{result.requests:>10}{result.changes:>9}"
+            f"{result.mean_staleness_minutes:>10.1f}m{result.p95_staleness_minutes:>9.1f}m"
+            f"{result.not_modified_rate:>10.1%}{result.elapsed_seconds:>9.1f}s"
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare polling policies on change timelines')
+    parser.add_argument('--sources', type=int, default=1000, help='Number of synthetic sources')
+    parser.add_argument('--days', type=int, default=14, help='Simulated days')
+    parser.add_argument('--seed', type=int, default=7, help='Random seed')
+    parser.add_argument('--target', type=float, default=30.0,
+                        help='Predictive policy target staleness (minutes)')
+    parser.add_argument('--timeline', help='Replay change timelines from this JSON file')
+    parser.add_argument('--save-timeline', help='Write the synthetic timelines to this JSON file and exit')
+    args = parser.parse_args()
+
+    if args.timeline:
+        sources, start, end = load_timeline(args.timeline)
+    else:
+        start = datetime(2026, 1, 5)  # a Monday
+        end = start + timedelta(days=args.days)
+        sources = synthetic_sources(args.sources, start, args.days, seed=args.seed)
+
+    if args.save_timeline:
+        save_timeline(args.save_timeline, sources, start, end)
+        print(f"Wrote {len(sources)} timelines to {args.save_timeline}")
+        return
+
+    print(f"{len(sources)} sources, {start:%Y-%m-%d} to {end:%Y-%m-%d}")
+    model = PredictivePollingModel(target_staleness_minutes=args.target)
+    print(format_results(compare_policies(sources, start, end, model=model, seed=args.seed)))
+
+
+if __name__ == '__main__':
+    main()
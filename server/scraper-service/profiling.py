@@ -0,0 +1,320 @@
+"""
+On-demand profiling of scrape runs
+
+GET /api/scrape?profile=cpu|alloc files a profile job: the scrape worker
+(scrape_worker.job_runner) runs one scrape under a profiler, and the
+request returns its hotspots instead of the jobs:
+
+- cpu: a sampling profiler. A background thread snapshots the Python
+  stacks of all threads (sys._current_frames) every PROFILE_INTERVAL_MS and
+  counts, per function, the samples where it was running (self) and on the
+  stack (total). Samples are wall-clock, so functions blocked on the
+  network show up too; `cpu_seconds` next to `wall_seconds` tells how much
+  of the run was computation. The sampler measures its own cost and
+  stretches the interval so it never takes more than PROFILE_MAX_OVERHEAD
+  of the run's time, which keeps it usable on live traffic.
+- alloc: tracemalloc with PROFILE_ALLOC_FRAMES frames per allocation. A
+  background thread snapshots the traced allocations whenever memory grows
+  past the last snapshot by 10%, so the report lists the allocation sites
+  holding the most memory at the run's peak (and what is still held at the
+  end). Snapshots are capped to PROFILE_MAX_OVERHEAD like CPU samples, but
+  tracemalloc itself slows allocation-heavy code noticeably, so keep alloc
+  profiles for investigations.
+
+Only one profile runs per process at a time; a second one gets
+ProfilerBusy (the worker runs jobs one by one, so it never does).
+Profiled scrapes parse inline, so Scrapling parsing and row normalization
+are profiled too instead of disappearing into the parse pool.
+"""
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config import env_float, env_int
+from parse_pool import inline_parsing
+
+T = TypeVar('T')
+
+PROFILE_KINDS = ('cpu', 'alloc')
+DEFAULT_TOP = 30
+# Stack frames walked per thread and sample; deeper frames are left out of 'total'
+MAX_STACK_DEPTH = 128
+_SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ProfilerBusy(Exception):
+    """Raised when another profile is already running in this process"""
+
+
+def _short_path(filename: str) -> str:
+    """File name relative to the service or site-packages, for readable reports"""
+    if filename.startswith(_SERVICE_DIR + os.sep):
+        return os.path.relpath(filename, _SERVICE_DIR)
+    marker = f"{os.sep}site-packages{os.sep}"
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename
+
+
+class SamplingProfiler:
+    """Stack-sampling profiler with a cap on its own overhead"""
+
+    def __init__(self, interval: float = 0.005, max_overhead: float = 0.02, root=None):
+        """
+        Initialize sampling profiler
+
+        Args:
+            interval: Seconds between samples when sampling is cheap
+            max_overhead: Share of wall time the sampler may spend sampling;
+                the interval grows when samples get expensive
+            root: Frame of the profiled call; the frames of its callers
+                (request dispatch) are left out
+        """
+        self.root = root
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.wall_seconds = 0.0
+        # (file, line, function) -> sample count
+        self._self: Counter = Counter()
+        self._total: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.wall_seconds = time.perf_counter() - self._started
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            started = time.perf_counter()
+            self._sample(own_id)
+            cost = time.perf_counter() - started
+            self.sampling_seconds += cost
+            # Sleep long enough that sampling stays under max_overhead of the time
+            if self._stop.wait(max(self.interval, cost / self.max_overhead - cost)):
+                return
+
+    def _sample(self, own_id: int):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            seen = set()
+            leaf = True
+            depth = 0
+            while frame is not None and frame is not self.root and depth < MAX_STACK_DEPTH:
+                code = frame.f_code
+                key = (code.co_filename, code.co_firstlineno, code.co_name)
+                if leaf:
+                    self._self[key] += 1
+                    leaf = False
+                # Recursive functions count once per sample
+                if key not in seen:
+                    seen.add(key)
+                    self._total[key] += 1
+                frame = frame.f_back
+                depth += 1
+        self.samples += 1
+
+    def report(self, top: int = DEFAULT_TOP) -> Dict:
+        """Top functions by self and by total samples"""
+        thread_samples = sum(self._self.values()) or 1
+
+        def rows(counter: Counter) -> List[Dict]:
+            return [
+                {
+                    'function': name,
+                    'file': f"{_short_path(filename)}:{line}",
+                    'samples': count,
+                    'percent': round(100.0 * count / thread_samples, 1),
+                }
+                for (filename, line, name), count in counter.most_common(top)
+            ]
+
+        return {
+            'samples': self.samples,
+            'thread_samples': sum(self._self.values()),
+            'interval_ms': round(self.interval * 1000, 2),
+            'overhead': round(self.sampling_seconds / self.wall_seconds, 4) if self.wall_seconds else 0.0,
+            'top_self': rows(self._self),
+            'top_total': rows(self._total),
+        }
+
+
+def _allocation_sites(snapshot: tracemalloc.Snapshot, top: int) -> Tuple[int, List[Dict]]:
+    """Total traced size and the largest allocation sites of a snapshot"""
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    ))
+    stats = snapshot.statistics('lineno')
+    total = sum(stat.size for stat in stats)
+    sites = []
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        sites.append({
+            'file': f"{_short_path(frame.filename)}:{frame.lineno}",
+            'code': linecache.getline(frame.filename, frame.lineno).strip(),
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count,
+            'percent': round(100.0 * stat.size / (total or 1), 1),
+        })
+    return total, sites
+
+
+class AllocationProfiler:
+    """tracemalloc with snapshots near the peak, capped like SamplingProfiler"""
+
+    # Memory growth over the last snapshot that triggers a new one
+    GROWTH = 1.1
+
+    def __init__(self, frames: int = 1, interval: float = 0.05, max_overhead: float = 0.02):
+        """
+        Initialize allocation profiler
+
+        Args:
+            frames: Stack frames tracemalloc keeps per allocation
+            interval: Seconds between checks of the traced memory
+            max_overhead: Share of wall time the profiler may spend taking snapshots
+        """
+        self.frames = frames
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.snapshots = 0
+        self.sampling_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.peak = 0
+        self._peak_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak_snapshot_size = 0
+        self._final_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._was_tracing = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self):
+        # Leave tracemalloc running if someone else (PYTHONTRACEMALLOC) started it
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='allocation-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.wall_seconds = time.perf_counter() - self._started
+        try:
+            self._final_snapshot = tracemalloc.take_snapshot()
+            _, self.peak = tracemalloc.get_traced_memory()
+        finally:
+            if not self._was_tracing:
+                tracemalloc.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current < self._peak_snapshot_size * self.GROWTH:
+                continue
+            started = time.perf_counter()
+            self._peak_snapshot = tracemalloc.take_snapshot()
+            self._peak_snapshot_size = current
+            self.snapshots += 1
+            cost = time.perf_counter() - started
+            self.sampling_seconds += cost
+            # Back off so snapshots stay under max_overhead of the time
+            if self._stop.wait(max(0.0, cost / self.max_overhead - cost)):
+                return
+
+    def report(self, top: int = DEFAULT_TOP) -> Dict:
+        """Largest allocation sites at the peak snapshot and at the end"""
+        report = {
+            'peak_kb': round(self.peak / 1024, 1),
+            'snapshots': self.snapshots,
+            'overhead': round(self.sampling_seconds / self.wall_seconds, 4) if self.wall_seconds else 0.0,
+        }
+        if self._peak_snapshot is not None:
+            size, report['top_at_peak'] = _allocation_sites(self._peak_snapshot, top)
+            report['peak_snapshot_kb'] = round(size / 1024, 1)
+        if self._final_snapshot is not None:
+            size, report['top_retained'] = _allocation_sites(self._final_snapshot, top)
+            report['retained_kb'] = round(size / 1024, 1)
+        return report
+
+
+_profile_lock = threading.Lock()
+
+
+def profile(kind: str, run: Callable[[], T], top: int = DEFAULT_TOP) -> Tuple[T, Dict]:
+    """
+    Run a callable under the CPU or allocation profiler
+
+    Configured with PROFILE_INTERVAL_MS (default 5), PROFILE_MAX_OVERHEAD
+    (default 0.02) and PROFILE_ALLOC_FRAMES (default 1).
+
+    Args:
+        kind: 'cpu' or 'alloc'
+        run: The work to profile (normally one scrape)
+        top: Functions or allocation sites listed
+
+    Returns:
+        The callable's result and the profile report
+
+    Raises:
+        ValueError: Unknown profile kind
+        ProfilerBusy: Another profile is running in this process
+    """
+    if kind not in PROFILE_KINDS:
+        raise ValueError(f"profile must be one of {', '.join(PROFILE_KINDS)}")
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy('a profile is already running')
+
+    try:
+        max_overhead = env_float('PROFILE_MAX_OVERHEAD', 0.02)
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        with inline_parsing():
+            if kind == 'cpu':
+                profiler = SamplingProfiler(
+                    interval=env_float('PROFILE_INTERVAL_MS', 5) / 1000,
+                    max_overhead=max_overhead,
+                    root=sys._getframe(),
+                )
+            else:
+                profiler = AllocationProfiler(
+                    frames=env_int('PROFILE_ALLOC_FRAMES', 1),
+                    max_overhead=max_overhead,
+                )
+            profiler.start()
+            try:
+                result = run()
+            finally:
+                profiler.stop()
+        report = profiler.report(top)
+        report.update(
+            kind=kind,
+            wall_seconds=round(time.perf_counter() - started, 3),
+            cpu_seconds=round(time.process_time() - cpu_started, 3),
+        )
+        return result, report
+    finally:
+        _profile_lock.release()
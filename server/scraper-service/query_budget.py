@@ -0,0 +1,435 @@
+"""
+Yield-driven SerpApi query budget
+
+SerpApi allows 250 searches a month. Instead of rotating through every
+query by day of year, the budget learns which queries keep finding new
+internships and spends the quota on them:
+
+- Yield: new unique jobs (application URLs never returned before) per
+  search, tracked per query with time-discounted totals so queries that
+  dried up lose their lead
+- Selection: UCB (mean yield + confidence bonus, untried queries first)
+  for most slots, plus a small random exploration share
+- Pacing: the remaining monthly quota is spread evenly over the days left
+  in the month, capped per run
+- Admission: every real search must be admitted by QuotaAdmission, a
+  file-locked usage counter shared by all processes, so overlapping runs
+  (and concurrent searches within a run) never exceed the per-run or
+  monthly quota
+
+State (per-query stats, seen-job fingerprints) is persisted as JSON
+between runs; usage counters live in their own locked file. Saving merges
+this run's searches into the state file under an exclusive lock, so
+overlapping runs add up instead of the last writer winning.
+"""
+import calendar
+import hashlib
+import math
+import os
+import random
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: admission is only serialized within the process
+    fcntl = None
+
+from config import env_float, env_int
+from state_store import atomic_write_json, load_json, state_path
+
+DEFAULT_MONTHLY_QUOTA = 250
+DEFAULT_EXPLORE_SHARE = 0.2
+DEFAULT_HALF_LIFE_DAYS = 14.0
+MAX_SEEN_FINGERPRINTS = 50000
+
+
+@dataclass
+class QueryStats:
+    """Discounted yield statistics for one query"""
+    pulls: float = 0.0
+    new_jobs: float = 0.0
+    total_searches: int = 0
+    total_new_jobs: int = 0
+    last_searched_at: Optional[str] = None
+
+    @property
+    def mean_yield(self) -> float:
+        return self.new_jobs / self.pulls if self.pulls > 0 else 0.0
+
+
+def _fingerprint(url: str) -> str:
+    return hashlib.sha1(url.strip().lower().encode('utf-8')).hexdigest()[:16]
+
+
+class QuotaExceeded(Exception):
+    """A search was refused because the run or monthly quota is spent"""
+
+
+class QuotaAdmission:
+    """
+    SerpApi usage counter shared across threads and processes
+
+    Counts are kept per month and per day in a JSON file; every read-modify-
+    write happens under an exclusive flock on a sidecar lock file.
+    """
+
+    def __init__(self, path: Optional[str] = None, monthly_quota: int = DEFAULT_MONTHLY_QUOTA):
+        """
+        Initialize quota admission
+
+        Args:
+            path: Usage counter file (None keeps counts in memory, for tests)
+            monthly_quota: Searches allowed per calendar month
+        """
+        self.path = path
+        self.monthly_quota = monthly_quota
+        self._lock = threading.Lock()
+        self._memory: Dict = {'monthly': {}, 'daily': {}}
+
+    def usage(self, now: Optional[datetime] = None) -> Tuple[int, int]:
+        """Searches used (this month, today)"""
+        now = now or datetime.utcnow()
+        with self._locked() as counts:
+            return (
+                counts['monthly'].get(now.strftime('%Y-%m'), 0),
+                counts['daily'].get(now.strftime('%Y-%m-%d'), 0),
+            )
+
+    def try_acquire(self, now: Optional[datetime] = None) -> bool:
+        """Count one search if the monthly quota allows it"""
+        now = now or datetime.utcnow()
+        month = now.strftime('%Y-%m')
+        day = now.strftime('%Y-%m-%d')
+
+        with self._locked(write=True) as counts:
+            if counts['monthly'].get(month, 0) >= self.monthly_quota:
+                return False
+            counts['monthly'][month] = counts['monthly'].get(month, 0) + 1
+            counts['daily'][day] = counts['daily'].get(day, 0) + 1
+            # Keep a year of months and the current month's days
+            counts['monthly'] = dict(sorted(counts['monthly'].items())[-12:])
+            counts['daily'] = {d: n for d, n in counts['daily'].items() if d.startswith(month)}
+            return True
+
+    def open_run(self, limit: int) -> 'RunQuota':
+        """Admission for one run that may spend at most `limit` searches"""
+        return RunQuota(self, limit)
+
+    @contextmanager
+    def _locked(self, write: bool = False):
+        with self._lock:
+            if not self.path:
+                yield self._memory
+                return
+
+            with open(self.path + '.lock', 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    counts = load_json(self.path, default=None) or {}
+                    counts.setdefault('monthly', {})
+                    counts.setdefault('daily', {})
+                    yield counts
+                    if write:
+                        atomic_write_json(self.path, counts)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RunQuota:
+    """Per-run search limit on top of the shared monthly quota (thread-safe)"""
+
+    def __init__(self, admission: QuotaAdmission, limit: int):
+        self.admission = admission
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Admit one search, or refuse if the run or month is out of quota"""
+        with self._lock:
+            if self.used >= self.limit or not self.admission.try_acquire():
+                return False
+            self.used += 1
+            return True
+
+
+class QueryBudget:
+    """Bandit allocator for the monthly SerpApi quota"""
+
+    def __init__(
+        self,
+        state_file: Optional[str] = None,
+        monthly_quota: int = DEFAULT_MONTHLY_QUOTA,
+        explore_share: float = DEFAULT_EXPLORE_SHARE,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+        exploration_weight: float = 1.0,
+        seed: Optional[int] = None,
+        admission: Optional[QuotaAdmission] = None
+    ):
+        """
+        Initialize query budget
+
+        Args:
+            state_file: JSON file holding the learned state (None keeps it in memory)
+            monthly_quota: Searches allowed per calendar month
+            explore_share: Expected share of each run's searches picked at random
+            half_life_days: Half-life of the per-query yield statistics
+            exploration_weight: Scale of the UCB confidence bonus
+            seed: Seed for the exploration random generator
+            admission: Shared usage counter (defaults to an in-memory one)
+        """
+        self.state_file = state_file
+        self.monthly_quota = monthly_quota
+        self.admission = admission or QuotaAdmission(monthly_quota=monthly_quota)
+        self.explore_share = explore_share
+        self.half_life_days = half_life_days
+        self.exploration_weight = exploration_weight
+        self._random = random.Random(seed)
+
+        self.queries: Dict[str, QueryStats] = {}
+        self.decayed_at: Optional[datetime] = None
+        self._seen: Dict[str, None] = {}
+        # Searches recorded since the last save, merged into the file on save
+        self._pending: Dict[str, QueryStats] = {}
+
+        if state_file:
+            self._load(load_json(state_file, default={}) or {})
+
+    @classmethod
+    def from_env(cls) -> 'QueryBudget':
+        """
+        Budget configured from the environment:
+        - SERPAPI_BUDGET_STATE: state file (default: serpapi_query_budget.json in SCRAPER_STATE_DIR)
+        - SERPAPI_QUOTA_STATE: shared usage counter file (default: serpapi_quota.json in SCRAPER_STATE_DIR)
+        - SERPAPI_MONTHLY_QUOTA: searches per month (default 250)
+        - SERPAPI_EXPLORE_SHARE: exploration share (default 0.2)
+        """
+        monthly_quota = env_int('SERPAPI_MONTHLY_QUOTA', DEFAULT_MONTHLY_QUOTA)
+        explore_share = env_float('SERPAPI_EXPLORE_SHARE', DEFAULT_EXPLORE_SHARE)
+
+        return cls(
+            state_file=os.environ.get('SERPAPI_BUDGET_STATE') or state_path('serpapi_query_budget.json'),
+            monthly_quota=monthly_quota,
+            explore_share=min(max(explore_share, 0.0), 1.0),
+            admission=QuotaAdmission(
+                os.environ.get('SERPAPI_QUOTA_STATE') or state_path('serpapi_quota.json'),
+                monthly_quota=monthly_quota,
+            ),
+        )
+
+    def remaining_this_month(self, now: Optional[datetime] = None) -> int:
+        used_this_month, _ = self.admission.usage(now)
+        return max(0, self.monthly_quota - used_this_month)
+
+    def allowance(self, max_queries: int, now: Optional[datetime] = None) -> int:
+        """
+        Searches this run may spend: the remaining monthly quota spread over
+        the days left in the month, minus what today already used
+        """
+        now = now or datetime.utcnow()
+        used_this_month, used_today = self.admission.usage(now)
+        # Days left including today; today's own usage is added back so the
+        # daily share does not shrink as the day goes on
+        remaining = max(0, self.monthly_quota - used_this_month)
+        days_in_month = calendar.monthrange(now.year, now.month)[1]
+        days_left = days_in_month - now.day + 1
+        daily_allowance = math.ceil((remaining + used_today) / days_left)
+        return max(0, min(max_queries, remaining, daily_allowance - used_today))
+
+    def select(self, candidates: Iterable[str], max_queries: int, now: Optional[datetime] = None) -> List[str]:
+        """
+        Pick the queries to run now
+
+        Args:
+            candidates: Candidate queries (deduplicated, in preference order)
+            max_queries: Cap on searches for this run
+
+        Returns:
+            Queries to search, at most the paced allowance
+        """
+        now = now or datetime.utcnow()
+        self._decay(now)
+
+        candidates = list(dict.fromkeys(candidates))
+        slots = min(self.allowance(max_queries, now), len(candidates))
+        if slots <= 0:
+            return []
+
+        explore_slots = sum(1 for _ in range(slots) if self._random.random() < self.explore_share)
+        exploit_slots = slots - explore_slots
+
+        # UCB score; never-searched queries rank first, in candidate order
+        total_pulls = sum(self.queries[q].pulls for q in candidates if q in self.queries)
+        scale = max([self.queries[q].mean_yield for q in candidates if q in self.queries] + [1.0])
+        log_total = math.log(max(total_pulls, 1.0) + 1.0)
+
+        def score(query: str) -> float:
+            stats = self.queries.get(query)
+            if stats is None or stats.pulls <= 0:
+                return math.inf
+            bonus = self.exploration_weight * scale * math.sqrt(log_total / stats.pulls)
+            return stats.mean_yield + bonus
+
+        ranked = sorted(candidates, key=score, reverse=True)
+        chosen = ranked[:exploit_slots]
+
+        rest = ranked[exploit_slots:]
+        chosen.extend(self._random.sample(rest, min(explore_slots, len(rest))))
+        return chosen
+
+    def record(self, query: str, job_urls: Iterable[str], now: Optional[datetime] = None, learn: bool = True) -> int:
+        """
+        Record the jobs one billed search returned (quota is counted at admission)
+
+        Args:
+            query: The query that was searched
+            job_urls: Application URLs of the jobs it returned (empty on errors)
+            learn: Update the query's yield statistics (False for ad-hoc queries)
+
+        Returns:
+            Number of jobs never seen before
+        """
+        now = now or datetime.utcnow()
+        new_jobs = 0
+        for url in job_urls:
+            if not url:
+                continue
+            fingerprint = _fingerprint(url)
+            if fingerprint not in self._seen:
+                self._seen[fingerprint] = None
+                new_jobs += 1
+
+        while len(self._seen) > MAX_SEEN_FINGERPRINTS:
+            del self._seen[next(iter(self._seen))]
+
+        if learn:
+            for stats in (self.queries.setdefault(query, QueryStats()),
+                          self._pending.setdefault(query, QueryStats())):
+                stats.pulls += 1
+                stats.new_jobs += new_jobs
+                stats.total_searches += 1
+                stats.total_new_jobs += new_jobs
+                stats.last_searched_at = now.isoformat()
+
+        return new_jobs
+
+    def save(self):
+        """
+        Merge this run's searches into the state file (no-op without one)
+
+        Under an exclusive lock the file is re-read, both sides are decayed to
+        the later decay time and the searches recorded since the last save
+        are added, so a run that saved in the meantime keeps its statistics.
+        The budget then holds the merged state.
+        """
+        if not self.state_file:
+            return
+
+        with self._locked_file():
+            data = load_json(self.state_file, default={}) or {}
+            queries = self._parse_queries(data)
+            decayed_at = datetime.fromisoformat(data['decayed_at']) if data.get('decayed_at') else None
+
+            if decayed_at is None or (self.decayed_at is not None and self.decayed_at > decayed_at):
+                merged_at = self.decayed_at
+                file_factor, pending_factor = self._decay_factor(decayed_at, merged_at), 1.0
+            else:
+                merged_at = decayed_at
+                file_factor, pending_factor = 1.0, self._decay_factor(self.decayed_at, merged_at)
+
+            for stats in queries.values():
+                stats.pulls *= file_factor
+                stats.new_jobs *= file_factor
+            for query, pending in self._pending.items():
+                stats = queries.setdefault(query, QueryStats())
+                stats.pulls += pending.pulls * pending_factor
+                stats.new_jobs += pending.new_jobs * pending_factor
+                stats.total_searches += pending.total_searches
+                stats.total_new_jobs += pending.total_new_jobs
+                stats.last_searched_at = max(filter(None, (stats.last_searched_at, pending.last_searched_at)),
+                                             default=None)
+
+            seen = dict.fromkeys(data.get('seen') or [])
+            seen.update(self._seen)
+            while len(seen) > MAX_SEEN_FINGERPRINTS:
+                del seen[next(iter(seen))]
+
+            atomic_write_json(self.state_file, {
+                'queries': {query: vars(stats) for query, stats in queries.items()},
+                'decayed_at': merged_at.isoformat() if merged_at else None,
+                'seen': list(seen),
+            })
+
+        self.queries = queries
+        self.decayed_at = merged_at
+        self._seen = seen
+        self._pending = {}
+
+    @contextmanager
+    def _locked_file(self):
+        with open(f"{self.state_file}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def stats(self, now: Optional[datetime] = None) -> Dict:
+        """Summary for logs and the API"""
+        used_this_month, _ = self.admission.usage(now)
+        top = sorted(self.queries.items(), key=lambda item: item[1].mean_yield, reverse=True)[:5]
+        return {
+            'monthly_quota': self.monthly_quota,
+            'used_this_month': used_this_month,
+            'remaining_this_month': self.remaining_this_month(now),
+            'queries_tracked': len(self.queries),
+            'top_queries': [
+                {'query': query, 'mean_new_jobs': round(stats.mean_yield, 2), 'searches': stats.total_searches}
+                for query, stats in top
+            ],
+        }
+
+    def _decay(self, now: datetime):
+        """Discount every query's statistics by the time since the last decay"""
+        if self.decayed_at is None:
+            self.decayed_at = now
+            return
+
+        if now <= self.decayed_at:
+            return
+
+        factor = self._decay_factor(self.decayed_at, now)
+        for stats in self.queries.values():
+            stats.pulls *= factor
+            stats.new_jobs *= factor
+        self.decayed_at = now
+
+    def _decay_factor(self, since: Optional[datetime], until: Optional[datetime]) -> float:
+        """Discount for statistics decayed at `since` to be current at `until`"""
+        if since is None or until is None or until <= since:
+            return 1.0
+        return 0.5 ** ((until - since).total_seconds() / 86400 / self.half_life_days)
+
+    @staticmethod
+    def _parse_queries(data: Dict) -> Dict[str, QueryStats]:
+        queries = {}
+        for query, values in (data.get('queries') or {}).items():
+            try:
+                queries[query] = QueryStats(**values)
+            except TypeError:
+                continue
+        return queries
+
+    def _load(self, data: Dict):
+        self.queries = self._parse_queries(data)
+        if data.get('decayed_at'):
+            self.decayed_at = datetime.fromisoformat(data['decayed_at'])
+        self._seen = dict.fromkeys(data.get('seen') or [])
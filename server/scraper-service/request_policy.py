@@ -0,0 +1,229 @@
+"""
+Retries and hedging for scraper HTTP calls
+
+Board APIs and raw GitHub READMEs have long latency tails and occasional
+transient failures. RequestPolicy.execute wraps one logical request:
+
+- retries: connection errors, timeouts, 429 and 5xx are retried up to
+  max_attempts times with exponential backoff and full jitter (a random
+  sleep up to base * 2^attempt), never sleeping past the caller's deadline
+- hedging (optional): when an attempt has not finished after the
+  upstream's p95 latency, an identical request is sent and the first
+  successful response wins; the straggler is left to finish in the
+  background and only feeds the counters
+
+Latency percentiles are tracked per upstream key (normally the URL) from
+successful attempts. Counters (retries, hedges, hedge wins, latency saved)
+are cumulative for the process and printed after every scrape.
+"""
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+import requests
+
+import event_log
+from config import env_float, env_int
+from deadlines import Deadline
+
+T = TypeVar('T')
+
+RETRYABLE_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed attempt is worth repeating"""
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+class RequestPolicy:
+    """Retry with backoff and jitter, plus optional hedging after the p95 latency"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 8.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 10,
+        history_size: int = 200,
+        max_workers: int = 8
+    ):
+        """
+        Initialize request policy
+
+        Args:
+            max_attempts: Attempts per request, including the first
+            backoff_seconds: Backoff base; retry n sleeps up to base * 2^(n-1)
+            max_backoff_seconds: Cap on one backoff sleep
+            hedge: Send a duplicate request when an attempt runs past the quantile
+            hedge_quantile: Latency quantile that triggers the hedge
+            hedge_min_samples: Latencies an upstream needs before it is hedged
+            history_size: Recent latencies kept per upstream
+            max_workers: Threads running hedged attempts
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.history_size = history_size
+        self.max_workers = max_workers
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counters: Dict[str, float] = {
+            'requests': 0, 'attempts': 0, 'retries': 0, 'failures': 0,
+            'hedges': 0, 'hedge_wins': 0, 'hedge_saved_seconds': 0.0,
+        }
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> 'RequestPolicy':
+        """Policy configured from REQUEST_* env vars"""
+        return cls(
+            max_attempts=env_int('REQUEST_MAX_ATTEMPTS', 3),
+            backoff_seconds=env_float('REQUEST_BACKOFF_SECONDS', 0.5),
+            max_backoff_seconds=env_float('REQUEST_MAX_BACKOFF_SECONDS', 8),
+            hedge=os.environ.get('REQUEST_HEDGING', '0').lower() in ('1', 'true', 'yes'),
+            hedge_quantile=min(1.0, max(0.0, env_float('REQUEST_HEDGE_QUANTILE', 0.95))),
+            hedge_min_samples=env_int('REQUEST_HEDGE_MIN_SAMPLES', 10),
+        )
+
+    def execute(self, key: str, call: Callable[[float], T], timeout: float = 30,
+                deadline: Optional[Deadline] = None) -> T:
+        """
+        Run one logical request under the policy
+
+        Args:
+            key: Upstream the latency history is kept for (normally the URL)
+            call: Makes one attempt; receives the attempt's timeout in seconds
+                and raises on failure (e.g. via raise_for_status)
+            timeout: Timeout of one attempt
+            deadline: Budget for all attempts and backoff sleeps
+
+        Returns:
+            The first successful attempt's result; the last error is raised
+            when every attempt failed or the error is not retryable
+        """
+        deadline = deadline or Deadline.never()
+        self._count('requests')
+
+        attempt = 1
+        while True:
+            self._count('attempts')
+            try:
+                return self._attempt(key, call, deadline.timeout(timeout))
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_retryable(e):
+                    self._count('failures')
+                    raise
+                delay = random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempt - 1)))
+                if delay >= deadline.remaining():
+                    self._count('failures')
+                    raise
+                self._count('retries')
+                event_log.info('request.retry', sample=True, url=key, attempt=attempt,
+                               delay_seconds=round(delay, 1), error=str(e))
+                time.sleep(delay)
+                attempt += 1
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds after which an attempt is hedged (None until enough history)"""
+        with self._lock:
+            history = sorted(self._latencies.get(key, ()))
+        if not self.hedge or len(history) < self.hedge_min_samples:
+            return None
+        return history[min(len(history) - 1, int(self.hedge_quantile * len(history)))]
+
+    def stats(self) -> Dict:
+        """Cumulative counters for this process"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats['hedge_saved_seconds'] = round(stats['hedge_saved_seconds'], 3)
+        return stats
+
+    def _attempt(self, key: str, call: Callable[[float], T], timeout: float) -> T:
+        delay = self.hedge_delay(key)
+        started = time.monotonic()
+        if delay is None:
+            result = call(timeout)
+            self._observe(key, time.monotonic() - started)
+            return result
+
+        # Attempts run in pool threads but keep the caller's context (metrics labels)
+        primary = self._pool().submit(contextvars.copy_context().run, call, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            result = primary.result()
+            self._observe(key, time.monotonic() - started)
+            return result
+
+        self._count('hedges')
+        hedge_started = time.monotonic()
+        hedge = self._pool().submit(contextvars.copy_context().run, call, timeout)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                won_at = time.monotonic()
+                # The history is per-attempt latency: a hedge counts from its own submit,
+                # not from the primary's, or the hedge delay would inflate the quantile
+                self._observe(key, won_at - (hedge_started if future is hedge else started))
+                if future is hedge:
+                    self._count('hedge_wins')
+                    # How much longer the straggler takes is the latency the hedge removed
+                    primary.add_done_callback(
+                        lambda _: self._count('hedge_saved_seconds', time.monotonic() - won_at)
+                    )
+                return future.result()
+        raise error
+
+    def _observe(self, key: str, seconds: float):
+        with self._lock:
+            history = self._latencies.get(key)
+            if history is None:
+                history = self._latencies[key] = deque(maxlen=self.history_size)
+            history.append(seconds)
+
+    def _count(self, name: str, amount: float = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='hedged-request')
+            return self._executor
+
+
+_shared_policy: Optional[RequestPolicy] = None
+_shared_policy_lock = threading.Lock()
+
+
+def get_request_policy() -> RequestPolicy:
+    """
+    Get the process-wide request policy
+
+    REQUEST_MAX_ATTEMPTS (default 3) bounds retries; REQUEST_HEDGING=1 turns
+    on hedging after the REQUEST_HEDGE_QUANTILE (default 0.95) latency.
+    """
+    global _shared_policy
+
+    with _shared_policy_lock:
+        if _shared_policy is None:
+            _shared_policy = RequestPolicy.from_env()
+        return _shared_policy
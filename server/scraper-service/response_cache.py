@@ -0,0 +1,135 @@
+"""
+Pre-serialized, pre-compressed HTTP payloads with ETags
+
+A PreparedPayload holds the response body for one result version together
+with its gzip/brotli encodings and a strong ETag derived from the body, so
+repeated reads only pick bytes and compare headers:
+- Accept-Encoding br/gzip -> the pre-compressed bytes
+- If-None-Match matching the chosen representation's ETag -> 304 with no body
+
+Each encoding is its own representation with its own strong ETag (the body
+ETag with the coding appended), so caches never treat gzip and brotli
+bytes as byte-for-byte interchangeable with the identity body.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Optional
+from flask import Response
+
+import metrics
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+
+def _parse_if_none_match(header: Optional[str]) -> set:
+    """Parse an If-None-Match header into a set of entity tags"""
+    if not header:
+        return set()
+    return {tag.strip().removeprefix('W/') for tag in header.split(',') if tag.strip()}
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Check whether a coding is acceptable (ignores q-values other than q=0)"""
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip().lower() == coding:
+            return params.replace(' ', '').lower() not in ('q=0', 'q=0.0')
+    return False
+
+
+@dataclass
+class PreparedPayload:
+    """Serialized response body plus its compressed encodings"""
+    body: bytes
+    mimetype: str
+    # ETag of the identity body; see etag_for() for the encoded ones
+    etag: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes, mimetype: str) -> 'PreparedPayload':
+        """Hash and compress a body once"""
+        encodings = {'gzip': gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            encodings['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return cls(body=body, mimetype=mimetype, etag=etag, encodings=encodings)
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        """ETag of one representation (None for the identity body)"""
+        if coding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{coding}"'
+
+    def make_response(self, request) -> Response:
+        """
+        Build the response for a request
+
+        Picks the best pre-compressed encoding the client accepts, and
+        returns 304 when the client already has that representation.
+        """
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        coding = next(
+            (coding for coding in ('br', 'gzip')
+             if coding in self.encodings and _accepts(accept_encoding, coding)),
+            None
+        )
+        headers = {
+            'ETag': self.etag_for(coding),
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': 'no-cache',
+        }
+
+        if headers['ETag'] in _parse_if_none_match(request.headers.get('If-None-Match')):
+            return Response(status=304, headers=headers)
+
+        if coding is None:
+            return Response(self.body, mimetype=self.mimetype, headers=headers)
+        headers['Content-Encoding'] = coding
+        return Response(self.encodings[coding], mimetype=self.mimetype, headers=headers)
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of prepared payloads
+
+    Keys should include the result version, so a new scrape result never
+    serves an old payload.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, PreparedPayload]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], PreparedPayload]) -> PreparedPayload:
+        """Return the cached payload for key, building it on first use"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+        metrics.count_cache('payload', payload is not None)
+        if payload is not None:
+            return payload
+
+        payload = build()
+
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
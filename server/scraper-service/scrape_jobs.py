@@ -0,0 +1,294 @@
+"""
+Asynchronous scrape jobs
+
+POST /api/scrape/jobs files a job and returns its id at once; whoever runs
+scrapes (the scrape worker in production, a background thread under
+`python app.py`) executes it and records per-source progress as it goes:
+
+- <id>.json: job state (status, per-source progress, timestamps), written
+  only by the runner
+- <id>.results.json: internships collected so far,
+  rewritten after every source, so clients can read partial results
+- <id>.cancel: cancellation marker written by DELETE; the runner checks it
+  between sources and stops cooperatively
+
+All files live in the shared job store directory, so any serving process
+can answer for any job. Finished jobs are deleted after SCRAPE_JOB_TTL_SECONDS.
+
+A job left running by a runner that died (a killed scrape worker) cannot be
+resumed: the runner marks such jobs failed when it starts, keeping their
+partial results, and cleanup expires unfinished jobs whose state has not
+changed for STALE_JOB_SECONDS (or the TTL, if longer).
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import event_log
+from config import env_float
+from state_store import atomic_write_json, load_json
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+# A running job rewrites its state after every source; one untouched this long is abandoned
+STALE_JOB_SECONDS = 3600
+
+
+class ScrapeCancelled(Exception):
+    """Raised from the progress callback to stop a cancelled job"""
+
+
+class ScrapeJobs:
+    """File-backed scrape job registry"""
+
+    def __init__(self, directory: str, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize job registry
+
+        Args:
+            directory: Directory for job files (created if missing)
+            ttl_seconds: How long finished jobs are kept
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id: str, suffix: str = '.json') -> str:
+        # Ids are uuid hex; anything else cannot name a job file
+        if not job_id.isalnum():
+            raise KeyError(job_id)
+        return os.path.join(self.directory, f"{job_id}{suffix}")
+
+    def create(self, keywords: str, profile: Optional[Dict] = None) -> Dict:
+        """
+        File a new job
+
+        Args:
+            keywords: Search keywords
+            profile: {'kind', 'top'} to run the scrape under the profiler;
+                the report is stored in the job as `profile_report`
+        """
+        self.cleanup()
+        job = {
+            'id': uuid.uuid4().hex,
+            'keywords': keywords,
+            'status': QUEUED,
+            'created_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'sources': {},
+            'total': 0,
+            'error': None,
+        }
+        if profile is not None:
+            job['profile'] = profile
+        atomic_write_json(self._path(job['id']), job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Current job state, or None if unknown"""
+        try:
+            job = load_json(self._path(job_id))
+        except KeyError:
+            return None
+        if job and job['status'] not in FINISHED_STATUSES:
+            job['cancel_requested'] = os.path.exists(self._path(job_id, '.cancel'))
+        return job
+
+    def results(self, job_id: str) -> Dict:
+        """Internships collected so far"""
+        return load_json(self._path(job_id, '.results.json')) or {'internships': []}
+
+    def wait(self, job_id: str, timeout: float, poll_seconds: float = 0.5,
+             runner_alive: Optional[Callable[[], bool]] = None) -> Optional[Dict]:
+        """
+        Block until a job finishes
+
+        Returns:
+            The finished job, or None on timeout or once runner_alive()
+            reports the runner gone
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is not None and job['status'] in FINISHED_STATUSES:
+                return job
+            if time.monotonic() >= deadline or (runner_alive is not None and not runner_alive()):
+                return None
+            time.sleep(poll_seconds)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Request cooperative cancellation; returns the job (None if unknown)"""
+        job = self.get(job_id)
+        if job is None or job['status'] in FINISHED_STATUSES:
+            return job
+        with open(self._path(job_id, '.cancel'), 'w') as f:
+            f.write(datetime.utcnow().isoformat())
+        job['cancel_requested'] = True
+        return job
+
+    def queued(self) -> List[Dict]:
+        """Jobs waiting to run, oldest first"""
+        jobs = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json') and not name.endswith('.results.json') and not name.startswith('.'):
+                job = load_json(os.path.join(self.directory, name))
+                if job and job.get('status') == QUEUED:
+                    jobs.append(job)
+        return sorted(jobs, key=lambda job: job['created_at'])
+
+    def run(self, job_id: str, runner: Callable[[str, Callable], Dict]) -> Optional[Dict]:
+        """
+        Execute a queued job
+
+        Args:
+            job_id: Job to run
+            runner: Called as runner(keywords, progress); must pass progress on
+                to scrape_all_sources and return the stored result (plus
+                `profile_report` for profile jobs)
+
+        Returns:
+            Final job state
+        """
+        job = self.get(job_id)
+        if job is None or job['status'] != QUEUED:
+            return job
+
+        cancel_path = self._path(job_id, '.cancel')
+        job_path = self._path(job_id)
+        results = {'internships': []}
+        lock = threading.Lock()
+
+        def finish(status: str, error: Optional[str] = None):
+            job.pop('cancel_requested', None)
+            job.update(status=status, error=error, finished_at=datetime.utcnow().isoformat())
+            atomic_write_json(job_path, job)
+
+        def progress(source: str, status: str, jobs=None, error=None, truncated=False):
+            with lock:
+                entry = job['sources'].setdefault(source, {'status': status})
+                entry['status'] = status
+                if status == RUNNING:
+                    entry['started_at'] = time.time()
+                else:
+                    entry['elapsed_seconds'] = round(time.time() - entry.get('started_at', time.time()), 2)
+                    entry['jobs_found'] = len(jobs or ())
+                    if error:
+                        entry['error'] = error
+                    if truncated:
+                        entry['truncated'] = True
+                    if jobs:
+                        results['internships'].extend(record.to_dict() for record in jobs)
+                        job['total'] = len(results['internships'])
+                        atomic_write_json(self._path(job_id, '.results.json'), results)
+                atomic_write_json(job_path, job)
+            if os.path.exists(cancel_path):
+                raise ScrapeCancelled(job_id)
+
+        if os.path.exists(cancel_path):
+            finish(CANCELLED)
+            return job
+
+        job.pop('cancel_requested', None)
+        job.update(status=RUNNING, started_at=datetime.utcnow().isoformat())
+        atomic_write_json(job_path, job)
+        event_log.info('job.start', job=job_id, keywords=job['keywords'])
+        # A scrape can run for minutes without another event to push this out
+        event_log.flush()
+
+        try:
+            result = runner(job['keywords'], progress)
+        except ScrapeCancelled:
+            finish(CANCELLED)
+            return job
+        except Exception as e:
+            event_log.error('job.failed', job=job_id, error=str(e))
+            finish(FAILED, str(e))
+            return job
+
+        # The stored result replaces the partials (ledger dates)
+        results = {'internships': result['batch'].to_dicts()}
+        atomic_write_json(self._path(job_id, '.results.json'), results)
+        job['total'] = len(results['internships'])
+        job['version'] = result['version']
+        job['truncated'] = result.get('truncated', [])
+        if 'profile_report' in result:
+            job['profile_report'] = result['profile_report']
+        finish(SUCCEEDED)
+        return job
+
+    def fail_orphaned(self) -> List[str]:
+        """
+        Mark jobs left running by a runner that is gone as failed
+
+        Only the single job runner may call this, before it runs anything:
+        every running job then belongs to a runner that died mid-scrape.
+        Partial results stay readable.
+
+        Returns:
+            Ids of the jobs marked failed
+        """
+        orphaned = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json') or name.endswith('.results.json') or name.startswith('.'):
+                continue
+            job = load_json(os.path.join(self.directory, name))
+            if not job or job.get('status') != RUNNING:
+                continue
+            job.pop('cancel_requested', None)
+            job.update(status=FAILED, error='scrape runner stopped before the job finished',
+                       finished_at=datetime.utcnow().isoformat())
+            atomic_write_json(self._path(job['id']), job)
+            orphaned.append(job['id'])
+        return orphaned
+
+    def cleanup(self, now: Optional[float] = None):
+        """Delete files of jobs finished more than ttl_seconds ago, and of abandoned unfinished jobs"""
+        now = now or time.time()
+        cutoff = now - self.ttl_seconds
+        stale_cutoff = now - max(self.ttl_seconds, STALE_JOB_SECONDS)
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                modified = os.stat(path).st_mtime
+                if modified >= cutoff:
+                    continue
+                if name.endswith('.json') and not name.endswith('.results.json') and modified >= stale_cutoff:
+                    job = load_json(path)
+                    if job and job.get('status') not in FINISHED_STATUSES:
+                        continue
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+
+
+_shared_jobs: Optional[ScrapeJobs] = None
+_shared_jobs_lock = threading.Lock()
+
+
+def get_scrape_jobs() -> ScrapeJobs:
+    """
+    Get the process-wide scrape job registry
+
+    Job files live in a `jobs` directory next to the job store; finished
+    jobs are kept for SCRAPE_JOB_TTL_SECONDS (default one day).
+    """
+    global _shared_jobs
+
+    from job_store import get_job_store
+
+    with _shared_jobs_lock:
+        if _shared_jobs is None:
+            ttl = env_float('SCRAPE_JOB_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+            directory = os.path.join(get_job_store().directory, 'jobs')
+            _shared_jobs = ScrapeJobs(directory, ttl_seconds=ttl)
+        return _shared_jobs
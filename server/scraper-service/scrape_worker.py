@@ -0,0 +1,227 @@
+"""
+Scrape worker: runs scrapes outside the request-serving processes
+
+In production (wsgi.py under gunicorn) request workers never scrape. They
+file a request in the shared JobStore and serve stored results, while this
+worker, a single separate process, picks requests up one at a time,
+scrapes, and saves the result for every request worker to read. Learned
+state (polling, ledger, seen filter, quota) therefore has one writer.
+
+Run standalone with `python scrape_worker.py`, or let gunicorn.conf.py
+start it next to the web workers. SIGTERM/SIGINT stop it after the current
+scrape. If it is killed mid-scrape, a plain request stays on disk and is
+scraped again on restart; a scrape job cannot be resumed, so the restarted
+worker marks it failed and its partial results stay readable.
+"""
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import event_log
+from job_batch import JobBatch
+from job_store import JobStore, get_job_store
+from metrics import get_metrics
+from profiling import DEFAULT_TOP, profile
+from scrape_jobs import ScrapeJobs, get_scrape_jobs
+import tracing
+from watermarks import get_watermark_store
+
+
+def run_scrape(keywords: str, store: JobStore, progress: Optional[Callable] = None) -> Dict:
+    """Scrape all sources for keywords and save the result in the store"""
+    from scrapers import commit_board_watermarks, remember_emitted, scrape_all_sources
+
+    truncated = []
+
+    def track(source: str, status: str, **details):
+        # Sources that ran out of budget are named in the stored result
+        if details.get('truncated'):
+            truncated.append(source)
+        if progress is not None:
+            progress(source, status, **details)
+
+    watermark_store = get_watermark_store()
+    watermarks = watermark_store.pending() if watermark_store is not None else None
+    with tracing.trace('scrape', keywords=keywords):
+        jobs = scrape_all_sources(keywords, progress=track, watermarks=watermarks)
+        batch = JobBatch.from_records(jobs)
+        # Removals are not part of the result: the ledger keeps them for the
+        # removal feed (GET /api/scrape/removed) until each consumer has read them
+        with tracing.span('store', jobs=len(batch)):
+            entry = store.save(keywords, batch, truncated=truncated)
+        # Only jobs that made it into a stored result count as emitted, and
+        # only boards whose postings were stored move their watermarks
+        remember_emitted(jobs)
+        if watermarks is not None:
+            commit_board_watermarks(watermarks)
+    registry = get_metrics()
+    if registry is not None:
+        # Publish this scrape's timings to /metrics right away
+        registry.inc('scraper_scrapes_total')
+        registry.flush()
+    return entry
+
+
+def job_runner(job: Dict, store: JobStore) -> Callable[[str, Callable], Dict]:
+    """
+    Runner for ScrapeJobs.run: a plain scrape, or for a profile job
+    (GET /api/scrape?profile=...) the same scrape under the profiler
+
+    Profile jobs run here rather than in the request that asked for them,
+    so the profiled scrape is the scrape worker's own: the one writer of
+    learned state, with its warm polling manager and caches.
+    """
+    options = job.get('profile')
+    if not options:
+        return lambda keywords, progress: run_scrape(keywords, store, progress)
+
+    def run_profiled(keywords: str, progress: Callable) -> Dict:
+        entry, report = profile(options['kind'], lambda: run_scrape(keywords, store, progress),
+                                top=options.get('top', DEFAULT_TOP))
+        return dict(entry, profile_report=report)
+
+    return run_profiled
+
+
+class ScrapeWorker:
+    """Serves scrape jobs and requests from a JobStore until stopped"""
+
+    def __init__(self, store: JobStore, jobs: Optional[ScrapeJobs] = None,
+                 poll_seconds: float = 1.0, heartbeat_seconds: float = 10.0):
+        """
+        Initialize scrape worker
+
+        Args:
+            store: Shared job store
+            jobs: Scrape job registry (POST /api/scrape/jobs), run before plain requests
+            poll_seconds: How often to look for new requests when idle
+            heartbeat_seconds: How often to refresh the heartbeat file
+        """
+        self.store = store
+        self.jobs = jobs
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.busy: Optional[str] = None
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def run(self):
+        """Process requests until stop() (or SIGTERM/SIGINT in the main thread)"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name='scrape-heartbeat', daemon=True)
+        heartbeat.start()
+        if self.jobs is not None:
+            # This is the only job runner: anything still running was left by a dead worker
+            for job_id in self.jobs.fail_orphaned():
+                event_log.warning('job.orphaned', job=job_id)
+        event_log.info('worker.started', pid=os.getpid())
+        event_log.flush()
+
+        while not self._stop.is_set():
+            queued = self.jobs.queued() if self.jobs is not None else []
+            if queued:
+                self._run_job(queued[0])
+                continue
+
+            pending = self.store.pending_requests()
+            if not pending:
+                self._stop.wait(self.poll_seconds)
+                continue
+
+            keywords = pending[0]['keywords']
+            started_at = time.time()
+            self.busy = keywords
+            self.store.heartbeat(busy=keywords)
+            try:
+                run_scrape(keywords, self.store)
+            except Exception as e:
+                event_log.error('scrape.failed', keywords=keywords, error=str(e))
+            finally:
+                self.busy = None
+                self.store.heartbeat()
+            # Failed scrapes are not retried in a loop; the next request asks again
+            self.store.complete_request(keywords, started_at)
+
+        event_log.info('worker.stopped', pid=os.getpid())
+        event_log.flush()
+
+    def _run_job(self, job: Dict):
+        self.busy = job['keywords']
+        self.store.heartbeat(busy=self.busy)
+        try:
+            self.jobs.run(job['id'], job_runner(job, self.store))
+        finally:
+            self.busy = None
+            self.store.heartbeat()
+
+    def _heartbeat_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.store.heartbeat(busy=self.busy)
+            except OSError as e:
+                event_log.warning('worker.heartbeat_failed', error=str(e))
+            self._stop.wait(self.heartbeat_seconds)
+
+
+class ScrapeWorkerSupervisor:
+    """Keeps one scrape worker subprocess running (used from the gunicorn master)"""
+
+    def __init__(self, grace_seconds: float = 20.0, restart_delay: float = 5.0):
+        """
+        Initialize supervisor
+
+        Args:
+            grace_seconds: How long stop() waits for the worker to exit before killing it
+            restart_delay: Pause before restarting a worker that exited
+        """
+        self.grace_seconds = grace_seconds
+        self.restart_delay = restart_delay
+        self.process: Optional[subprocess.Popen] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._supervise, name='scrape-supervisor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Ask the worker to finish its current scrape, killing it after the grace period"""
+        self._stopping.set()
+        process = self.process
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=self.grace_seconds)
+        except subprocess.TimeoutExpired:
+            event_log.warning('worker.killed', grace_seconds=self.grace_seconds)
+            process.kill()
+            process.wait()
+
+    def _supervise(self):
+        script = os.path.abspath(__file__)
+        while not self._stopping.is_set():
+            self.process = subprocess.Popen([sys.executable, script], cwd=os.path.dirname(script))
+            # The gunicorn master may reap the child first; wait() then reports 0
+            returncode = self.process.wait()
+            if self._stopping.is_set():
+                break
+            event_log.error('worker.exited', returncode=returncode, restart_in_seconds=self.restart_delay)
+            self._stopping.wait(self.restart_delay)
+
+
+def main():
+    ScrapeWorker(get_job_store(), get_scrape_jobs()).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,39 @@
 """
 Web scrapers for various internship sources using Scrapling
+
+HTML sources parse through the pluggable backends in html_parsers.py.
 """
-from scrapling.fetchers import Fetcher, StealthyFetcher
-from typing import List, Dict, Optional
+from scrapling.fetchers import StealthyFetcher
+from typing import Callable, Iterable, List, Dict, Optional, TypeVar
+import contextvars
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
 from datetime import datetime, date, timedelta
 from urllib.parse import urljoin, urlparse
 from html import unescape
 from dateutil import parser as date_parser
 import requests
+from contextlib import nullcontext
 from serpapi import GoogleSearch
 from smart_polling import SmartPollingManager
+from circuit_breaker import CircuitOpen
+from config import env_int
+from request_policy import RequestPolicy, get_request_policy
+import event_log
+import metrics
+import tracing
+from parse_pool import ParsePool, get_parse_pool
+from html_parsers import DEFAULT_HEADERS, fetch_document, get_parser
+from job_record import JobRecord, stable_id
+from query_budget import QueryBudget, QuotaExceeded, RunQuota
+from serpapi_cache import SerpApiCache, get_serpapi_cache
+from seen_filter import get_seen_filter
+from job_ledger import JobLedger, get_job_ledger
+from watermarks import PendingWatermarks, get_watermark_store
+from deadlines import Deadline, scrape_slo_seconds, source_budget_seconds
 from delta_scrapers import GreenhouseScraper, LeverScraper, GREENHOUSE_COMPANIES, LEVER_COMPANIES
 
 DATE_KEYWORDS = re.compile(
@@ -334,6 +356,7 @@ def _parse_date_string(raw_value: str) -> Optional[str]:
         return None
 
 
+@tracing.stage('extract_application_deadline')
 def extract_application_deadline(*candidates: Optional[str]) -> Optional[str]:
     """Extract application deadline from iterable text snippets."""
     for raw in candidates:
@@ -365,6 +388,7 @@ def extract_application_deadline(*candidates: Optional[str]) -> Optional[str]:
     return None
 
 
+@tracing.stage('clean_job_title')
 def clean_job_title(title: str) -> str:
     """
     Clean job title by removing metadata and redundant information.
@@ -437,12 +461,101 @@ def clean_job_title(title: str) -> str:
     return cleaned if cleaned and len(cleaned) > 5 else original_title
 
 
+def _first_link_href(node) -> str:
+    """Get the href of the first link inside a node"""
+    link = node.css_first('a')
+    return link.attrs.get('href', '') if link else ''
+
+
+def extract_table_rows(page, max_rows_per_table: Optional[int] = None,
+                       max_rows: Optional[int] = None) -> List[Dict]:
+    """
+    Flatten HTML tables into plain row records
+
+    Row records only hold strings, so they are cheap to pickle and can be
+    normalized in another process (see parse_pool.py).
+
+    Args:
+        page: Parsed page root node (see html_parsers.py)
+        max_rows_per_table: Maximum body rows to take from each table
+        max_rows: Maximum body rows to take overall
+
+    Returns:
+        List of dicts with table/row indices, cell texts, first link per cell
+        and the row's own text
+    """
+    rows = []
+    for table_idx, table in enumerate(page.css('table')):
+        table_rows = table.css('tbody tr')
+        if max_rows_per_table is not None:
+            table_rows = table_rows[:max_rows_per_table]
+
+        for row_idx, row in enumerate(table_rows):
+            if max_rows is not None and len(rows) >= max_rows:
+                return rows
+
+            cells = row.css('td')
+            rows.append({
+                'table': table_idx,
+                'row': row_idx,
+                'cells': [cell.text for cell in cells],
+                'links': [_first_link_href(cell) for cell in cells],
+                'text': row.text,
+            })
+
+    return rows
+
+
+T = TypeVar('T')
+
+
+def _get_text(url: str, timeout: float) -> str:
+    """GET a page and return its body (raises on HTTP errors)"""
+    with metrics.fetching() as fetch:
+        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
+        response.raise_for_status()
+        fetch['bytes'] = len(response.content)
+    return response.text
+
+
 class InternshipScraper:
     """Base class for internship scrapers"""
 
+    # Whether scrape() lists every current posting of its sources (searches
+    # and capped feeds do not), so missing jobs can be treated as removed
+    COMPLETE_LISTING = False
+
     def __init__(self):
         self.internships = []
-
+        self.seen_filter = get_seen_filter()
+        # Replaced per run by scrape_all_sources; row loops and fetches check it
+        self.deadline = Deadline.never()
+        # Circuit breakers and retry/hedging for upstream calls (set by scrape_all_sources)
+        self.polling_manager: Optional[SmartPollingManager] = None
+        self.request_policy: Optional[RequestPolicy] = None
+
+    def upstream(self, url: str, name: str, ignore: tuple = ()):
+        """Guard one upstream call with its circuit breaker (no-op without a polling manager)"""
+        if self.polling_manager is None:
+            return nullcontext()
+        return self.polling_manager.guard(url, name, ignore=ignore)
+
+    def request(self, url: str, call: Callable[[float], T], timeout: float = 30) -> T:
+        """Run call(timeout) with the request policy's retries and hedging, within the deadline"""
+        if self.request_policy is None:
+            return call(self.deadline.timeout(timeout))
+        return self.request_policy.execute(url, call, timeout=timeout, deadline=self.deadline)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the last scrape stopped early because its deadline ran out"""
+        return self.deadline.truncated
+
+    def already_seen(self, key: str) -> bool:
+        """Whether an earlier run already emitted this posting (only with SEEN_FILTER=1)"""
+        return self.seen_filter is not None and self.seen_filter.seen(key)
+
+    @tracing.stage('is_internship')
     def is_internship(self, title: str, description: str = "") -> bool:
         """Check if a job posting is an internship"""
         text = f"{title} {description}".lower()
@@ -454,6 +567,7 @@ class InternshipScraper:
         ]
         return any(keyword in text for keyword in keywords)
 
+    @tracing.stage('categorize_job_type')
     def categorize_job_type(self, title: str, description: str = "") -> str:
         """Categorize job type from title and optional description"""
         text = f"{title or ''} {description or ''}"
@@ -464,6 +578,7 @@ class InternshipScraper:
 
         return 'Other'
 
+    @tracing.stage('detect_eligible_years')
     def detect_eligible_years(self, title: str, description: str = "") -> List[str]:
         """Detect eligible class years from title and description"""
         text = f"{title} {description}".lower()
@@ -493,7 +608,7 @@ class InternshipScraper:
 
         return eligible
 
-    def scrape(self) -> List[Dict]:
+    def scrape(self) -> List[JobRecord]:
         """Override this method in subclasses"""
         raise NotImplementedError
 
@@ -501,14 +616,16 @@ class InternshipScraper:
 class LinkedInScraper(InternshipScraper):
     """Scrape LinkedIn job postings"""
 
-    def scrape(self, keywords: str = "software engineering intern") -> List[Dict]:
+    def scrape(self, keywords: str = "software engineering intern") -> List[JobRecord]:
         """Scrape LinkedIn for internships"""
         try:
             # LinkedIn search URL for internships
             search_url = f"https://www.linkedin.com/jobs/search?keywords={keywords.replace(' ', '%20')}&f_E=1,2"
 
             # Use StealthyFetcher to avoid detection
-            page = StealthyFetcher.fetch(search_url, headless=True, timeout=30)
+            page = get_parser('linkedin').from_scrapling(
+                StealthyFetcher.fetch(search_url, headless=True, timeout=30)
+            )
 
             jobs = []
             job_cards = page.css('.base-card')[:20]  # Limit to first 20 results
@@ -542,39 +659,39 @@ class LinkedInScraper(InternshipScraper):
                     )
 
                     if self.is_internship(title):
-                        jobs.append({
-                            'id': f'linkedin-{hash(url)}',
-                            'company_name': company,
-                            'position_title': title,
-                            'description': f'Internship opportunity at {company}',
-                            'job_type': self.categorize_job_type(title),
-                            'location': location,
-                            'eligible_years': ['Junior', 'Senior', 'Graduate'],
-                            'posted_date': datetime.now().isoformat(),
-                            'application_deadline': deadline,
-                            'application_url': url,
-                            'is_active': True,
-                            'source': 'LinkedIn'
-                        })
+                        jobs.append(JobRecord(
+                            id=f'linkedin-{stable_id(url)}',
+                            company_name=company,
+                            position_title=title,
+                            description=f'Internship opportunity at {company}',
+                            job_type=self.categorize_job_type(title),
+                            location=location,
+                            eligible_years=['Junior', 'Senior', 'Graduate'],
+                            posted_date=datetime.now().isoformat(),
+                            application_deadline=deadline,
+                            application_url=url,
+                            is_active=True,
+                            source='LinkedIn'
+                        ))
                 except Exception as e:
-                    print(f"Error parsing LinkedIn job card: {e}")
+                    event_log.warning('parse_error', sample=True, item='job card', error=str(e))
                     continue
 
             return jobs
         except Exception as e:
-            print(f"Error scraping LinkedIn: {e}")
+            event_log.error('source.failed', scraper='LinkedInScraper', error=str(e))
             return []
 
 
 class IndeedScraper(InternshipScraper):
     """Scrape Indeed job postings"""
 
-    def scrape(self, keywords: str = "software engineering intern") -> List[Dict]:
+    def scrape(self, keywords: str = "software engineering intern") -> List[JobRecord]:
         """Scrape Indeed for internships"""
         try:
             search_url = f"https://www.indeed.com/jobs?q={keywords.replace(' ', '+')}&l=&jt=internship"
 
-            page = Fetcher.get(search_url, timeout=30)
+            page = fetch_document(search_url, 'indeed')
 
             jobs = []
             job_cards = page.css('.job_seen_beacon')[:20]
@@ -605,124 +722,168 @@ class IndeedScraper(InternshipScraper):
                     )
 
                     if self.is_internship(title):
-                        jobs.append({
-                            'id': f'indeed-{job_key}',
-                            'company_name': company,
-                            'position_title': title,
-                            'description': f'Internship opportunity at {company}',
-                            'job_type': self.categorize_job_type(title),
-                            'location': location,
-                            'eligible_years': ['Sophomore', 'Junior', 'Senior', 'Graduate'],
-                            'posted_date': datetime.now().isoformat(),
-                            'application_deadline': deadline,
-                            'application_url': url,
-                            'is_active': True,
-                            'source': 'Indeed'
-                        })
+                        jobs.append(JobRecord(
+                            id=f'indeed-{job_key}',
+                            company_name=company,
+                            position_title=title,
+                            description=f'Internship opportunity at {company}',
+                            job_type=self.categorize_job_type(title),
+                            location=location,
+                            eligible_years=['Sophomore', 'Junior', 'Senior', 'Graduate'],
+                            posted_date=datetime.now().isoformat(),
+                            application_deadline=deadline,
+                            application_url=url,
+                            is_active=True,
+                            source='Indeed'
+                        ))
                 except Exception as e:
-                    print(f"Error parsing Indeed job card: {e}")
+                    event_log.warning('parse_error', sample=True, item='job card', error=str(e))
                     continue
 
             return jobs
         except Exception as e:
-            print(f"Error scraping Indeed: {e}")
+            event_log.error('source.failed', scraper='IndeedScraper', error=str(e))
             return []
 
 
 class LevelsFyiScraper(InternshipScraper):
     """Scrape Levels.fyi internship postings with smart polling"""
 
-    def __init__(self, polling_manager: Optional[SmartPollingManager] = None):
+    # Only the first MAX_ROWS rows are read, so jobs past the cap look missing;
+    # the listing is not complete and the ledger must not remove them
+    COMPLETE_LISTING = False
+
+    MAX_ROWS = 30
+
+    def __init__(self, polling_manager: Optional[SmartPollingManager] = None,
+                 parse_pool: Optional[ParsePool] = None):
         super().__init__()
         self.polling_manager = polling_manager or SmartPollingManager()
+        self.parse_pool = parse_pool
         self.source_url = "https://www.levels.fyi/internships/"
         self.source_name = "Levels.fyi"
 
-    def scrape(self) -> List[Dict]:
+    def extract_rows_from_html(self, html: str, url: str) -> List[Dict]:
+        """Parse a raw Levels.fyi page into row records"""
+        page = get_parser('levels').parse(html, url)
+        return extract_table_rows(page, max_rows=self.MAX_ROWS)
+
+    def parse_rows(self, context, rows: List[Dict]) -> List[JobRecord]:
+        """Normalize Levels.fyi row records into job records"""
+        jobs = []
+
+        for row in rows:
+            if self.deadline.stop():
+                break
+            try:
+                cells = row['cells']
+                if len(cells) < 3:
+                    continue
+
+                company = cells[0].strip()
+                title = cells[1].strip()
+                location = cells[2].strip() if len(cells) > 2 else 'Various'
+
+                # Clean the title
+                title = clean_job_title(title)
+
+                url = row['links'][1]
+
+                deadline_candidates = []
+                if len(cells) > 3:
+                    deadline_candidates.append(cells[3].strip())
+                if len(cells) > 4:
+                    deadline_candidates.append(cells[4].strip())
+                deadline = extract_application_deadline(*deadline_candidates)
+
+                jobs.append(JobRecord(
+                    id=f'levels-{stable_id(company, title)}',
+                    company_name=company,
+                    position_title=title,
+                    description=f'{title} internship at {company}',
+                    job_type=self.categorize_job_type(title),
+                    location=location,
+                    eligible_years=['Sophomore', 'Junior', 'Senior'],
+                    posted_date=datetime.now().isoformat(),
+                    application_deadline=deadline,
+                    application_url=url if url.startswith('http') else f'https://www.levels.fyi{url}',
+                    is_active=True,
+                    source='Levels.fyi'
+                ))
+            except Exception as e:
+                event_log.warning('parse_error', sample=True, item='row', error=str(e))
+                continue
+
+        return jobs
+
+    def scrape(self) -> List[JobRecord]:
         """Scrape Levels.fyi for internships with conditional requests"""
         try:
             url = self.source_url
 
             # Check if we should poll
             if not self.polling_manager.should_poll_source(url, self.source_name):
-                print(f"  ⏭️  {self.source_name}: Skipping (not due for poll)")
-                return []
+                event_log.info('poll.skipped', upstream=self.source_name, reason='not due')
+                return self.polling_manager.cached_jobs(url, self.source_name)
 
             # Fetch with conditional request
+            content = None
             try:
                 content, status, headers = self.polling_manager.fetch_with_conditional_request(
-                    url, self.source_name
+                    url, self.source_name, timeout=self.deadline.timeout(30)
                 )
 
                 if status == 304:
                     # Not modified, no need to process
-                    return []
-
-                # Parse HTML from content
-                from scrapling import Adaptor
-                page = Adaptor.from_html(content, url)
+                    self.polling_manager.adjust_polling_interval(url, self.source_name, False)
+                    return self.polling_manager.cached_jobs(url, self.source_name)
 
+            except CircuitOpen:
+                event_log.info('poll.skipped', upstream=self.source_name, reason='circuit open')
+                return self.polling_manager.cached_jobs(url, self.source_name)
             except Exception:
-                # Fallback to regular fetch if conditional request fails
-                page = Fetcher.get(url, timeout=30)
+                content = None
 
-            jobs = []
-            rows = page.css('table tbody tr')[:30]
-
-            for row in rows:
-                try:
-                    cells = row.css('td')
-                    if len(cells) < 3:
-                        continue
-
-                    company = cells[0].text.strip()
-                    title = cells[1].text.strip()
-                    location = cells[2].text.strip() if len(cells) > 2 else 'Various'
-
-                    # Clean the title
-                    title = clean_job_title(title)
-
-                    link_elem = cells[1].css_first('a')
-                    url = link_elem.attrs.get('href', '') if link_elem else ''
-
-                    deadline_candidates = []
-                    if len(cells) > 3:
-                        deadline_candidates.append(cells[3].text.strip())
-                    if len(cells) > 4:
-                        deadline_candidates.append(cells[4].text.strip())
-                    deadline = extract_application_deadline(*deadline_candidates)
-
-                    jobs.append({
-                        'id': f'levels-{hash(f"{company}-{title}")}',
-                        'company_name': company,
-                        'position_title': title,
-                        'description': f'{title} internship at {company}',
-                        'job_type': self.categorize_job_type(title),
-                        'location': location,
-                        'eligible_years': ['Sophomore', 'Junior', 'Senior'],
-                        'posted_date': datetime.now().isoformat(),
-                        'application_deadline': deadline,
-                        'application_url': url if url.startswith('http') else f'https://www.levels.fyi{url}',
-                        'is_active': True,
-                        'source': 'Levels.fyi'
-                    })
-                except Exception as e:
-                    print(f"Error parsing Levels.fyi row: {e}")
-                    continue
+            if content is None:
+                # Fallback to regular fetch if conditional request fails
+                page = fetch_document(url, 'levels', timeout=self.deadline.timeout(30))
+                with metrics.timed('scraper_parse_seconds'):
+                    with tracing.span('parse'):
+                        rows = extract_table_rows(page, max_rows=self.MAX_ROWS)
+                    with tracing.span('classify', rows=len(rows)):
+                        jobs = self.parse_rows(None, rows)
+            elif self.parse_pool:
+                # Ship the raw body to the process pool
+                with metrics.timed('scraper_parse_seconds'), tracing.span('parse_pool'):
+                    jobs = self.parse_pool.parse_pages('levels', [(None, content, url)], deadline=self.deadline)[0]
+            else:
+                with metrics.timed('scraper_parse_seconds'):
+                    with tracing.span('parse'):
+                        page = get_parser('levels').parse(content, url)
+                        rows = extract_table_rows(page, max_rows=self.MAX_ROWS)
+                    with tracing.span('classify', rows=len(rows)):
+                        jobs = self.parse_rows(None, rows)
 
             # Detect content delta and adjust polling
             has_changed = self.polling_manager.detect_content_delta(url, self.source_name, jobs)
             self.polling_manager.adjust_polling_interval(url, self.source_name, has_changed)
+            self.polling_manager.remember_jobs(url, self.source_name, jobs)
 
             return jobs
         except Exception as e:
-            print(f"Error scraping Levels.fyi: {e}")
+            event_log.error('source.failed', scraper='LevelsFyiScraper', error=str(e))
             return []
 
 
 class GitHubInternshipScraper(InternshipScraper):
     """Scrape GitHub-based internship repositories using Scrapling"""
 
+    # Tables are cut at MAX_ROWS_PER_TABLE rows, and the big repos list more,
+    # so the listing is not complete and the ledger must not remove jobs
+    COMPLETE_LISTING = False
+
+    MAX_ROWS_PER_TABLE = 100
+
     GITHUB_REPOS = [
         {
             'name': 'SimplifyJobs Summer 2026',
@@ -751,154 +912,194 @@ class GitHubInternshipScraper(InternshipScraper):
         }
     ]
 
-    def scrape_repo(self, repo_config: Dict) -> List[Dict]:
+    def __init__(self, parse_pool: Optional[ParsePool] = None):
+        super().__init__()
+        self.parse_pool = parse_pool
+
+    def extract_rows_from_html(self, html: str, url: str) -> List[Dict]:
+        """Parse a raw README page into row records"""
+        page = get_parser('github').parse(html, url)
+        return extract_table_rows(page, max_rows_per_table=self.MAX_ROWS_PER_TABLE)
+
+    def parse_rows(self, repo_config: Dict, rows: List[Dict]) -> List[JobRecord]:
+        """Normalize README row records into job records"""
+        jobs = []
+        # Checked once per page, not per row
+        debug = event_log.enabled(event_log.DEBUG)
+
+        for row in rows:
+            if self.deadline.stop():
+                break
+            try:
+                cells = row['cells']
+                links = row['links']
+                if len(cells) < 2:
+                    continue
+
+                # Different repos have different column orders
+                # Common patterns: [Company, Role, Location, ...] or [Name, Location, Notes]
+                company = cells[0].strip()
+                role = cells[1].strip() if len(cells) > 1 else 'Software Engineering Intern'
+                location = cells[2].strip() if len(cells) > 2 else 'Various'
+
+                # Clean the role title to remove metadata
+                role = clean_job_title(role)
+
+                # Skip header rows or invalid entries
+                if not company or company.lower() in ['company', 'name', '']:
+                    continue
+
+                # Try to find apply link from role column, then any other cell
+                url = links[1]
+                if not url:
+                    url = next((link for link in links if link), '')
+
+                # Emitted by an earlier run: skip the expensive parsing below
+                if url and self.already_seen(url):
+                    continue
+
+                # Skip closed positions
+                row_text = row['text']
+                if '🔒' in row_text or 'closed' in row_text.lower() or '❌' in row_text:
+                    if debug:
+                        event_log.debug('github.row_skipped', table=row['table'], row=row['row'],
+                                        company=company, role=role, reason='closed')
+                    continue
+
+                # Check for deadline information
+                deadline_candidates = []
+                if len(cells) > 3:
+                    deadline_candidates.append(cells[3].strip())
+                if len(cells) > 4:
+                    deadline_candidates.append(cells[4].strip())
+                deadline = extract_application_deadline(*deadline_candidates, role, company)
+
+                # Extract eligible years from description
+                eligible_years = self.detect_eligible_years(role, ' '.join(cells))
+
+                if debug:
+                    event_log.debug('github.row', table=row['table'], row=row['row'], cells=len(cells),
+                                    company=company, role=role, url=url, valid=bool(company and url))
+
+                if company and url:
+                    jobs.append(JobRecord(
+                        id=f"{repo_config['source']}-{stable_id(company, role, url)}",
+                        company_name=company,
+                        position_title=role,
+                        description=f'{role} at {company}',
+                        job_type=self.categorize_job_type(role),
+                        location=location,
+                        eligible_years=eligible_years,
+                        posted_date=datetime.now().isoformat(),
+                        application_deadline=deadline,
+                        application_url=url,
+                        is_active=True,
+                        source=repo_config['source']
+                    ))
+            except Exception as e:
+                event_log.warning('parse_error', sample=True, item='row', repo=repo_config['name'], error=str(e))
+                continue
+
+        return jobs
+
+    def scrape_repo(self, repo_config: Dict) -> List[JobRecord]:
         """Scrape a single GitHub repository"""
+        with tracing.span(repo_config['name'], 'repo'):
+            return self._scrape_repo(repo_config)
+
+    def _scrape_repo(self, repo_config: Dict) -> List[JobRecord]:
         try:
-            print(f"  Scraping {repo_config['name']}...")
-            page = Fetcher.get(repo_config['url'], timeout=30)
+            url = repo_config['url']
+            with self.upstream(url, f"GitHub {repo_config['name']}"):
+                page = self.request(url, lambda timeout: fetch_document(url, 'github', timeout=timeout))
 
-            jobs = []
             # Look for all tables in the README
-            tables = page.css('table')
-            print(f"    Found {len(tables)} tables")
-
-            for table_idx, table in enumerate(tables):
-                rows = table.css('tbody tr')[:100]  # Limit to first 100 rows per table
-                if table_idx == 0:
-                    print(f"    Table {table_idx}: {len(rows)} rows")
-
-                for row_idx, row in enumerate(rows):
-                    try:
-                        cells = row.css('td')
-                        if len(cells) < 2:
-                            continue
-
-                        if table_idx == 0 and row_idx < 2:
-                            print(f"      Row {row_idx}: {len(cells)} cells")
-
-                        # Different repos have different column orders
-                        # Common patterns: [Company, Role, Location, ...] or [Name, Location, Notes]
-                        company_elem = cells[0]
-                        role_elem = cells[1] if len(cells) > 1 else None
-                        location_elem = cells[2] if len(cells) > 2 else None
-
-                        company = company_elem.text.strip()
-                        role = role_elem.text.strip() if role_elem else 'Software Engineering Intern'
-                        location = location_elem.text.strip() if location_elem else 'Various'
-
-                        # Clean the role title to remove metadata
-                        role = clean_job_title(role)
-
-                        if table_idx == 0 and row_idx < 2:
-                            print(f"        Company: '{company}', Role: '{role}'")
-
-                        # Skip header rows or invalid entries
-                        if not company or company.lower() in ['company', 'name', '']:
-                            continue
-
-                        # Try to find apply link from company or role column
-                        link_elem = role_elem.css_first('a') if role_elem else company_elem.css_first('a')
-                        if not link_elem:
-                            # Try finding link in other cells
-                            for cell in cells:
-                                link_elem = cell.css_first('a')
-                                if link_elem:
-                                    break
-
-                        # Get href attribute safely
-                        url = ''
-                        if link_elem:
-                            try:
-                                url = link_elem.attrs.get('href', '')
-                            except (AttributeError, TypeError):
-                                try:
-                                    # Try alternative attribute access
-                                    url = str(link_elem.get('href', ''))
-                                except:
-                                    url = ''
-
-                        if table_idx == 0 and row_idx < 2:
-                            print(f"        URL: '{url}'")
-
-                        # Skip closed positions
-                        row_text = row.text.lower()
-                        if '🔒' in row.text or 'closed' in row_text or '❌' in row.text:
-                            if table_idx == 0 and row_idx < 2:
-                                print(f"        Skipped: closed position")
-                            continue
-
-                        # Check for deadline information
-                        deadline_candidates = []
-                        if len(cells) > 3:
-                            deadline_candidates.append(cells[3].text.strip())
-                        if len(cells) > 4:
-                            deadline_candidates.append(cells[4].text.strip())
-                        deadline = extract_application_deadline(*deadline_candidates, role, company)
-
-                        # Extract eligible years from description
-                        eligible_years = self.detect_eligible_years(role, ' '.join([c.text for c in cells]))
-
-                        if table_idx == 0 and row_idx < 2:
-                            print(f"        Valid: company={bool(company)}, url={bool(url)}")
-
-                        if company and url:
-                            jobs.append({
-                                'id': f"{repo_config['source']}-{hash(f'{company}-{role}-{url}')}",
-                                'company_name': company,
-                                'position_title': role,
-                                'description': f'{role} at {company}',
-                                'job_type': self.categorize_job_type(role),
-                                'location': location,
-                                'eligible_years': eligible_years,
-                                'posted_date': datetime.now().isoformat(),
-                                'application_deadline': deadline,
-                                'application_url': url,
-                                'is_active': True,
-                                'source': repo_config['source']
-                            })
-                    except Exception as e:
-                        print(f"    Error parsing row: {e}")
-                        continue
-
-            print(f"    Found {len(jobs)} internships from {repo_config['name']}")
+            with metrics.timed('scraper_parse_seconds'):
+                with tracing.span('parse'):
+                    rows = extract_table_rows(page, max_rows_per_table=self.MAX_ROWS_PER_TABLE)
+                with tracing.span('classify', rows=len(rows)):
+                    jobs = self.parse_rows(repo_config, rows)
+            event_log.info('repo.done', repo=repo_config['name'], rows=len(rows), jobs=len(jobs))
             return jobs
         except Exception as e:
-            print(f"    Error scraping {repo_config['name']}: {e}")
+            event_log.error('repo.failed', repo=repo_config['name'], error=str(e))
             return []
 
-    def scrape(self) -> List[Dict]:
+    def _scrape_repos_in_pool(self) -> List[JobRecord]:
+        """Fetch every README, then parse them all in the process pool"""
+        pages = []
+        for repo_config in self.GITHUB_REPOS:
+            if self.deadline.stop():
+                event_log.warning('repo.deadline', skipped_from=repo_config['name'])
+                break
+            try:
+                url = repo_config['url']
+                with tracing.span(repo_config['name'], 'repo'), \
+                        self.upstream(url, f"GitHub {repo_config['name']}"):
+                    text = self.request(url, lambda timeout: _get_text(url, timeout))
+                pages.append((repo_config, text, url))
+            except Exception as e:
+                event_log.error('repo.failed', repo=repo_config['name'], error=str(e))
+
+        all_jobs = []
+        with metrics.timed('scraper_parse_seconds'), tracing.span('parse_pool', pages=len(pages)):
+            parsed = self.parse_pool.parse_pages('github', pages, deadline=self.deadline)
+        for (repo_config, _, _), jobs in zip(pages, parsed):
+            event_log.info('repo.done', repo=repo_config['name'], jobs=len(jobs))
+            all_jobs.extend(jobs)
+
+        return all_jobs
+
+    def scrape(self) -> List[JobRecord]:
         """Scrape all GitHub repositories"""
         all_jobs = []
 
-        for repo_config in self.GITHUB_REPOS:
-            jobs = self.scrape_repo(repo_config)
-            all_jobs.extend(jobs)
+        if self.parse_pool:
+            all_jobs = self._scrape_repos_in_pool()
+        else:
+            for repo_config in self.GITHUB_REPOS:
+                if self.deadline.stop():
+                    event_log.warning('repo.deadline', skipped_from=repo_config['name'])
+                    break
+                jobs = self.scrape_repo(repo_config)
+                all_jobs.extend(jobs)
 
         # Deduplicate by URL
         seen_urls = set()
         unique_jobs = []
-        for job in all_jobs:
-            if job['application_url'] not in seen_urls:
-                seen_urls.add(job['application_url'])
-                unique_jobs.append(job)
+        with tracing.span('dedup', jobs=len(all_jobs)):
+            for job in all_jobs:
+                if job['application_url'] not in seen_urls:
+                    seen_urls.add(job['application_url'])
+                    unique_jobs.append(job)
 
-        print(f"Total unique GitHub internships: {len(unique_jobs)} (from {len(all_jobs)} total)")
+        event_log.info('github.dedup', jobs=len(unique_jobs), duplicates=len(all_jobs) - len(unique_jobs))
         return unique_jobs
 
 
 class SimplifyScraper(InternshipScraper):
     """Legacy scraper - now handled by GitHubInternshipScraper"""
 
-    def scrape(self) -> List[Dict]:
+    def scrape(self) -> List[JobRecord]:
         """Deprecated - use GitHubInternshipScraper instead"""
         scraper = GitHubInternshipScraper()
         return scraper.scrape()
 
 
+def _cached_serpapi_search(cache: Optional[SerpApiCache], params: Dict, search) -> tuple:
+    """Run a SerpApi search through the response cache when one is configured"""
+    if cache is None:
+        return search(), False
+    result, from_cache = cache.fetch(params, search)
+    metrics.count_cache('serpapi', from_cache)
+    return result, from_cache
+
+
 class GoogleJobsScraper(InternshipScraper):
     """Scrape Google Jobs search results via SerpApi with conservative quota management"""
 
     API_ENDPOINT = "https://serpapi.com/search.json"
+    SOURCE = "Google Jobs (SerpApi)"
 
     # Conservative search queries to stay within 250/month limit (~8 searches/day)
     # Spread across different internship types for better coverage
@@ -928,17 +1129,28 @@ class GoogleJobsScraper(InternshipScraper):
     ]
 
     DEFAULT_MAX_QUERIES_PER_RUN = 6
+    DEFAULT_MAX_CONCURRENCY = 4
     DEFAULT_DATE_POSTED_WINDOW = "week"
 
-    def __init__(self):
+    def __init__(
+        self,
+        query_budget: Optional[QueryBudget] = None,
+        response_cache: Optional[SerpApiCache] = None
+    ):
+        """
+        Initialize Google Jobs scraper
+
+        Args:
+            query_budget: Quota allocator choosing the queries to run
+                (defaults to one configured from the environment)
+            response_cache: SerpApi response cache (defaults to the shared one)
+        """
         super().__init__()
         self.api_key = os.environ.get("SERPAPI_API_KEY") or os.environ.get("SERPAPI_KEY")
-        try:
-            self.max_queries_per_run = max(
-                1, int(os.environ.get("SERPAPI_MAX_QUERIES", str(self.DEFAULT_MAX_QUERIES_PER_RUN)))
-            )
-        except ValueError:
-            self.max_queries_per_run = self.DEFAULT_MAX_QUERIES_PER_RUN
+        self.query_budget = query_budget or QueryBudget.from_env()
+        self.response_cache = response_cache or get_serpapi_cache()
+        self.max_queries_per_run = max(1, env_int("SERPAPI_MAX_QUERIES", self.DEFAULT_MAX_QUERIES_PER_RUN))
+        self.max_concurrency = max(1, env_int("SERPAPI_CONCURRENCY", self.DEFAULT_MAX_CONCURRENCY))
         self.date_posted_window = os.environ.get("SERPAPI_DATE_POSTED", self.DEFAULT_DATE_POSTED_WINDOW) or self.DEFAULT_DATE_POSTED_WINDOW
 
     def _extract_company_from_extensions(self, extensions: list) -> str:
@@ -990,10 +1202,11 @@ class GoogleJobsScraper(InternshipScraper):
 
     def _build_query_rotation(self, override_query: Optional[str]) -> list[str]:
         """
-        Build a deduplicated list of queries, rotating daily to spread SerpApi usage.
+        Build a deduplicated list of queries, chosen by the query budget to
+        spend the monthly SerpApi quota on queries that find new jobs.
 
         Args:
-            override_query: direct query from caller (skips rotation when provided)
+            override_query: direct query from caller (skips the budget's choice when provided)
         """
         if override_query:
             return [override_query.strip()]
@@ -1017,19 +1230,158 @@ class GoogleJobsScraper(InternshipScraper):
         if not deduped:
             return []
 
-        max_queries = self.max_queries_per_run
-        if len(deduped) <= max_queries:
-            return deduped
+        return self.query_budget.select(deduped, self.max_queries_per_run)
+
+    def _parse_result(self, job: dict, seen_urls: set, seen_lock: threading.Lock, returned_urls: list) -> Optional[JobRecord]:
+        """Turn one Google Jobs result into a JobRecord (None if filtered or already seen this run)"""
+        title = job.get("title", "").strip()
+        description = job.get("description", "").strip()
+
+        # Clean the title
+        title = clean_job_title(title)
+
+        # Only process if it's an internship
+        if not self.is_internship(title, description):
+            return None
+
+        # Extract company name
+        company = job.get("company_name") or self._extract_company_from_extensions(
+            job.get("extensions", [])
+        )
+
+        # Build application URL
+        application_url = self._build_job_url(job)
+        if not application_url:
+            return None
+        returned_urls.append(application_url)
+
+        # Other queries' results stream in concurrently
+        with seen_lock:
+            if application_url in seen_urls:
+                return None
+            seen_urls.add(application_url)
+
+        # Emitted by an earlier run: skip deadline extraction and classification
+        if self.already_seen(application_url):
+            return None
+
+        # Extract location
+        location = job.get("location", "Various")
+
+        # Extract deadline from extensions or description
+        extensions = job.get("extensions", [])
+        detected_extensions = job.get("detected_extensions", {})
+        deadline = extract_application_deadline(
+            description,
+            *extensions,
+            str(detected_extensions.get("posted_at")),
+            str(detected_extensions.get("schedule_type")),
+        )
+
+        # Detect eligible years
+        eligible_years = self.detect_eligible_years(title, description)
+
+        # Create unique ID
+        job_id = job.get("job_id") or stable_id(company, title, application_url)
+
+        return JobRecord(
+            id=f"google-jobs-{job_id}",
+            company_name=company,
+            position_title=title,
+            description=description[:500] if description else f"Internship at {company}",
+            job_type=self.categorize_job_type(title, description),
+            location=location,
+            eligible_years=eligible_years,
+            posted_date=self._normalize_posted_date(job),
+            application_deadline=deadline,
+            application_url=application_url,
+            is_active=True,
+            source=self.SOURCE,
+        )
+
+    def _traced_query(self, search_query: str, *args) -> tuple:
+        with tracing.span(search_query, 'query'):
+            return self._run_query(search_query, *args)
+
+    def _run_query(
+        self,
+        search_query: str,
+        num_results: int,
+        run_quota: RunQuota,
+        seen_urls: set,
+        seen_lock: threading.Lock
+    ) -> tuple:
+        """
+        Search one query (runs in a worker thread)
+
+        Returns:
+            (jobs, returned_urls, billed) where billed says whether a real,
+            quota-consuming search was made
+        """
+        jobs = []
+        returned_urls = []
+        admitted = False
+
+        params = {
+            "api_key": self.api_key,
+            "engine": "google_jobs",
+            "q": search_query,
+            "hl": "en",
+            "gl": "us",
+            "num": num_results,
+            "date_posted": self.date_posted_window,
+            "job_employment_type": "internship",
+        }
 
-        # Rotate based on day-of-year so each run covers a different window
-        day_index = datetime.utcnow().timetuple().tm_yday % len(deduped)
-        rotated = deduped[day_index:] + deduped[:day_index]
-        return rotated[:max_queries]
+        def search() -> dict:
+            nonlocal admitted
+            # Checked before the quota, so an open breaker never spends a search
+            with self.upstream(self.API_ENDPOINT, 'SerpApi', ignore=(QuotaExceeded,)):
+                if not run_quota.try_acquire():
+                    raise QuotaExceeded(search_query)
+                admitted = True
+                with metrics.fetching():
+                    return GoogleSearch(params).get_dict()
 
-    def scrape(self, query: str = None, num_results: int = 10) -> list[dict]:
+        try:
+            results, from_cache = _cached_serpapi_search(self.response_cache, params, search)
+        except QuotaExceeded:
+            event_log.warning('query.skipped', query=search_query, reason='quota reached')
+            return jobs, returned_urls, False
+        except CircuitOpen:
+            event_log.info('query.skipped', query=search_query, reason='circuit open')
+            return jobs, returned_urls, False
+        except Exception as e:
+            event_log.error('query.failed', query=search_query, error=str(e))
+            return jobs, returned_urls, admitted
+
+        if "error" in results:
+            event_log.error('query.failed', query=search_query, error=str(results['error']))
+            return jobs, returned_urls, admitted
+
+        jobs_results = results.get("jobs_results", [])
+        event_log.info('query.done', query=search_query, results=len(jobs_results), cached=from_cache)
+
+        with metrics.timed('scraper_parse_seconds'), tracing.span('classify', rows=len(jobs_results)):
+            for job in jobs_results:
+                try:
+                    record = self._parse_result(job, seen_urls, seen_lock, returned_urls)
+                    if record is not None:
+                        jobs.append(record)
+                except Exception as e:
+                    event_log.warning('parse_error', sample=True, item='result', query=search_query, error=str(e))
+                    metrics.inc('scraper_errors_total', stage='parse')
+                    continue
+
+        return jobs, returned_urls, admitted
+
+    def scrape(self, query: str = None, num_results: int = 10) -> list[JobRecord]:
         """
         Scrape Google Jobs for internships
 
+        Queries run concurrently (SERPAPI_CONCURRENCY at a time); every real
+        search must be admitted against the per-run and shared monthly quota.
+
         Args:
             query: Custom search query (optional, uses predefined if None)
             num_results: Number of results to fetch per query (default: 10)
@@ -1038,110 +1390,51 @@ class GoogleJobsScraper(InternshipScraper):
             List of internship dictionaries
         """
         if not self.api_key:
-            print("SerpApi key not configured, skipping Google Jobs scraper")
+            event_log.warning('source.skipped', scraper='GoogleJobsScraper', reason='SERPAPI_API_KEY not set')
             return []
 
         queries_to_run = self._build_query_rotation(query)
         if not queries_to_run:
-            print("No SerpApi queries to execute")
+            event_log.info('source.skipped', scraper='GoogleJobsScraper', reason='no queries or budget spent')
             return []
 
         all_jobs = []
         seen_urls = set()
-
-        for search_query in queries_to_run:
-            try:
-                print(f"  Searching Google Jobs: '{search_query}'")
-
-                params = {
-                    "api_key": self.api_key,
-                    "engine": "google_jobs",
-                    "q": search_query,
-                    "hl": "en",
-                    "gl": "us",
-                    "num": num_results,
-                    "date_posted": self.date_posted_window,
-                    "job_employment_type": "internship",
-                }
-
-                search = GoogleSearch(params)
-                results = search.get_dict()
-
-                if "error" in results:
-                    print(f"    SerpApi error: {results['error']}")
-                    continue
-
-                jobs_results = results.get("jobs_results", [])
-                print(f"    Found {len(jobs_results)} jobs from Google")
-
-                for job in jobs_results:
-                    try:
-                        title = job.get("title", "").strip()
-                        description = job.get("description", "").strip()
-
-                        # Clean the title
-                        title = clean_job_title(title)
-
-                        # Only process if it's an internship
-                        if not self.is_internship(title, description):
-                            continue
-
-                        # Extract company name
-                        company = job.get("company_name") or self._extract_company_from_extensions(
-                            job.get("extensions", [])
-                        )
-
-                        # Build application URL
-                        application_url = self._build_job_url(job)
-                        if not application_url:
-                            continue
-                        if application_url in seen_urls:
-                            continue
-                        seen_urls.add(application_url)
-
-                        # Extract location
-                        location = job.get("location", "Various")
-
-                        # Extract deadline from extensions or description
-                        extensions = job.get("extensions", [])
-                        detected_extensions = job.get("detected_extensions", {})
-                        deadline = extract_application_deadline(
-                            description,
-                            *extensions,
-                            str(detected_extensions.get("posted_at")),
-                            str(detected_extensions.get("schedule_type")),
-                        )
-
-                        # Detect eligible years
-                        eligible_years = self.detect_eligible_years(title, description)
-
-                        # Create unique ID
-                        job_id = job.get("job_id") or hash(f"{company}-{title}-{application_url}")
-
-                        all_jobs.append({
-                            "id": f"google-jobs-{job_id}",
-                            "company_name": company,
-                            "position_title": title,
-                            "description": description[:500] if description else f"Internship at {company}",
-                            "job_type": self.categorize_job_type(title, description),
-                            "location": location,
-                            "eligible_years": eligible_years,
-                            "posted_date": self._normalize_posted_date(job),
-                            "application_deadline": deadline,
-                            "application_url": application_url,
-                            "is_active": True,
-                            "source": "Google Jobs (SerpApi)",
-                        })
-
-                    except Exception as e:
-                        print(f"    Error parsing Google job: {e}")
-                        continue
-
-            except Exception as e:
-                print(f"    Error searching Google Jobs for '{search_query}': {e}")
-                continue
-
-        print(f"  Total internships from Google Jobs: {len(all_jobs)}")
+        seen_lock = threading.Lock()
+        run_quota = self.query_budget.admission.open_run(len(queries_to_run))
+
+        event_log.info('queries.start', queries=len(queries_to_run), concurrency=self.max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(queries_to_run)))
+        futures = {
+            # Each query thread keeps the caller's context (metrics source label)
+            executor.submit(
+                contextvars.copy_context().run,
+                self._traced_query, search_query, num_results, run_quota, seen_urls, seen_lock
+            ): search_query
+            for search_query in queries_to_run
+        }
+        remaining = self.deadline.remaining()
+        try:
+            for future in as_completed(futures, timeout=remaining if remaining != float('inf') else None):
+                search_query = futures[future]
+                jobs, returned_urls, billed = future.result()
+                all_jobs.extend(jobs)
+                if billed:
+                    new_jobs = self.query_budget.record(search_query, returned_urls, learn=not query)
+                    event_log.info('query.yield', query=search_query, new_jobs=new_jobs)
+        except FutureTimeout:
+            # Queries still queued never start; in-flight ones finish in the background (and fill the cache)
+            self.deadline.truncated = True
+            unfinished = sum(1 for future in futures if not future.done())
+            event_log.warning('queries.deadline', dropped=unfinished)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.query_budget.save()
+        if self.response_cache:
+            cache_stats = self.response_cache.stats()
+            event_log.info('serpapi_cache.stats', hits=cache_stats['hits'], misses=cache_stats['misses'])
+        event_log.info('queries.done', jobs=len(all_jobs), billed_searches=run_quota.used)
         return all_jobs
 
 
@@ -1150,9 +1443,10 @@ class SerpApiLinkedInScraper(InternshipScraper):
 
     API_ENDPOINT = "https://serpapi.com/search.json"
 
-    def __init__(self):
+    def __init__(self, response_cache: Optional[SerpApiCache] = None):
         super().__init__()
         self.api_key = os.environ.get("SERPAPI_API_KEY") or os.environ.get("SERPAPI_KEY")
+        self.response_cache = response_cache or get_serpapi_cache()
 
     def _build_application_url(self, job: Dict) -> str:
         if link := job.get("link"):
@@ -1169,10 +1463,10 @@ class SerpApiLinkedInScraper(InternshipScraper):
             return f"{parsed}T00:00:00Z"
         return datetime.utcnow().isoformat()
 
-    def scrape(self, keywords: str = "software engineering intern") -> List[Dict]:
+    def scrape(self, keywords: str = "software engineering intern") -> List[JobRecord]:
         """Invoke SerpApi LinkedIn engine to gather internships"""
         if not self.api_key:
-            print("SerpApi key not configured, skipping LinkedIn scraper")
+            event_log.warning('source.skipped', scraper='SerpApiLinkedInScraper', reason='SERPAPI_API_KEY not set')
             return []
 
         params = {
@@ -1182,21 +1476,36 @@ class SerpApiLinkedInScraper(InternshipScraper):
             "remote": "false",
         }
 
+        def search() -> Dict:
+            with self.upstream(self.API_ENDPOINT, 'SerpApi'), metrics.fetching() as fetch:
+                response = requests.get(self.API_ENDPOINT, params=params, timeout=self.deadline.timeout(30))
+                response.raise_for_status()
+                fetch['bytes'] = len(response.content)
+                return response.json()
+
         try:
-            response = requests.get(self.API_ENDPOINT, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data, from_cache = _cached_serpapi_search(self.response_cache, params, search)
+            if from_cache:
+                event_log.info('query.done', query=keywords, cached=True)
+        except CircuitOpen:
+            event_log.info('source.skipped', scraper='SerpApiLinkedInScraper', reason='circuit open')
+            return []
         except requests.RequestException as exc:
-            print(f"Error contacting SerpApi: {exc}")
+            event_log.error('query.failed', query=keywords, error=str(exc))
             return []
         except ValueError:
-            print("Unable to decode SerpApi response as JSON")
+            event_log.error('query.failed', query=keywords, error='response is not JSON')
             return []
 
         results = data.get("jobs_results") or []
-        jobs = []
+        with metrics.timed('scraper_parse_seconds'), tracing.span('classify', rows=len(results)):
+            return self._parse_results(results)
 
+    def _parse_results(self, results: List[Dict]) -> List[JobRecord]:
+        jobs = []
         for job in results:
+            if self.deadline.stop():
+                break
             title = job.get("title", "Internship").strip()
             company = job.get("company_name") or job.get("company") or "Unknown Company"
             description = job.get("description") or job.get("snippet") or ""
@@ -1218,27 +1527,114 @@ class SerpApiLinkedInScraper(InternshipScraper):
                 *(job.get("detected_extensions") or {}).values(),
             )
 
-            job_id = job.get("job_id") or hash(f"{company}-{title}-{application_url}")
-
-            jobs.append({
-                "id": f"linkedin-serpapi-{job_id}",
-                "company_name": company,
-                "position_title": title,
-                "description": description if description else f"Internship opportunity at {company}",
-                "job_type": self.categorize_job_type(title, description),
-                "location": job.get("location") or job.get("city") or "Various",
-                "eligible_years": self.detect_eligible_years(title, description),
-                "posted_date": self._normalize_posted_date(job),
-                "application_deadline": deadline,
-                "application_url": application_url,
-                "is_active": True,
-                "source": "LinkedIn (SerpApi)",
-            })
-
+            job_id = job.get("job_id") or stable_id(company, title, application_url)
+
+            jobs.append(JobRecord(
+                id=f"linkedin-serpapi-{job_id}",
+                company_name=company,
+                position_title=title,
+                description=description if description else f"Internship opportunity at {company}",
+                job_type=self.categorize_job_type(title, description),
+                location=job.get("location") or job.get("city") or "Various",
+                eligible_years=self.detect_eligible_years(title, description),
+                posted_date=self._normalize_posted_date(job),
+                application_deadline=deadline,
+                application_url=application_url,
+                is_active=True,
+                source="LinkedIn (SerpApi)",
+            ))
         return jobs
 
 
-def scrape_all_sources(keywords: str = "software engineering intern", use_google_jobs: bool = True) -> List[Dict]:
+# Sources whose scrapers skip postings the seen filter already holds
+SEEN_FILTERED_SOURCES = frozenset(
+    [repo['source'] for repo in GitHubInternshipScraper.GITHUB_REPOS] + [GoogleJobsScraper.SOURCE]
+)
+
+
+def remember_emitted(jobs: Iterable[JobRecord]):
+    """
+    Add stored jobs of seen-filtered sources to the seen filter
+
+    Called once a scrape result is persisted, not while parsing, so the jobs
+    of a scrape that fails or is cancelled are emitted again by the next run
+    instead of being suppressed for the filter's max age.
+    """
+    seen_filter = get_seen_filter()
+    if seen_filter is None:
+        return
+    seen_filter.add_all(job.application_url for job in jobs if job.source in SEEN_FILTERED_SOURCES)
+
+
+def commit_board_watermarks(watermarks: PendingWatermarks):
+    """
+    Save the board watermarks a scrape advanced
+
+    Called once the scrape result is persisted, like remember_emitted, so
+    delta postings of a run whose result is lost are fetched again.
+    """
+    try:
+        watermarks.commit()
+    except OSError as e:
+        event_log.error('watermarks.save_failed', error=str(e))
+
+
+# Polling state must outlive a single scrape for adaptive scheduling to work
+_shared_polling_manager = SmartPollingManager()
+
+DEFAULT_KEYWORDS = "software engineering intern"
+
+# progress(source, status, jobs=None, error=None); see scrape_all_sources
+ProgressCallback = Callable[..., None]
+
+
+def _observe_in_ledger(ledger: Optional[JobLedger], jobs: List[JobRecord], complete: bool):
+    """Record a scraper's jobs in the ledger, one observation per source"""
+    if ledger is None:
+        return
+
+    by_source: Dict[str, List[JobRecord]] = {}
+    for job in jobs:
+        by_source.setdefault(job['source'], []).append(job)
+
+    # A source that returned nothing most likely failed; never count that as removals
+    for source, source_jobs in by_source.items():
+        with tracing.span('dedup', jobs=len(source_jobs)):
+            update = ledger.observe(source, source_jobs, complete=complete)
+        if update.new_ids or update.tombstones:
+            event_log.info('ledger.update', scope=source, new=len(update.new_ids), removed=len(update.tombstones))
+
+
+def _board_ledger_observer(ledger: Optional[JobLedger], kind: str):
+    """on_board callback recording each board as its own ledger scope"""
+    if ledger is None:
+        return None
+
+    def observe(board: str, jobs: List[JobRecord], complete: bool):
+        with tracing.span('dedup', jobs=len(jobs)):
+            update = ledger.observe(kind, jobs, complete=complete, scope=f"{kind}/{board}")
+        if update.new_ids or update.tombstones:
+            event_log.info('ledger.update', scope=f"{kind}/{board}", new=len(update.new_ids),
+                           removed=len(update.tombstones))
+
+    return observe
+
+
+def _report(progress: Optional[ProgressCallback], source: str, status: str, jobs=None, error=None,
+            truncated: bool = False):
+    if progress is not None:
+        progress(source, status, jobs=jobs, error=error, truncated=truncated)
+
+
+def scrape_all_sources(
+    keywords: str = DEFAULT_KEYWORDS,
+    use_google_jobs: bool = True,
+    polling_manager: Optional[SmartPollingManager] = None,
+    ledger: Optional[JobLedger] = None,
+    progress: Optional[ProgressCallback] = None,
+    deadline: Optional[Deadline] = None,
+    watermarks: Optional[PendingWatermarks] = None
+) -> List[JobRecord]:
     """
     Scrape all sources with smart polling and delta detection
 
@@ -1251,20 +1647,41 @@ def scrape_all_sources(keywords: str = "software engineering intern", use_google
     Args:
         keywords: Search keywords
         use_google_jobs: Whether to use Google Jobs (SerpAPI quota)
+        polling_manager: Polling manager to use (defaults to the process-wide one)
+        ledger: First/last-seen ledger (defaults to the process-wide one); fills
+            posted_date and records removals
+        progress: Called as progress(source, status, jobs=..., error=..., truncated=...)
+            when a source starts ('running') and ends ('succeeded' with its jobs,
+            'failed', or 'skipped' once the deadline has passed); truncated marks
+            partial results of a source that ran out of budget. Exceptions it
+            raises abort the scrape (cancellation)
+        deadline: Budget for the whole scrape (defaults to SCRAPE_SLO_SECONDS);
+            each source also gets its own budget inside it
+        watermarks: Board watermark advances of this scrape, for the caller
+            to commit once the result is stored. Without one, advances of
+            the process-wide store are committed when the scrape ends
 
     Returns:
         List of all scraped internships
     """
     all_jobs = []
+    if deadline is None:
+        deadline = Deadline(scrape_slo_seconds() or None)
+
+    # Smart polling manager (shared across scrapers and runs)
+    polling_manager = polling_manager or _shared_polling_manager
+    ledger = ledger or get_job_ledger()
 
-    # Initialize smart polling manager (shared across scrapers)
-    polling_manager = SmartPollingManager()
+    # CPU-bound HTML parsing runs in worker processes when available
+    parse_pool = get_parse_pool()
+    # Retries with backoff (and optional hedging) for board and README fetches
+    request_policy = get_request_policy()
 
     # Basic scrapers with smart polling
     scrapers = [
         # IndeedScraper(),
-        LevelsFyiScraper(polling_manager),  # Uses conditional requests + content hash
-        GitHubInternshipScraper(),  # GitHub provides webhooks (poll fallback)
+        LevelsFyiScraper(polling_manager, parse_pool),  # Uses conditional requests + content hash
+        GitHubInternshipScraper(parse_pool),  # GitHub provides webhooks (poll fallback)
         SerpApiLinkedInScraper(),  # API-based, no polling needed
         # LinkedInScraper(),  # Might require auth
     ]
@@ -1273,56 +1690,90 @@ def scrape_all_sources(keywords: str = "software engineering intern", use_google
     if use_google_jobs:
         scrapers.append(GoogleJobsScraper())
 
-    # Delta-friendly API scrapers (Greenhouse, Lever)
-    print("\n🔄 Delta-friendly scrapers (updated_at timestamps):")
+    # Each board is fetched after its own watermark, with a periodic full
+    # reconcile; without watermarks, fall back to a fixed 7-day window
+    commit_watermarks = False
+    if watermarks is None:
+        watermark_store = get_watermark_store()
+        if watermark_store is not None:
+            watermarks, commit_watermarks = watermark_store.pending(), True
+    since = None if watermarks is not None else datetime.utcnow() - timedelta(days=7)
+
+    def run_boards(board_scraper, kind: str, budget: Deadline) -> List[JobRecord]:
+        return board_scraper.scrape_all_boards(
+            since=since, watermarks=watermarks, on_board=_board_ledger_observer(ledger, kind),
+            deadline=budget, breakers=polling_manager, policy=request_policy
+        )
 
-    # Greenhouse scraper - only fetch jobs updated in last 7 days
-    try:
-        print("Scraping Greenhouse boards...")
-        gh_scraper = GreenhouseScraper(GREENHOUSE_COMPANIES)
-        since = datetime.utcnow() - timedelta(days=7)
-        gh_jobs = gh_scraper.scrape_all_boards(since=since)
-        all_jobs.extend(gh_jobs)
-        print(f"Found {len(gh_jobs)} Greenhouse internships (delta: last 7 days)")
-    except Exception as e:
-        print(f"Error with Greenhouse scraper: {e}")
-
-    # Lever scraper - only fetch jobs updated in last 7 days
-    try:
-        print("Scraping Lever boards...")
-        lever_scraper = LeverScraper(LEVER_COMPANIES)
-        since = datetime.utcnow() - timedelta(days=7)
-        lever_jobs = lever_scraper.scrape_all_boards(since=since)
-        all_jobs.extend(lever_jobs)
-        print(f"Found {len(lever_jobs)} Lever internships (delta: last 7 days)")
-    except Exception as e:
-        print(f"Error with Lever scraper: {e}")
-
-    print("\n📡 Standard scrapers (with smart polling):")
-
-    # Run standard scrapers
-    for scraper in scrapers:
+    def run_standard(scraper: InternshipScraper, budget: Deadline) -> List[JobRecord]:
+        scraper.deadline = budget
+        if scraper.polling_manager is None:
+            scraper.polling_manager = polling_manager
+        scraper.request_policy = request_policy
+        if isinstance(scraper, GoogleJobsScraper) and keywords == DEFAULT_KEYWORDS:
+            # Default keywords: let the query budget pick the searches
+            jobs = scraper.scrape()
+        elif hasattr(scraper.scrape, '__code__') and scraper.scrape.__code__.co_argcount > 1:
+            jobs = scraper.scrape(keywords)
+        else:
+            jobs = scraper.scrape()
+        # Seen-filtered or truncated results leave out jobs, so they are never complete
+        complete = scraper.COMPLETE_LISTING and scraper.seen_filter is None and not budget.truncated
+        _observe_in_ledger(ledger, jobs, complete=complete)
+        return jobs
+
+    # Delta-friendly API scrapers (Greenhouse, Lever) first, then the standard ones
+    sources = [
+        ('GreenhouseScraper', lambda budget: run_boards(GreenhouseScraper(GREENHOUSE_COMPANIES), 'greenhouse', budget)),
+        ('LeverScraper', lambda budget: run_boards(LeverScraper(LEVER_COMPANIES), 'lever', budget)),
+    ]
+    sources.extend(
+        (scraper.__class__.__name__, lambda budget, scraper=scraper: run_standard(scraper, budget))
+        for scraper in scrapers
+    )
+
+    event_log.info('scrape.start', keywords=keywords, scrapers=len(sources))
+
+    for name, run in sources:
+        if deadline.stop():
+            event_log.warning('scrape.deadline', skipped=name)
+            metrics.inc('scraper_truncated_total', source=name)
+            _report(progress, name, 'skipped', truncated=True)
+            continue
+        budget = deadline.child(source_budget_seconds(name))
+        # Outside the try: a progress callback may raise to cancel the scrape
+        _report(progress, name, 'running')
+        started = time.perf_counter()
         try:
-            print(f"Scraping {scraper.__class__.__name__}...")
-            if hasattr(scraper.scrape, '__code__') and scraper.scrape.__code__.co_argcount > 1:
-                jobs = scraper.scrape(keywords)
-            else:
-                jobs = scraper.scrape()
-            all_jobs.extend(jobs)
-            print(f"Found {len(jobs)} internships from {scraper.__class__.__name__}")
+            event_log.info('source.start', scraper=name)
+            with metrics.scraping(name), tracing.span(name, 'source'):
+                jobs = run(budget)
         except Exception as e:
-            print(f"Error with {scraper.__class__.__name__}: {e}")
+            event_log.error('source.failed', scraper=name, error=str(e))
+            metrics.inc('scraper_errors_total', source=name, stage='source')
+            _report(progress, name, 'failed', error=str(e), truncated=budget.truncated)
             continue
+        finally:
+            metrics.observe('scraper_source_seconds', time.perf_counter() - started, source=name)
+            if budget.truncated:
+                metrics.inc('scraper_truncated_total', source=name)
+        metrics.inc('scraper_jobs_emitted_total', len(jobs), source=name)
+        all_jobs.extend(jobs)
+        event_log.info('source.done', scraper=name, jobs=len(jobs), truncated=budget.truncated)
+        _report(progress, name, 'succeeded', jobs=jobs, truncated=budget.truncated)
 
-    # Print polling statistics
-    print("\n📊 Polling statistics:")
     if hasattr(LevelsFyiScraper, 'source_url'):
         levels_stats = polling_manager.get_polling_stats(
             "https://www.levels.fyi/internships/",
             "Levels.fyi"
         )
-        print(f"  Levels.fyi: {levels_stats['total_polls']} polls, "
-              f"{levels_stats['total_changes']} changes, "
-              f"interval: {levels_stats['current_poll_interval_minutes']}min")
+        event_log.info('polling.stats', scraper='LevelsFyiScraper', polls=levels_stats['total_polls'],
+                       changes=levels_stats['total_changes'],
+                       interval_minutes=levels_stats['current_poll_interval_minutes'])
+
+    event_log.info('requests.stats', **request_policy.stats())
+    if commit_watermarks:
+        commit_board_watermarks(watermarks)
+    event_log.flush()
 
     return all_jobs
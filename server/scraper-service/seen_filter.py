@@ -0,0 +1,308 @@
+"""
+Persistent seen-job filter (memory-mapped Bloom filters)
+
+Scrapers use it to skip postings they already emitted in an earlier run
+before doing the expensive work (title cleanup, deadline extraction,
+classification). Membership is probabilistic: a "seen" answer is wrong at
+most at the configured false-positive rate, "not seen" is always right
+(modulo concurrent writers racing on the same byte, which can only cause a
+job to be processed again).
+
+Two generations are kept on disk. New keys go into the current one; a key
+counts as seen if either generation has it, and a key found only in the
+previous generation is copied into the current one. When the current
+generation is older than half the max age (or full), it becomes the
+previous one and a fresh filter replaces it: a job still listed keeps being
+looked up and stays seen across rotations, while one not looked up for max
+age is forgotten and re-emitted.
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: rotation is only serialized within the process
+    fcntl = None
+
+from config import env_float, env_int
+from state_store import state_path
+
+MAGIC = b'BLM1'
+# magic, bit count, hash count, capacity, items added, created at (unix time)
+HEADER = struct.Struct('<4sQIQQd')
+HEADER_SIZE = 64
+
+DEFAULT_CAPACITY = 200000
+DEFAULT_FP_RATE = 0.001
+DEFAULT_MAX_AGE_DAYS = 14.0
+
+
+def bloom_parameters(capacity: int, fp_rate: float):
+    """Optimal (bit count, hash count) for a capacity and false-positive rate"""
+    bits = max(64, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+    hashes = max(1, int(round(bits / capacity * math.log(2))))
+    return bits, hashes
+
+
+class BloomFilter:
+    """Bloom filter stored in a memory-mapped file"""
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY, fp_rate: float = DEFAULT_FP_RATE):
+        """
+        Open (or create) a filter file
+
+        Args:
+            path: Filter file
+            capacity: Items the filter is sized for (used when creating)
+            fp_rate: Target false-positive rate at capacity (used when creating)
+        """
+        self.path = path
+        if not os.path.exists(path):
+            self._create(path, capacity, fp_rate)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.bits, self.hashes, self.capacity, _, self.created_at = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        self.inode = os.fstat(self._file.fileno()).st_ino
+
+    @staticmethod
+    def _create(path: str, capacity: int, fp_rate: float):
+        bits, hashes = bloom_parameters(capacity, fp_rate)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            header = HEADER.pack(MAGIC, bits, hashes, capacity, 0, time.time())
+            f.write(header.ljust(HEADER_SIZE, b'\0'))
+            f.truncate(HEADER_SIZE + (bits + 7) // 8)
+        os.replace(tmp_path, path)
+
+    @property
+    def count(self) -> int:
+        """Items added (approximate under concurrent writers)"""
+        return HEADER.unpack_from(self._map, 0)[4]
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        h2 |= 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        data = self._map
+        return all(data[HEADER_SIZE + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key
+
+        Returns:
+            True if the key was (probably) already present
+        """
+        data = self._map
+        present = True
+        for pos in self._positions(key):
+            offset = HEADER_SIZE + (pos >> 3)
+            mask = 1 << (pos & 7)
+            byte = data[offset]
+            if not byte & mask:
+                present = False
+                data[offset] = byte | mask
+
+        if not present:
+            fields = list(HEADER.unpack_from(data, 0))
+            fields[4] += 1
+            HEADER.pack_into(data, 0, *fields)
+        return present
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        try:
+            self._map.close()
+        except (AttributeError, ValueError):
+            pass
+        self._file.close()
+
+
+class SeenFilter:
+    """Two-generation persistent seen set with age-based rotation"""
+
+    # How often to check whether another process rotated the files
+    RELOAD_CHECK_SECONDS = 30
+
+    def __init__(
+        self,
+        directory: str,
+        name: str = 'seen',
+        capacity: int = DEFAULT_CAPACITY,
+        fp_rate: float = DEFAULT_FP_RATE,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS
+    ):
+        """
+        Initialize seen filter
+
+        Args:
+            directory: Directory holding the generation files
+            name: File name prefix
+            capacity: Keys per generation before it rotates early
+            fp_rate: False-positive rate of each generation at capacity
+            max_age_days: Keys not seen again for this long are forgotten
+        """
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.generation_seconds = max_age_days * 86400 / 2
+        self.current_path = os.path.join(directory, f'{name}-current.bloom')
+        self.previous_path = os.path.join(directory, f'{name}-previous.bloom')
+        self.lock_path = os.path.join(directory, f'{name}.lock')
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._current: Optional[BloomFilter] = None
+        self._previous: Optional[BloomFilter] = None
+        with self._lock:
+            self._open()
+
+    def seen(self, key: str) -> bool:
+        """
+        Whether a key was (probably) added or seen within the max age
+
+        A key only the previous generation holds is added to the current one,
+        so it survives the next rotation. This only refreshes keys that were
+        already emitted; new keys are still added by add()/add_all().
+        """
+        if not key:
+            return False
+        with self._lock:
+            self._maybe_rotate()
+            if key in self._current:
+                return True
+            if self._previous is not None and key in self._previous:
+                self._current.add(key)
+                return True
+            return False
+
+    def add(self, key: str):
+        """Mark a key as seen"""
+        if not key:
+            return
+        with self._lock:
+            self._maybe_rotate()
+            self._current.add(key)
+
+    def add_all(self, keys: Iterable[str]):
+        """Mark several keys as seen and write them out"""
+        with self._lock:
+            self._maybe_rotate()
+            for key in keys:
+                if key:
+                    self._current.add(key)
+            self._current.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'current_items': self._current.count,
+                'previous_items': self._previous.count if self._previous else 0,
+                'capacity': self.capacity,
+                'fp_rate': self.fp_rate,
+                'current_age_hours': round((time.time() - self._current.created_at) / 3600, 1),
+            }
+
+    def flush(self):
+        with self._lock:
+            self._current.flush()
+
+    def _open(self):
+        for bloom in (self._current, self._previous):
+            if bloom is not None:
+                bloom.close()
+        self._current = BloomFilter(self.current_path, self.capacity, self.fp_rate)
+        self._previous = (
+            BloomFilter(self.previous_path, self.capacity, self.fp_rate)
+            if os.path.exists(self.previous_path) else None
+        )
+        self._checked_at = time.monotonic()
+
+    def _maybe_rotate(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.RELOAD_CHECK_SECONDS and not self._needs_rotation():
+            return
+        self._checked_at = now
+
+        # Another process may have rotated already
+        try:
+            if os.stat(self.current_path).st_ino != self._current.inode:
+                self._open()
+        except FileNotFoundError:
+            self._open()
+
+        if not self._needs_rotation():
+            return
+
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Re-check under the lock: someone else may have just rotated
+                if os.stat(self.current_path).st_ino != self._current.inode:
+                    self._open()
+                if self._needs_rotation():
+                    self._current.flush()
+                    os.replace(self.current_path, self.previous_path)
+                    self._open()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _needs_rotation(self) -> bool:
+        current = self._current
+        return (
+            time.time() - current.created_at >= self.generation_seconds or
+            current.count >= current.capacity
+        )
+
+
+_shared_filter: Optional[SeenFilter] = None
+_shared_filter_lock = threading.Lock()
+
+
+def get_seen_filter() -> Optional[SeenFilter]:
+    """
+    Get the process-wide seen filter
+
+    Opt-in with SEEN_FILTER=1: once enabled, scrapers skip postings emitted
+    by an earlier run, so results only contain new postings (plus ones not
+    listed for SEEN_FILTER_MAX_AGE_DAYS and then listed again). Also configured with
+    SEEN_FILTER_CAPACITY and SEEN_FILTER_FP_RATE; files live in
+    SCRAPER_STATE_DIR.
+
+    Returns:
+        Shared SeenFilter, or None when disabled
+    """
+    global _shared_filter
+
+    if os.environ.get('SEEN_FILTER', '0').lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+
+    with _shared_filter_lock:
+        if _shared_filter is None:
+            capacity = env_int('SEEN_FILTER_CAPACITY', DEFAULT_CAPACITY)
+            fp_rate = env_float('SEEN_FILTER_FP_RATE', DEFAULT_FP_RATE)
+            max_age_days = env_float('SEEN_FILTER_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS)
+            directory = os.path.dirname(state_path('seen-current.bloom'))
+            _shared_filter = SeenFilter(
+                directory,
+                capacity=max(1000, capacity),
+                fp_rate=min(max(fp_rate, 1e-9), 0.5),
+                max_age_days=max_age_days,
+            )
+        return _shared_filter
@@ -0,0 +1,208 @@
+"""
+Persistent SerpApi response cache
+
+Every SerpApi search is billed against the monthly quota and takes seconds.
+Responses are cached on disk (sqlite, zlib-compressed JSON) keyed by the
+normalized request parameters with api_key excluded, so restarts, retries
+and repeated keyword requests for the same query never leave the host:
+
+- TTL follows the query's date_posted window (a "today" search goes stale
+  faster than a "month" search)
+- least-recently-used entries are evicted above SERPAPI_CACHE_MAX_MB
+- hit/miss counts are kept for logs and the API
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from config import env_float
+from state_store import state_path
+
+# date_posted window -> seconds a cached response stays fresh
+TTL_BY_DATE_POSTED = {
+    'today': 1 * 3600,
+    '3days': 3 * 3600,
+    'week': 6 * 3600,
+    'month': 24 * 3600,
+}
+DEFAULT_TTL_SECONDS = 6 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+EXCLUDED_PARAMS = frozenset({'api_key', 'output', 'async', 'no_cache'})
+
+
+def normalize_params(params: Dict) -> Dict:
+    """Request parameters that identify a response (no api_key, normalized strings)"""
+    normalized = {}
+    for name, value in params.items():
+        if name in EXCLUDED_PARAMS or value is None:
+            continue
+        if isinstance(value, str):
+            value = ' '.join(value.split()).lower()
+        normalized[name] = value
+    return normalized
+
+
+def cache_key(params: Dict) -> str:
+    normalized = json.dumps(normalize_params(params), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def ttl_for(params: Dict) -> int:
+    """Freshness window for a query, from its date_posted parameter"""
+    return TTL_BY_DATE_POSTED.get(str(params.get('date_posted') or '').lower(), DEFAULT_TTL_SECONDS)
+
+
+class SerpApiCache:
+    """On-disk LRU cache of SerpApi JSON responses"""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize response cache
+
+        Args:
+            path: sqlite database file
+            max_bytes: Compressed size above which least-recently-used entries are evicted
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' params TEXT NOT NULL,'
+            ' body BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' expires_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+
+    def get(self, params: Dict) -> Optional[Dict]:
+        """Fresh cached response for these parameters, or None (counts a hit or miss)"""
+        key = cache_key(params)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, params: Dict, response: Dict):
+        """Store a response (error responses are never cached)"""
+        if not isinstance(response, dict) or 'error' in response:
+            return
+
+        now = time.time()
+        body = zlib.compress(json.dumps(response, separators=(',', ':')).encode('utf-8'), 6)
+        normalized = json.dumps(normalize_params(params), sort_keys=True, default=str)
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, params, body, size, created_at, expires_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (cache_key(params), normalized, body, len(body), now, now + ttl_for(params), now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def fetch(self, params: Dict, search: Callable[[], Dict]) -> Tuple[Dict, bool]:
+        """
+        Cached response, or run the search and cache its result
+
+        Args:
+            params: SerpApi request parameters (api_key is ignored for the key)
+            search: Performs the real API call
+
+        Returns:
+            (response, from_cache)
+        """
+        cached = self.get(params)
+        if cached is not None:
+            return cached, True
+
+        response = search()
+        self.put(params, response)
+        return response, False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least-recently-used ones until under max_bytes"""
+        self._conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        doomed = []
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+
+
+_shared_cache: Optional[SerpApiCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_serpapi_cache() -> Optional[SerpApiCache]:
+    """
+    Get the process-wide SerpApi response cache
+
+    Configured with SERPAPI_CACHE_PATH (default: serpapi_cache.sqlite3 in
+    SCRAPER_STATE_DIR) and SERPAPI_CACHE_MAX_MB (default 50). Set
+    SERPAPI_CACHE=0 to disable caching.
+
+    Returns:
+        Shared SerpApiCache, or None when caching is disabled
+    """
+    global _shared_cache
+
+    if os.environ.get('SERPAPI_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            max_bytes = int(env_float('SERPAPI_CACHE_MAX_MB', 50) * 1024 * 1024)
+            path = os.environ.get('SERPAPI_CACHE_PATH') or state_path('serpapi_cache.sqlite3')
+            _shared_cache = SerpApiCache(path, max_bytes=max_bytes)
+        return _shared_cache
@@ -2,12 +2,28 @@
 Smart polling manager with conditional requests, adaptive scheduling, and delta detection
 """
 import hashlib
+import heapq
+import itertools
 import json
+import math
+import os
+import random
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import requests
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from circuit_breaker import CLOSED, CircuitBreaker, CircuitOpen
+from config import env_float
+import event_log
+import metrics
+
+HOURS_PER_WEEK = 168
+
+POLICY_ADAPTIVE = 'adaptive'
+POLICY_PREDICTIVE = 'predictive'
 
 
 @dataclass
@@ -29,25 +45,366 @@ class PollingMetadata:
     last_response_time_ms: Optional[int] = None
     content_hash: Optional[str] = None
     last_job_count: int = 0
+    # Predictive scheduling state (see PredictivePollingModel)
+    change_fraction_ewma: Optional[float] = None
+    observed_interval_hours_ewma: Optional[float] = None
+    seasonal_level_ewma: Optional[float] = None
+    last_observation_at: Optional[datetime] = None
+    seasonal_changes: List[float] = field(default_factory=lambda: [0.0] * HOURS_PER_WEEK)
+    seasonal_exposure: List[float] = field(default_factory=lambda: [0.0] * HOURS_PER_WEEK)
+    seasonal_decayed_at: Optional[datetime] = None
+    next_poll_at: Optional[datetime] = None
+    # Circuit breaker state (see CircuitBreaker)
+    consecutive_failures: int = 0
+    breaker_state: str = CLOSED
+    breaker_opened_at: Optional[datetime] = None
+    breaker_probe_at: Optional[datetime] = None
+    breaker_cooldown_seconds: Optional[float] = None
+    # Jobs from the last full fetch, served when a poll is skipped or returns 304
+    cached_jobs: List = field(default_factory=list, repr=False)
+
+
+def hour_of_week(moment: datetime) -> int:
+    """Hour-of-week bucket (0 = Monday 00:00 UTC)"""
+    return moment.weekday() * 24 + moment.hour
+
+
+class PredictivePollingModel:
+    """
+    Predictive polling schedule
+
+    Tracks, per source:
+    - an exponentially weighted change rate (changes/hour), estimated from
+      the fraction of polls that saw a change and the typical poll gap,
+      corrected for several changes landing in one gap (Poisson model)
+    - hour-of-week seasonality: time-decayed change counts and observed
+      hours per bucket, shrunk towards the mean rate so sparse buckets stay
+      sane. The EWMA rate is divided by the seasonal level it was measured
+      at, so a quiet night does not drag down the forecast for the morning.
+
+    The next poll is the earliest time at which the expected stale time
+    accumulated since the last poll reaches the target staleness. Busy
+    hours therefore get short intervals and quiet hours long ones.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        seasonal_half_life_hours: float = 4 * HOURS_PER_WEEK,
+        seasonal_prior_hours: float = 2.0,
+        recent_weight: float = 0.5,
+        target_staleness_minutes: float = 30.0,
+        step_minutes: int = 5
+    ):
+        """
+        Initialize predictive model
+
+        Args:
+            alpha: EWMA weight of the newest observation
+            seasonal_half_life_hours: Half-life of hour-of-week statistics
+            seasonal_prior_hours: Pseudo-hours pulling each bucket towards the mean rate
+            recent_weight: Share of the EWMA rate (vs the long-run rate) in the
+                forecast once a week of history exists
+            target_staleness_minutes: Expected stale minutes tolerated per poll cycle
+            step_minutes: Integration step when searching for the next poll time
+        """
+        self.alpha = alpha
+        self.seasonal_half_life_hours = seasonal_half_life_hours
+        self.seasonal_prior_hours = seasonal_prior_hours
+        self.recent_weight = recent_weight
+        self.target_staleness_minutes = target_staleness_minutes
+        self.step_minutes = step_minutes
+
+    def observe(self, metadata: PollingMetadata, changed: bool, now: datetime):
+        """Fold one poll outcome covering [last_observation_at, now] into the model"""
+        last = metadata.last_observation_at
+        metadata.last_observation_at = now
+        if last is None:
+            return
+
+        hours = (now - last).total_seconds() / 3600
+        if hours <= 0:
+            return
+
+        # Spread the observed window over the hour-of-week buckets it covers
+        overlaps: Dict[int, float] = {}
+        cursor = max(last, now - timedelta(hours=HOURS_PER_WEEK))
+        while cursor < now:
+            bucket_end = cursor.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            segment_end = min(bucket_end, now)
+            bucket = hour_of_week(cursor)
+            overlaps[bucket] = overlaps.get(bucket, 0.0) + (segment_end - cursor).total_seconds() / 3600
+            cursor = segment_end
+
+        weight = self._bucket_weight(metadata)
+        weights = {bucket: weight(bucket) for bucket in overlaps}
+        covered = sum(overlaps.values())
+        level = sum(weights[bucket] * overlap for bucket, overlap in overlaps.items()) / covered
+
+        observed = 1.0 if changed else 0.0
+        if metadata.change_fraction_ewma is None:
+            metadata.change_fraction_ewma = observed
+            metadata.observed_interval_hours_ewma = hours
+            metadata.seasonal_level_ewma = level
+        else:
+            metadata.change_fraction_ewma += self.alpha * (observed - metadata.change_fraction_ewma)
+            metadata.observed_interval_hours_ewma += self.alpha * (hours - metadata.observed_interval_hours_ewma)
+            metadata.seasonal_level_ewma += self.alpha * (level - metadata.seasonal_level_ewma)
+
+        changes = metadata.seasonal_changes
+        exposure = metadata.seasonal_exposure
+
+        # Decay at most hourly; with a multi-week half-life finer steps change nothing
+        decayed_at = metadata.seasonal_decayed_at or last
+        decay_hours = (now - decayed_at).total_seconds() / 3600
+        if decay_hours >= 1:
+            decay = 0.5 ** (decay_hours / self.seasonal_half_life_hours)
+            metadata.seasonal_changes = changes = [value * decay for value in changes]
+            metadata.seasonal_exposure = exposure = [value * decay for value in exposure]
+            metadata.seasonal_decayed_at = now
+        elif metadata.seasonal_decayed_at is None:
+            metadata.seasonal_decayed_at = last
+
+        for bucket, overlap in overlaps.items():
+            exposure[bucket] += overlap
+
+        if changed:
+            # Credit the change to buckets by their expected share of it
+            shares = {bucket: weights[bucket] * overlap for bucket, overlap in overlaps.items()}
+            total = sum(shares.values()) or 1.0
+            for bucket, share in shares.items():
+                changes[bucket] += share / total
+
+    def change_rate(self, metadata: PollingMetadata) -> Optional[float]:
+        """
+        Deseasonalized change rate in changes/hour (multiply by a bucket's
+        seasonal weight for that hour's rate), or None before any observation
+        """
+        if metadata.change_fraction_ewma is None:
+            return None
+        fraction = min(max(metadata.change_fraction_ewma, 0.02), 0.98)
+        interval_hours = max(metadata.observed_interval_hours_ewma or 0.0, 1 / 60)
+        level = max(metadata.seasonal_level_ewma or 1.0, 0.05)
+        recent_rate = -math.log(1 - fraction) / interval_hours / level
+
+        # Blend with the long-run rate so a long quiet spell (e.g. a weekend)
+        # does not erase what the seasonal model knows
+        total_exposure = sum(metadata.seasonal_exposure)
+        if total_exposure < HOURS_PER_WEEK:
+            return recent_rate
+        long_run_rate = sum(metadata.seasonal_changes) / total_exposure
+        return self.recent_weight * recent_rate + (1 - self.recent_weight) * long_run_rate
+
+    def seasonal_weights(self, metadata: PollingMetadata) -> List[float]:
+        """Per hour-of-week multipliers of the average change rate"""
+        weight = self._bucket_weight(metadata)
+        return [weight(bucket) for bucket in range(HOURS_PER_WEEK)]
+
+    def _bucket_weight(self, metadata: PollingMetadata) -> Callable[[int], float]:
+        """Seasonal weight lookup that only computes the buckets it is asked for"""
+        changes = metadata.seasonal_changes
+        exposure = metadata.seasonal_exposure
+        total_changes = sum(changes)
+        total_exposure = sum(exposure)
+        if total_changes <= 0 or total_exposure <= 0:
+            return lambda bucket: 1.0
+
+        mean_rate = total_changes / total_exposure
+        prior = self.seasonal_prior_hours
+        prior_changes = prior * mean_rate
+
+        def weight(bucket: int) -> float:
+            return (changes[bucket] + prior_changes) / (exposure[bucket] + prior) / mean_rate
+
+        return weight
+
+    def next_interval_minutes(self, metadata: PollingMetadata, now: datetime) -> int:
+        """Choose the next poll interval to hit the target staleness"""
+        rate = self.change_rate(metadata)
+        if rate is None:
+            return metadata.current_poll_interval_minutes
+
+        weight = self._bucket_weight(metadata)
+        bucket_rates: Dict[int, float] = {}
+        first_bucket = hour_of_week(now)
+        minute_of_hour = now.minute + now.second / 60
+        step = self.step_minutes
+        hazard = 0.0
+        expected_stale_minutes = 0.0
+        minutes = 0
+
+        while minutes < metadata.max_poll_interval_minutes:
+            bucket = (first_bucket + int((minute_of_hour + minutes) // 60)) % HOURS_PER_WEEK
+            bucket_rate = bucket_rates.get(bucket)
+            if bucket_rate is None:
+                bucket_rate = bucket_rates[bucket] = rate * weight(bucket) * step / 60
+            hazard += bucket_rate
+            expected_stale_minutes += (1 - math.exp(-hazard)) * step
+            minutes += step
+            if expected_stale_minutes >= self.target_staleness_minutes:
+                break
+
+        return max(metadata.min_poll_interval_minutes, min(metadata.max_poll_interval_minutes, minutes))
+
+
+class PollScheduler:
+    """
+    Min-heap of sources ordered by next due time
+
+    Finding due sources costs O(k log n) for k due sources instead of asking
+    every source. Rescheduling pushes a new heap entry and marks the old one
+    dead (lazy invalidation), so it is O(log n) too; dead entries are
+    skipped when popped and purged once they outnumber live ones.
+
+    Intervals are jittered by +/- jitter_fraction so sources that share an
+    interval drift apart instead of firing together.
+    """
+
+    def __init__(self, jitter_fraction: float = 0.1, seed: Optional[int] = None):
+        """
+        Initialize poll scheduler
+
+        Args:
+            jitter_fraction: Max relative jitter applied to intervals (0 disables)
+            seed: Seed for the jitter random generator
+        """
+        self.jitter_fraction = jitter_fraction
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}
+        self._counter = itertools.count()
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, source_url: str) -> bool:
+        return source_url in self._entries
+
+    def schedule(self, source_url: str, due_at: datetime):
+        """Schedule (or reschedule) a source at an exact time"""
+        old = self._entries.pop(source_url, None)
+        if old is not None:
+            old[2] = None
+
+        entry = [due_at, next(self._counter), source_url]
+        self._entries[source_url] = entry
+        heapq.heappush(self._heap, entry)
+
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def schedule_in(self, source_url: str, now: datetime, interval_minutes: float) -> datetime:
+        """
+        Schedule a source one jittered interval from now
+
+        Returns:
+            The due time that was scheduled
+        """
+        due_at = now + timedelta(minutes=self.jittered(interval_minutes))
+        self.schedule(source_url, due_at)
+        return due_at
+
+    def jittered(self, interval_minutes: float) -> float:
+        """Apply +/- jitter_fraction of random jitter to an interval"""
+        if self.jitter_fraction <= 0:
+            return interval_minutes
+        return interval_minutes * (1 + self._random.uniform(-self.jitter_fraction, self.jitter_fraction))
+
+    def remove(self, source_url: str):
+        """Stop scheduling a source"""
+        entry = self._entries.pop(source_url, None)
+        if entry is not None:
+            entry[2] = None
+
+    def due_at(self, source_url: str) -> Optional[datetime]:
+        entry = self._entries.get(source_url)
+        return entry[0] if entry else None
+
+    def peek_next_due(self) -> Optional[datetime]:
+        """Earliest due time, or None if nothing is scheduled"""
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: datetime, limit: Optional[int] = None) -> List[str]:
+        """
+        Remove and return sources due at or before now, earliest first
+
+        Popped sources are no longer scheduled; reschedule them after polling.
+
+        Args:
+            now: Current time
+            limit: Max sources to return (None for all due sources)
+
+        Returns:
+            Source URLs
+        """
+        heap = self._heap
+        due = []
+        while heap and (limit is None or len(due) < limit):
+            due_at, _, source_url = heap[0]
+            if source_url is None:
+                heapq.heappop(heap)
+                continue
+            if due_at > now:
+                break
+            heapq.heappop(heap)
+            del self._entries[source_url]
+            due.append(source_url)
+        return due
+
+    def _compact(self):
+        """Drop dead entries and rebuild the heap"""
+        self._heap = [entry for entry in self._heap if entry[2] is not None]
+        heapq.heapify(self._heap)
 
 
 class SmartPollingManager:
     """
     Manages smart polling with:
     - Conditional requests (ETag/Last-Modified)
-    - Adaptive polling intervals
+    - Adaptive or predictive polling intervals
     - Delta detection via content hashing
     """
 
-    def __init__(self, db_connection=None):
+    def __init__(
+        self,
+        db_connection=None,
+        policy: Optional[str] = None,
+        model: Optional[PredictivePollingModel] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        scheduler: Optional[PollScheduler] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Initialize smart polling manager
 
         Args:
             db_connection: Optional database connection for persisting metadata
+            policy: 'predictive' (default, or POLLING_POLICY env var) or 'adaptive'
+            model: Predictive model (defaults to one targeting
+                POLLING_TARGET_STALENESS_MINUTES, 30 by default)
+            clock: Returns the current UTC time (overridable for simulation)
+            scheduler: Due-time heap (defaults to one jittering intervals by
+                POLLING_JITTER_FRACTION, 0.1 by default)
+            breaker: Circuit breaker applied to every fetch (defaults to
+                CircuitBreaker.from_env(); None when CIRCUIT_BREAKER=0)
         """
         self.db = db_connection
         self.cache: Dict[str, PollingMetadata] = {}
+        self.policy = policy or os.environ.get('POLLING_POLICY', POLICY_PREDICTIVE)
+        # PollScheduler defines __len__: an empty injected one is falsy
+        self.model = model if model is not None else PredictivePollingModel(
+            target_staleness_minutes=env_float('POLLING_TARGET_STALENESS_MINUTES', 30.0)
+        )
+        self.clock = clock
+        self.scheduler = scheduler if scheduler is not None else PollScheduler(
+            jitter_fraction=env_float('POLLING_JITTER_FRACTION', 0.1)
+        )
+        self.breaker = breaker if breaker is not None else CircuitBreaker.from_env()
+        # Concurrent searches share one breaker; a half-open probe must be admitted once
+        self._breaker_lock = threading.Lock()
 
     def _compute_content_hash(self, content: str) -> str:
         """Compute SHA256 hash of normalized content"""
@@ -86,8 +443,11 @@ class SmartPollingManager:
             # Never polled before, should poll
             return True
 
+        if metadata.next_poll_at:
+            return self.clock() >= metadata.next_poll_at
+
         # Calculate time since last poll
-        time_since_poll = datetime.utcnow() - metadata.last_poll_at
+        time_since_poll = self.clock() - metadata.last_poll_at
         poll_interval = timedelta(minutes=metadata.current_poll_interval_minutes)
 
         return time_since_poll >= poll_interval
@@ -111,8 +471,14 @@ class SmartPollingManager:
             - content is None if 304 Not Modified
             - status_code is HTTP status
             - headers contains response headers
+
+        Raises:
+            CircuitOpen: The source failed repeatedly and is not due for a probe
         """
         metadata = self._get_metadata(source_url, source_name)
+        if not self.allow_request(source_url, source_name):
+            metrics.inc('scraper_fetches_total', outcome='circuit_open')
+            raise CircuitOpen(source_name)
 
         # Build conditional request headers
         headers = {
@@ -127,8 +493,15 @@ class SmartPollingManager:
 
         # Make request and track timing
         start_time = time.time()
+        response = None
         try:
-            response = requests.get(source_url, headers=headers, timeout=timeout)
+            with metrics.fetching() as fetch:
+                response = requests.get(source_url, headers=headers, timeout=timeout)
+                fetch['bytes'] = len(response.content)
+                if response.status_code == 304:
+                    fetch['outcome'] = 'not_modified'
+                elif response.status_code >= 400:
+                    fetch['outcome'] = 'error'
             response_time_ms = int((time.time() - start_time) * 1000)
 
             # Extract caching headers
@@ -148,7 +521,7 @@ class SmartPollingManager:
 
             if response.status_code == 304:
                 # Not modified, return None content
-                print(f"  ✓ {source_name}: 304 Not Modified (cached)")
+                event_log.info('poll.not_modified', name=source_name)
                 return None, 304, dict(response.headers)
 
             response.raise_for_status()
@@ -156,16 +529,73 @@ class SmartPollingManager:
 
         except requests.RequestException as e:
             response_time_ms = int((time.time() - start_time) * 1000)
-            print(f"  ✗ {source_name}: Request failed - {e}")
-            self._update_poll_metadata(
-                source_url,
-                source_name,
-                status_code=0,
-                response_time_ms=response_time_ms,
-                content_changed=False
-            )
+            event_log.warning('poll.failed', name=source_name, error=str(e))
+            # An error response (raise_for_status) is already recorded with its status
+            if response is None:
+                self._update_poll_metadata(
+                    source_url,
+                    source_name,
+                    status_code=0,
+                    response_time_ms=response_time_ms,
+                    content_changed=False
+                )
             raise
 
+    def allow_request(self, source_url: str, source_name: str) -> bool:
+        """Whether the circuit breaker lets a call to the source go ahead now"""
+        if self.breaker is None:
+            return True
+        metadata = self._get_metadata(source_url, source_name)
+        with self._breaker_lock:
+            return self.breaker.allow(metadata, self.clock())
+
+    def record_request(self, source_url: str, source_name: str, status_code: int, response_time_ms: int):
+        """
+        Record the outcome of a call that is not a poll (board APIs, search APIs)
+
+        Args:
+            status_code: HTTP status, or 0 when no response arrived
+            response_time_ms: Time the call took
+        """
+        metadata = self._get_metadata(source_url, source_name)
+        metadata.last_status_code = status_code
+        metadata.last_response_time_ms = response_time_ms
+        if self.breaker is not None:
+            with self._breaker_lock:
+                self.breaker.record(metadata, status_code, response_time_ms, self.clock())
+        self._save_metadata(metadata)
+
+    @contextmanager
+    def guard(self, source_url: str, source_name: str, ignore: Tuple[type, ...] = ()) -> Iterator[None]:
+        """
+        Run one upstream call under the source's circuit breaker
+
+        Raises CircuitOpen without running the block when the breaker is
+        open; otherwise records the block's outcome (success, the HTTP status
+        of an HTTPError, or 0 for any other exception) and latency.
+
+        Args:
+            ignore: Exceptions that mean the call was never made (e.g. quota
+                refusals); they propagate without counting either way
+        """
+        if not self.allow_request(source_url, source_name):
+            metrics.inc('scraper_fetches_total', outcome='circuit_open')
+            raise CircuitOpen(source_name)
+        start_time = time.time()
+        try:
+            yield
+        except ignore:
+            if self.breaker is not None:
+                with self._breaker_lock:
+                    self.breaker.release(self._get_metadata(source_url, source_name))
+            raise
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            status_code = getattr(response, 'status_code', None) or 0
+            self.record_request(source_url, source_name, status_code, int((time.time() - start_time) * 1000))
+            raise
+        self.record_request(source_url, source_name, 200, int((time.time() - start_time) * 1000))
+
     def detect_content_delta(
         self,
         source_url: str,
@@ -200,13 +630,14 @@ class SmartPollingManager:
         metadata.last_job_count = len(jobs)
 
         if has_changed:
-            metadata.last_change_at = datetime.utcnow()
+            metadata.last_change_at = self.clock()
             metadata.total_changes += 1
             metadata.consecutive_unchanged_polls = 0
-            print(f"  ✓ {source_name}: Content changed ({len(jobs)} jobs)")
+            event_log.info('poll.changed', name=source_name, jobs=len(jobs))
         else:
             metadata.consecutive_unchanged_polls += 1
-            print(f"  → {source_name}: No content changes ({metadata.consecutive_unchanged_polls} unchanged polls)")
+            event_log.info('poll.unchanged', name=source_name,
+                           unchanged_polls=metadata.consecutive_unchanged_polls)
 
         self._save_metadata(metadata)
         return has_changed
@@ -218,9 +649,13 @@ class SmartPollingManager:
         content_changed: bool
     ) -> int:
         """
-        Adjust polling interval based on change frequency (adaptive schedule)
+        Adjust polling interval based on change frequency
 
-        Strategy:
+        Predictive policy (default): update the source's change-rate model
+        and pick the interval that hits the target staleness (see
+        PredictivePollingModel).
+
+        Adaptive policy:
         - If content changed: decrease interval (poll more frequently)
         - If unchanged for 3+ polls: increase interval (backoff)
         - Respect min/max bounds
@@ -237,7 +672,13 @@ class SmartPollingManager:
 
         current_interval = metadata.current_poll_interval_minutes
 
-        if content_changed:
+        if self.policy == POLICY_PREDICTIVE:
+            now = self.clock()
+            self.model.observe(metadata, content_changed, now)
+            new_interval = self.model.next_interval_minutes(metadata, now)
+            if new_interval != current_interval:
+                event_log.info('poll.interval', name=source_name, minutes=new_interval)
+        elif content_changed:
             # Content changed - poll more frequently
             # Decrease interval by 50%, but respect minimum
             new_interval = max(
@@ -245,7 +686,7 @@ class SmartPollingManager:
                 int(current_interval * 0.5)
             )
             if new_interval != current_interval:
-                print(f"  ↓ {source_name}: Increasing poll frequency to every {new_interval} min")
+                event_log.info('poll.interval', name=source_name, minutes=new_interval)
         else:
             # No change - consider backing off
             if metadata.consecutive_unchanged_polls >= 3:
@@ -255,15 +696,94 @@ class SmartPollingManager:
                     int(current_interval * 1.5)
                 )
                 if new_interval != current_interval:
-                    print(f"  ↑ {source_name}: Decreasing poll frequency to every {new_interval} min")
+                    event_log.info('poll.interval', name=source_name, minutes=new_interval)
             else:
                 new_interval = current_interval
 
         metadata.current_poll_interval_minutes = new_interval
+        metadata.next_poll_at = self.scheduler.schedule_in(
+            source_url,
+            metadata.last_poll_at or self.clock(),
+            new_interval
+        )
         self._save_metadata(metadata)
 
         return new_interval
 
+    def record_observation(
+        self,
+        source_url: str,
+        source_name: str,
+        content_changed: bool,
+        status_code: int = 200,
+        response_time_ms: int = 0
+    ) -> int:
+        """
+        Record a poll whose outcome is already known and reschedule the source
+
+        Used when the content comparison happens outside this manager (and
+        by the polling simulator).
+
+        Returns:
+            New polling interval in minutes
+        """
+        self._update_poll_metadata(
+            source_url,
+            source_name,
+            status_code=status_code,
+            response_time_ms=response_time_ms,
+            content_changed=content_changed
+        )
+
+        metadata = self._get_metadata(source_url, source_name)
+        if content_changed:
+            metadata.last_change_at = self.clock()
+            metadata.total_changes += 1
+            metadata.consecutive_unchanged_polls = 0
+        elif status_code != 304:
+            # 304s are already counted by _update_poll_metadata
+            metadata.consecutive_unchanged_polls += 1
+
+        return self.adjust_polling_interval(source_url, source_name, content_changed)
+
+    def register_source(self, source_url: str, source_name: str):
+        """
+        Add a source to the due-time scheduler
+
+        Never-polled sources are due immediately; known sources keep their
+        next poll time.
+        """
+        metadata = self._get_metadata(source_url, source_name)
+        if source_url not in self.scheduler:
+            self.scheduler.schedule(source_url, metadata.next_poll_at or self.clock())
+
+    def due_sources(self, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        Pop the sources that are due now, earliest first
+
+        Each returned source leaves the scheduler until its poll is recorded
+        (adjust_polling_interval / record_observation reschedule it).
+
+        Args:
+            limit: Max sources to return (None for all due sources)
+
+        Returns:
+            (source_url, source_name) pairs
+        """
+        return [
+            (source_url, self.cache[source_url].source_name)
+            for source_url in self.scheduler.pop_due(self.clock(), limit)
+        ]
+
+    def remember_jobs(self, source_url: str, source_name: str, jobs: List):
+        """Keep the jobs from the last full fetch of a source"""
+        metadata = self._get_metadata(source_url, source_name)
+        metadata.cached_jobs = list(jobs)
+
+    def cached_jobs(self, source_url: str, source_name: str) -> List:
+        """Jobs from the last full fetch (for skipped or 304 polls)"""
+        return list(self._get_metadata(source_url, source_name).cached_jobs)
+
     def get_polling_stats(self, source_url: str, source_name: str) -> Dict:
         """Get polling statistics for a source"""
         metadata = self._get_metadata(source_url, source_name)
@@ -284,6 +804,11 @@ class SmartPollingManager:
             'last_job_count': metadata.last_job_count,
             'last_status_code': metadata.last_status_code,
             'last_response_time_ms': metadata.last_response_time_ms,
+            'policy': self.policy,
+            'estimated_changes_per_hour': self.model.change_rate(metadata),
+            'next_poll_at': metadata.next_poll_at.isoformat() if metadata.next_poll_at else None,
+            'breaker_state': metadata.breaker_state,
+            'consecutive_failures': metadata.consecutive_failures,
         }
 
     def _get_metadata(self, source_url: str, source_name: str) -> PollingMetadata:
@@ -319,7 +844,7 @@ class SmartPollingManager:
         """Update polling metadata after a poll"""
         metadata = self._get_metadata(source_url, source_name)
 
-        metadata.last_poll_at = datetime.utcnow()
+        metadata.last_poll_at = self.clock()
         metadata.total_polls += 1
         metadata.last_status_code = status_code
         metadata.last_response_time_ms = response_time_ms
@@ -329,6 +854,13 @@ class SmartPollingManager:
         if last_modified:
             metadata.last_modified = last_modified
 
+        if status_code == 304 and not content_changed:
+            metadata.consecutive_unchanged_polls += 1
+
+        if self.breaker is not None:
+            with self._breaker_lock:
+                self.breaker.record(metadata, status_code, response_time_ms, metadata.last_poll_at)
+
         self._save_metadata(metadata)
 
     def _save_metadata(self, metadata: PollingMetadata):
@@ -0,0 +1,45 @@
+"""
+Local state files for the scraper service
+
+Learned state (query yields, response caches, seen-job ledgers) lives in
+one directory, SCRAPER_STATE_DIR (default: .state next to this module), so
+a container only needs one volume to keep it across restarts.
+"""
+import json
+import os
+import tempfile
+from typing import Any
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.state')
+
+
+def state_path(name: str) -> str:
+    """Path of a state file, creating the state directory if needed"""
+    directory = os.environ.get('SCRAPER_STATE_DIR') or DEFAULT_STATE_DIR
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+
+def load_json(path: str, default: Any = None) -> Any:
+    """Read a JSON state file, returning default if it is missing or corrupt"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def atomic_write_json(path: str, data: Any):
+    """Write JSON via a temp file + rename so readers never see a partial file"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,315 @@
+"""
+Lightweight tracing of scrape runs
+
+A sampled scrape records nested spans (scrape → source → board/repo →
+fetch, parse, classify, dedup) with wall-clock timings and the thread they
+ran on. The current span lives in a context variable, so spans nest across
+function calls without passing anything around, and threads started with
+contextvars.copy_context() (query and hedging threads) attach to the span
+that started them.
+
+Per-row helpers such as clean_job_title run thousands of times per page,
+so they are not spans of their own: @stage adds their call count and time
+to the enclosing span, where they show up as args (e.g.
+`clean_job_title_ms`).
+
+Outside a sampled trace every hook is a context variable lookup. Whether a
+scrape is traced is decided up front: TRACE_SAMPLE_RATE normally, and
+TRACE_LOADED_SAMPLE_RATE once the 1-minute load average per CPU exceeds
+TRACE_LOAD_THRESHOLD. Finished traces are stored as Chrome trace-event JSON
+(open them in chrome://tracing or Perfetto) under <job store>/traces.
+"""
+import contextvars
+import functools
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from config import env_float, env_int
+from state_store import atomic_write_json, load_json
+
+DEFAULT_MAX_SPANS = 20000
+DEFAULT_KEEP_TRACES = 20
+
+
+class Trace:
+    """Spans of one traced operation"""
+
+    def __init__(self, name: str, max_spans: int = DEFAULT_MAX_SPANS, **args):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.args = args
+        self.started_at = time.time()
+        self.started_ns = time.perf_counter_ns()
+        self.max_spans = max_spans
+        self.events: List[Dict] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, event: Dict):
+        with self._lock:
+            if len(self.events) < self.max_spans:
+                self.events.append(event)
+            else:
+                self.dropped += 1
+
+    def to_chrome(self) -> Dict:
+        """Chrome trace-event format: one complete ('X') event per span"""
+        pid = os.getpid()
+        with self._lock:
+            events = [dict(event, pid=pid, ph='X') for event in self.events]
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'id': self.id,
+                'name': self.name,
+                'started_at': datetime.utcfromtimestamp(self.started_at).isoformat(),
+                'dropped_spans': self.dropped,
+                **{key: str(value) for key, value in self.args.items()},
+            },
+        }
+
+
+class Span:
+    """One timed operation inside a trace"""
+
+    __slots__ = ('trace', 'name', 'category', 'args', 'start_ns', 'stages')
+
+    def __init__(self, trace: Trace, name: str, category: str, args: Dict):
+        self.trace = trace
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_ns = time.perf_counter_ns()
+        # stage name -> [calls, nanoseconds]
+        self.stages: Dict[str, List[int]] = {}
+
+    def finish(self):
+        end_ns = time.perf_counter_ns()
+        args = dict(self.args)
+        for stage_name, (calls, elapsed_ns) in self.stages.items():
+            args[f"{stage_name}_calls"] = calls
+            args[f"{stage_name}_ms"] = round(elapsed_ns / 1e6, 3)
+        self.trace.add({
+            'name': self.name,
+            'cat': self.category,
+            'ts': (self.start_ns - self.trace.started_ns) / 1000,
+            'dur': (end_ns - self.start_ns) / 1000,
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('trace_span', default=None)
+
+
+@contextmanager
+def span(name: str, category: str = 'stage', **args) -> Iterator[Optional[Span]]:
+    """Time the block as a child of the current span (no-op outside a sampled trace)"""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    current = Span(parent.trace, name, category, args)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+        current.finish()
+
+
+def stage(name: str) -> Callable:
+    """Decorator adding a hot helper's calls and time to the enclosing span"""
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current = _current.get()
+            if current is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals = current.stages.get(name)
+                if totals is None:
+                    totals = current.stages[name] = [0, 0]
+                totals[0] += 1
+                totals[1] += time.perf_counter_ns() - started
+        return wrapper
+    return decorate
+
+
+class TraceSampler:
+    """Decides which operations are traced, sampling less under load"""
+
+    def __init__(self, rate: float = 1.0, loaded_rate: float = 0.1, load_threshold: float = 0.8):
+        """
+        Initialize sampler
+
+        Args:
+            rate: Share of operations traced normally
+            loaded_rate: Share traced while the host is loaded
+            load_threshold: 1-minute load average per CPU above which the
+                host counts as loaded
+        """
+        self.rate = rate
+        self.loaded_rate = loaded_rate
+        self.load_threshold = load_threshold
+
+    def loaded(self) -> bool:
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1) > self.load_threshold
+        except (AttributeError, OSError):  # getloadavg is not available everywhere
+            return False
+
+    def sample(self) -> bool:
+        rate = self.loaded_rate if self.loaded() else self.rate
+        return rate > 0 and random.random() < rate
+
+
+class TraceStore:
+    """Keeps the most recent traces as Chrome trace JSON files"""
+
+    def __init__(self, directory: str, sampler: Optional[TraceSampler] = None,
+                 keep: int = DEFAULT_KEEP_TRACES, max_spans: int = DEFAULT_MAX_SPANS):
+        """
+        Initialize trace store
+
+        Args:
+            directory: Directory for trace files (created if missing)
+            sampler: Decides which operations are traced (default: all)
+            keep: Number of traces kept; older ones are deleted
+            max_spans: Spans recorded per trace; further spans are counted as dropped
+        """
+        self.directory = directory
+        self.sampler = sampler or TraceSampler()
+        self.keep = keep
+        self.max_spans = max_spans
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, trace_id: str) -> str:
+        if not trace_id.isalnum():
+            raise KeyError(trace_id)
+        return os.path.join(self.directory, f"{trace_id}.json")
+
+    @contextmanager
+    def trace(self, name: str, **args) -> Iterator[Optional[Trace]]:
+        """Trace the block as a new root span if it is sampled; saved when the block ends"""
+        if _current.get() is not None or not self.sampler.sample():
+            yield None
+            return
+        current = Trace(name, max_spans=self.max_spans, **args)
+        # Failed operations are saved too; they are often the interesting ones
+        try:
+            with _root(current, name, args):
+                yield current
+        finally:
+            self.save(current)
+
+    def save(self, trace: Trace):
+        try:
+            atomic_write_json(self._path(trace.id), trace.to_chrome())
+            self._prune()
+        except OSError as e:
+            import event_log  # event_log imports metrics, which imports this module
+            event_log.error('trace.save_failed', trace=trace.id, error=str(e))
+
+    def _prune(self):
+        files = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith('.json') and not name.startswith('.')
+        ]
+        files.sort(key=os.path.getmtime, reverse=True)
+        for path in files[self.keep:]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def list(self) -> List[Dict]:
+        """Summaries of the stored traces, newest first"""
+        summaries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json') or name.startswith('.'):
+                continue
+            data = load_json(os.path.join(self.directory, name))
+            if not data:
+                continue
+            events = data.get('traceEvents', [])
+            summaries.append({
+                **data.get('otherData', {}),
+                'spans': len(events),
+                'duration_ms': round(max((event['ts'] + event['dur'] for event in events), default=0) / 1000, 1),
+            })
+        return sorted(summaries, key=lambda summary: summary.get('started_at', ''), reverse=True)
+
+    def get(self, trace_id: str) -> Optional[Dict]:
+        """A stored trace in Chrome trace-event format, or None if unknown"""
+        try:
+            return load_json(self._path(trace_id))
+        except KeyError:
+            return None
+
+
+@contextmanager
+def _root(trace: Trace, name: str, args: Dict) -> Iterator[Span]:
+    root = Span(trace, name, 'trace', args)
+    token = _current.set(root)
+    try:
+        yield root
+    finally:
+        _current.reset(token)
+        root.finish()
+
+
+_shared_store: Optional[TraceStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_trace_store() -> Optional[TraceStore]:
+    """
+    Get the process-wide trace store
+
+    Traces live in a `traces` directory next to the job store (TRACE_KEEP
+    most recent, default 20). Returns None when TRACING=0.
+    """
+    global _shared_store
+
+    if os.environ.get('TRACING', '1').lower() in ('0', 'false', 'no'):
+        return None
+
+    from job_store import get_job_store
+
+    with _shared_store_lock:
+        if _shared_store is None:
+            sampler = TraceSampler(
+                rate=env_float('TRACE_SAMPLE_RATE', 1.0),
+                loaded_rate=env_float('TRACE_LOADED_SAMPLE_RATE', 0.1),
+                load_threshold=env_float('TRACE_LOAD_THRESHOLD', 0.8),
+            )
+            _shared_store = TraceStore(
+                os.path.join(get_job_store().directory, 'traces'),
+                sampler=sampler,
+                keep=env_int('TRACE_KEEP', DEFAULT_KEEP_TRACES),
+                max_spans=env_int('TRACE_MAX_SPANS', DEFAULT_MAX_SPANS),
+            )
+        return _shared_store
+
+
+@contextmanager
+def trace(name: str, **args) -> Iterator[Optional[Trace]]:
+    """Trace the block with the process-wide store (when enabled and sampled)"""
+    store = get_trace_store()
+    if store is None:
+        yield None
+        return
+    with store.trace(name, **args) as current:
+        yield current
@@ -0,0 +1,235 @@
+"""
+Per-board high-water marks for delta-friendly job board APIs
+
+Greenhouse and Lever stamp every posting with an update time. Instead of
+re-fetching a fixed window every run, each board remembers the newest
+update time it has emitted (its watermark); the next run only emits
+postings updated after it.
+
+A delta pass never notices deletions, so every BOARD_RECONCILE_HOURS a
+board gets a full reconcile pass instead: all current internships are
+emitted and the listing counts as complete, which lets the job ledger
+tombstone postings that disappeared.
+
+Watermarks only move forward. Saving merges with the file under an
+exclusive lock, so overlapping runs keep the newest mark of either.
+
+A scrape advances a PendingWatermarks instead of the store itself, and
+commits it once its result is stored: if the run fails, is cancelled or
+its result is never saved, the next run fetches the same postings again
+instead of skipping them until the next reconcile.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: saves are only serialized within the process
+    fcntl = None
+
+from config import env_float
+from state_store import atomic_write_json, load_json, state_path
+
+DEFAULT_RECONCILE_HOURS = 24.0
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """
+    Parse an API timestamp into naive UTC
+
+    Args:
+        value: ISO 8601 string (Greenhouse) or epoch milliseconds (Lever)
+
+    Returns:
+        Naive UTC datetime, or None if missing or unparseable
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        try:
+            return datetime.fromtimestamp(value / 1000, tz=timezone.utc).replace(tzinfo=None)
+        except (OverflowError, OSError, ValueError):
+            return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _later(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    """The later of two ISO timestamps (either may be missing)"""
+    if not a or not b:
+        return a or b
+    return a if parse_timestamp(a) >= parse_timestamp(b) else b
+
+
+class WatermarkStore:
+    """Persisted watermark and last full reconcile time per board"""
+
+    def __init__(self, path: Optional[str] = None, reconcile_hours: float = DEFAULT_RECONCILE_HOURS):
+        """
+        Initialize watermark store
+
+        Args:
+            path: JSON state file (None keeps watermarks in memory only)
+            reconcile_hours: Hours between full reconcile passes of a board
+        """
+        self.path = path
+        self.reconcile_interval = timedelta(hours=reconcile_hours)
+        self._lock = threading.Lock()
+        self._boards: Dict[str, Dict] = (load_json(path, default=None) or {}) if path else {}
+
+    @staticmethod
+    def key(kind: str, board: str) -> str:
+        return f"{kind}/{board}"
+
+    def since(self, kind: str, board: str, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Delta cutoff for a board's next fetch
+
+        Args:
+            kind: Board provider ('greenhouse', 'lever')
+            board: Board name
+            now: Current time (UTC)
+
+        Returns:
+            Watermark to fetch after, or None when a full reconcile is due
+            (never reconciled, no watermark yet, or the interval elapsed)
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            state = self._boards.get(self.key(kind, board)) or {}
+        watermark = parse_timestamp(state.get('watermark'))
+        reconciled_at = parse_timestamp(state.get('reconciled_at'))
+        if watermark is None or reconciled_at is None or now - reconciled_at >= self.reconcile_interval:
+            return None
+        return watermark
+
+    def advance(
+        self,
+        kind: str,
+        board: str,
+        updated_at: Iterable,
+        full: bool = False,
+        now: Optional[datetime] = None
+    ):
+        """
+        Record a successful fetch of a board
+
+        Args:
+            kind: Board provider
+            board: Board name
+            updated_at: Update timestamps of the postings emitted
+            full: Whether this was a full reconcile pass
+            now: Fetch time (UTC)
+        """
+        newest = max((ts for ts in map(parse_timestamp, updated_at) if ts is not None), default=None)
+        with self._lock:
+            state = self._boards.setdefault(self.key(kind, board), {})
+            if newest is not None:
+                state['watermark'] = _later(state.get('watermark'), newest.isoformat())
+            if full:
+                state['reconciled_at'] = (now or datetime.utcnow()).isoformat()
+                # An empty board still needs a watermark to switch to delta fetching
+                state.setdefault('watermark', state['reconciled_at'])
+
+    def pending(self) -> 'PendingWatermarks':
+        """Advances of one scrape, applied by PendingWatermarks.commit()"""
+        return PendingWatermarks(self)
+
+    def get(self, kind: str, board: str) -> Dict:
+        with self._lock:
+            return dict(self._boards.get(self.key(kind, board)) or {})
+
+    def save(self):
+        """Merge into the state file, keeping the later of each timestamp"""
+        if not self.path:
+            return
+        with self._locked_file():
+            on_disk = load_json(self.path, default=None) or {}
+            with self._lock:
+                for key, state in self._boards.items():
+                    merged = on_disk.setdefault(key, {})
+                    for field in ('watermark', 'reconciled_at'):
+                        merged[field] = _later(merged.get(field), state.get(field))
+                self._boards = {key: dict(state) for key, state in on_disk.items()}
+            atomic_write_json(self.path, on_disk)
+
+    @contextmanager
+    def _locked_file(self):
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class PendingWatermarks:
+    """Board advances of one scrape, held back until its result is stored"""
+
+    def __init__(self, store: WatermarkStore):
+        self.store = store
+        # (kind, board, updated_at, full, fetched at)
+        self._advances: List[Tuple[str, str, List, bool, datetime]] = []
+        self._lock = threading.Lock()
+
+    def since(self, kind: str, board: str, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Delta cutoff from the committed watermarks (see WatermarkStore.since)"""
+        return self.store.since(kind, board, now)
+
+    def advance(
+        self,
+        kind: str,
+        board: str,
+        updated_at: Iterable,
+        full: bool = False,
+        now: Optional[datetime] = None
+    ):
+        """Record a successful fetch of a board, applied on commit()"""
+        with self._lock:
+            self._advances.append((kind, board, list(updated_at), full, now or datetime.utcnow()))
+
+    def commit(self):
+        """Apply the recorded advances to the store and save it"""
+        with self._lock:
+            advances, self._advances = self._advances, []
+        for kind, board, updated_at, full, fetched_at in advances:
+            self.store.advance(kind, board, updated_at, full=full, now=fetched_at)
+        self.store.save()
+
+
+_shared_store: Optional[WatermarkStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_watermark_store() -> Optional[WatermarkStore]:
+    """
+    Get the process-wide board watermark store
+
+    Configured with BOARD_WATERMARKS_PATH (default: board_watermarks.json in
+    SCRAPER_STATE_DIR) and BOARD_RECONCILE_HOURS (default 24). Set
+    BOARD_WATERMARKS=0 to go back to a fixed 7-day window every run.
+
+    Returns:
+        Shared WatermarkStore, or None when disabled
+    """
+    global _shared_store
+
+    if os.environ.get('BOARD_WATERMARKS', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    with _shared_store_lock:
+        if _shared_store is None:
+            reconcile_hours = env_float('BOARD_RECONCILE_HOURS', DEFAULT_RECONCILE_HOURS)
+            path = os.environ.get('BOARD_WATERMARKS_PATH') or state_path('board_watermarks.json')
+            _shared_store = WatermarkStore(path, reconcile_hours=reconcile_hours)
+        return _shared_store
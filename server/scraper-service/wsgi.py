@@ -0,0 +1,15 @@
+"""
+Production WSGI entry point
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Request workers never scrape: they serve results from the shared JobStore
+and hand scrapes to the scrape worker that gunicorn.conf.py starts.
+"""
+import os
+
+os.environ.setdefault('SCRAPE_MODE', 'worker')
+
+from app import app  # noqa: E402
+
+__all__ = ['app']
@@ -0,0 +1,45 @@
+"""
+Shared pytest setup for the scraper service tests
+
+The service is a flat set of modules in server/scraper-service, imported
+the way app.py imports them. The older test_*.py scripts in this directory
+are manual checks against the live SerpApi and local API; they are run as
+scripts, not collected.
+"""
+import os
+import sys
+
+import pytest
+
+SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraper-service')
+FIXTURES_DIR = os.path.join(SERVICE_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, SERVICE_DIR)
+
+collect_ignore = [
+    'test_company_queries.py',
+    'test_compare_google.py',
+    'test_final_verification.py',
+    'test_new_internships.py',
+    'test_serpapi.py',
+]
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """Keep learned state (ledgers, budgets, filters) out of the real state directory"""
+    directory = tmp_path / 'state'
+    monkeypatch.setenv('SCRAPER_STATE_DIR', str(directory))
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def flush_events():
+    """Write out each test's buffered events while pytest still captures them"""
+    yield
+    import event_log
+    event_log.flush()
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
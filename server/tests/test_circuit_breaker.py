@@ -0,0 +1,119 @@
+"""Closed/open/half-open circuit breaker"""
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+import smart_polling
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from smart_polling import PollingMetadata, SmartPollingManager
+
+T0 = datetime(2026, 10, 1, 12, 0)
+
+
+def _metadata():
+    return PollingMetadata(source_url='https://boards.example/acme', source_name='acme')
+
+
+def _trip(breaker, metadata, now=T0):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow(metadata, now)
+        breaker.record(metadata, 503, 100, now)
+
+
+def test_failures_in_a_row_open_the_breaker():
+    breaker, metadata = CircuitBreaker(failure_threshold=3), _metadata()
+    breaker.record(metadata, 500, 100, T0)
+    breaker.record(metadata, 200, 100, T0)
+    assert metadata.consecutive_failures == 0
+
+    _trip(breaker, metadata)
+    assert metadata.breaker_state == OPEN
+    assert not breaker.allow(metadata, T0 + timedelta(seconds=299))
+
+
+def test_slow_responses_count_as_failures():
+    breaker = CircuitBreaker(slow_call_ms=1000)
+    assert breaker.is_failure(200, 1500)
+    assert not breaker.is_failure(200, 500)
+    assert not CircuitBreaker(slow_call_ms=None).is_failure(200, 10 ** 6)
+    assert breaker.is_failure(0, None) and breaker.is_failure(429, 10)
+
+
+def test_one_probe_after_cooldown_and_success_closes():
+    breaker, metadata = CircuitBreaker(cooldown_seconds=300), _metadata()
+    _trip(breaker, metadata)
+
+    later = T0 + timedelta(seconds=300)
+    assert breaker.allow(metadata, later)
+    assert metadata.breaker_state == HALF_OPEN
+    assert not breaker.allow(metadata, later)  # only one probe at a time
+
+    breaker.record(metadata, 200, 100, later)
+    assert metadata.breaker_state == CLOSED
+    assert breaker.allow(metadata, later)
+
+
+def test_failed_probe_doubles_the_cooldown_up_to_the_cap():
+    breaker, metadata = CircuitBreaker(cooldown_seconds=300, max_cooldown_seconds=500), _metadata()
+    _trip(breaker, metadata)
+
+    now = T0 + timedelta(seconds=300)
+    assert breaker.allow(metadata, now)
+    breaker.record(metadata, 503, 100, now)
+    assert (metadata.breaker_state, metadata.breaker_cooldown_seconds) == (OPEN, 500)
+    assert not breaker.allow(metadata, now + timedelta(seconds=499))
+    assert breaker.allow(metadata, now + timedelta(seconds=500))
+
+
+def test_released_probe_lets_the_next_call_probe():
+    breaker, metadata = CircuitBreaker(), _metadata()
+    _trip(breaker, metadata)
+    now = T0 + timedelta(seconds=300)
+    assert breaker.allow(metadata, now)
+    breaker.release(metadata)
+    assert breaker.allow(metadata, now)
+
+
+def test_from_env_disabled_and_bad_values(monkeypatch):
+    monkeypatch.setenv('CIRCUIT_BREAKER', '0')
+    assert CircuitBreaker.from_env() is None
+
+    monkeypatch.setenv('CIRCUIT_BREAKER', '1')
+    monkeypatch.setenv('CIRCUIT_BREAKER_FAILURES', 'three')
+    monkeypatch.setenv('CIRCUIT_BREAKER_SLOW_MS', '0')
+    monkeypatch.setenv('CIRCUIT_BREAKER_COOLDOWN_SECONDS', '5m')
+    monkeypatch.setenv('CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS', '')
+    breaker = CircuitBreaker.from_env()
+    assert breaker.failure_threshold == 3
+    assert breaker.slow_call_ms is None
+    assert (breaker.cooldown_seconds, breaker.max_cooldown_seconds) == (300, 6 * 3600)
+
+
+def _not_found(url, **kwargs):
+    response = requests.Response()
+    response.status_code = 404
+    response.url = url
+    response._content = b''
+    return response
+
+
+def _unreachable(url, **kwargs):
+    raise requests.ConnectionError('connection refused')
+
+
+@pytest.mark.parametrize('get, status', [(_not_found, 404), (_unreachable, 0)])
+def test_each_failed_poll_is_recorded_once(monkeypatch, get, status):
+    monkeypatch.setattr(smart_polling.requests, 'get', get)
+    manager = SmartPollingManager(breaker=CircuitBreaker(failure_threshold=3), clock=lambda: T0)
+    url = 'https://boards.example/acme'
+
+    for _ in range(2):
+        with pytest.raises(requests.RequestException):
+            manager.fetch_with_conditional_request(url, 'acme')
+
+    metadata = manager.cache[url]
+    assert metadata.consecutive_failures == 2
+    assert metadata.total_polls == 2
+    assert metadata.last_status_code == status
+    assert metadata.breaker_state == CLOSED
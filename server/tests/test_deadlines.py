@@ -0,0 +1,55 @@
+"""Scrape deadline budgets"""
+import pytest
+
+import deadlines
+from deadlines import MIN_TIMEOUT_SECONDS, Deadline
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(deadlines.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_unlimited_deadline_never_caps_timeouts(clock):
+    deadline = Deadline.never()
+    clock[0] += 1e6
+    assert not deadline.stop()
+    assert deadline.timeout(30) == 30
+
+
+def test_child_never_outlives_its_parent(clock):
+    parent = Deadline(10)
+    assert parent.child(60).remaining() == 10
+    assert parent.child(4).remaining() == 4
+    assert parent.child(None).remaining() == 10
+
+
+def test_timeout_shrinks_to_the_budget_but_not_below_the_floor(clock):
+    deadline = Deadline(10)
+    assert deadline.timeout(30) == 10
+    clock[0] += 9.5
+    assert deadline.timeout(30) == MIN_TIMEOUT_SECONDS
+
+
+def test_stop_marks_truncated_only_once_expired(clock):
+    deadline = Deadline(5)
+    assert not deadline.stop() and not deadline.truncated
+    clock[0] += 5
+    assert deadline.stop() and deadline.truncated
+    assert deadline.remaining() == 0.0
+
+
+def test_source_budgets_from_env(monkeypatch):
+    monkeypatch.setenv('SCRAPE_SOURCE_BUDGETS', 'GoogleJobsScraper=60, LeverScraper=abc,=5')
+    monkeypatch.setenv('SCRAPE_SOURCE_BUDGET_SECONDS', '90')
+    assert deadlines.source_budget_seconds('GoogleJobsScraper') == 60
+    assert deadlines.source_budget_seconds('LeverScraper') == 90
+
+
+def test_bad_env_values_fall_back_to_defaults(monkeypatch):
+    monkeypatch.setenv('SCRAPE_SLO_SECONDS', 'five minutes')
+    monkeypatch.setenv('SCRAPE_SOURCE_BUDGET_SECONDS', '')
+    assert deadlines.scrape_slo_seconds() == deadlines.DEFAULT_SLO_SECONDS
+    assert deadlines.source_budget_seconds('LeverScraper') == deadlines.DEFAULT_SOURCE_BUDGET_SECONDS
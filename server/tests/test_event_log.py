@@ -0,0 +1,62 @@
+"""Level-gated, sampled, buffered event logging"""
+import io
+import json
+
+import event_log
+from event_log import DEBUG, INFO, WARNING, EventLog, EventSampler
+from metrics import current_source
+
+
+def _log(**kwargs):
+    stream = io.StringIO()
+    return EventLog(stream=stream, **kwargs), stream
+
+
+def test_events_below_the_level_are_dropped():
+    log, stream = _log(level=WARNING)
+    log.log(INFO, 'board.done', jobs=3)
+    log.log(WARNING, 'board.failed', board='acme', error='timeout')
+    assert stream.getvalue() == "warning board.failed board='acme' error='timeout'\n"
+
+
+def test_info_is_buffered_until_flush_or_a_warning():
+    log, stream = _log(level=DEBUG)
+    log.log(INFO, 'board.start', board='acme')
+    assert stream.getvalue() == ''
+    log.log(WARNING, 'circuit.open', upstream='acme')
+    assert stream.getvalue().splitlines() == [
+        "info    board.start board='acme'",
+        "warning circuit.open upstream='acme'",
+    ]
+
+
+def test_json_lines_carry_level_and_current_source():
+    log, stream = _log(json_format=True)
+    token = current_source.set('LeverScraper')
+    try:
+        log.log(INFO, 'ledger.update', scope='lever/acme', new=2, removed=0)
+    finally:
+        current_source.reset(token)
+    log.flush()
+    record = json.loads(stream.getvalue())
+    assert record['level'] == 'info' and record['event'] == 'ledger.update'
+    assert (record['source'], record['scope'], record['new']) == ('LeverScraper', 'lever/acme', 2)
+
+
+def test_sampled_events_report_suppressed_counts():
+    sampler = EventSampler(burst=2, window_seconds=60)
+    assert [sampler.admit(('parse_error', 'x'), now) for now in (0, 1, 2, 3)] == [
+        (True, 0), (True, 0), (False, 0), (False, 0)
+    ]
+    assert sampler.admit(('parse_error', 'x'), 61) == (True, 2)
+    assert sampler.admit(('parse_error', 'y'), 3) == (True, 0)
+
+
+def test_bad_env_values_fall_back_to_defaults(monkeypatch):
+    monkeypatch.setenv('LOG_LEVEL', 'loud')
+    monkeypatch.setenv('LOG_SAMPLE_BURST', 'five')
+    monkeypatch.setenv('LOG_SAMPLE_WINDOW_SECONDS', '')
+    log = EventLog.from_env()
+    assert log.level == INFO
+    assert (log.sampler.burst, log.sampler.window_seconds) == (5, 60)
+    assert event_log.enabled(event_log.ERROR)
@@ -0,0 +1,42 @@
+"""Parser backends must agree on the cells the scrapers read"""
+import pytest
+
+from conftest import read_fixture
+import html_parsers
+from html_parsers import BACKENDS, get_backend
+from scrapers import extract_table_rows
+
+PAGES = {
+    'github_readme.html': {'max_rows_per_table': 100},
+    'levels_internships.html': {'max_rows': 30},
+}
+
+
+def _rows(backend: str, page: str):
+    document = get_backend(backend).parse(read_fixture(page), 'https://example.com/')
+    return extract_table_rows(document, **PAGES[page])
+
+
+@pytest.mark.parametrize('backend', sorted(BACKENDS))
+def test_text_includes_own_text(backend):
+    document = get_backend(backend).parse(
+        '<table><tr><td>Coinbase</td><td><a href="/a">ML <b>Intern</b></a> (Remote)</td></tr></table>'
+    )
+    assert [cell.text for cell in document.css('td')] == ['Coinbase', 'ML Intern (Remote)']
+
+
+def test_no_installed_backend_is_a_clear_error(monkeypatch):
+    monkeypatch.setattr(html_parsers, '_instances', {})
+    monkeypatch.setattr(html_parsers, '_backend_available', lambda name: False)
+    with pytest.raises(RuntimeError, match='not installed'):
+        get_backend('selectolax')
+
+
+@pytest.mark.parametrize('page', sorted(PAGES))
+def test_backends_extract_same_cells(page):
+    expected = _rows('lxml', page)
+    assert expected
+    assert any(row['cells'][0].strip() for row in expected)
+    for backend in ('scrapling', 'selectolax'):
+        rows = _rows(backend, page)
+        assert [row['cells'] for row in rows] == [row['cells'] for row in expected], backend
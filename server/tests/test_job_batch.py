@@ -0,0 +1,75 @@
+"""JobBatch column operations"""
+import pytest
+
+from job_batch import JobBatch
+from job_record import JobRecord
+
+
+def _job(job_id, company, deadline=None, source='github', active=True):
+    return JobRecord(
+        id=job_id,
+        company_name=company,
+        position_title=f"{company} Intern",
+        description='',
+        job_type='software',
+        location='Remote',
+        eligible_years=('Junior',),
+        posted_date='2026-10-01',
+        application_url=f"https://example.com/{job_id}",
+        source=source,
+        application_deadline=deadline,
+        is_active=active,
+    )
+
+
+@pytest.fixture
+def batch():
+    return JobBatch.from_records([
+        _job('a', 'Stripe', None),
+        _job('b', 'Coinbase', '2026-11-01', source='levels'),
+        _job('c', None, '2026-12-01', active=False),
+        _job('d', 'Airbnb', None, source='levels'),
+    ])
+
+
+@pytest.mark.parametrize('reverse, expected', [
+    (False, ['b', 'c', 'a', 'd']),
+    (True, ['c', 'b', 'a', 'd']),
+])
+def test_sort_puts_none_last(batch, reverse, expected):
+    assert batch.sort('application_deadline', reverse=reverse).column('id') == expected
+
+
+@pytest.mark.parametrize('reverse, expected', [
+    (False, ['d', 'b', 'a', 'c']),
+    (True, ['a', 'b', 'd', 'c']),
+])
+def test_sort_dictionary_column_puts_none_last(batch, reverse, expected):
+    assert batch.sort('company_name', reverse=reverse).column('id') == expected
+
+
+def test_where_and_filter(batch):
+    assert batch.where('source', ['levels']).column('id') == ['b', 'd']
+    assert batch.filter(batch.mask('is_active', bool)).column('id') == ['a', 'b', 'd']
+
+
+def test_dedupe_keeps_first_row():
+    jobs = [_job('a', 'Stripe'), _job('a', 'Stripe duplicate'), _job('b', 'Coinbase')]
+    assert JobBatch.from_records(jobs).dedupe().column('company_name') == ['Stripe', 'Coinbase']
+
+
+def test_round_trips(batch):
+    records = batch.to_records()
+    assert [record.to_dict() for record in records] == [row for row in batch.to_dicts()]
+
+    layout = batch.to_columns_json()
+    assert layout['length'] == 4
+    source = layout['columns']['source']
+    assert [source['dictionary'][code] for code in source['codes']] == ['github', 'levels', 'github', 'levels']
+    assert layout['columns']['eligible_years'] == [['Junior']] * 4
+
+
+def test_project_shares_columns(batch):
+    projected = batch.project(['id', 'source', 'missing'])
+    assert list(projected.columns) == ['id', 'source']
+    assert projected.columns['id'] is batch.columns['id']
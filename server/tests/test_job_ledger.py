@@ -0,0 +1,146 @@
+"""Job ledger: first seen, scoped misses and the removal feed"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from job_ledger import JobLedger
+
+T0 = datetime(2026, 10, 1, 12, 0)
+
+
+def _jobs(*ids, posted_date=None):
+    return [{'id': job_id, 'posted_date': posted_date} for job_id in ids]
+
+
+def _poll(ledger, ids, poll, scope=None, complete=True):
+    return ledger.observe('greenhouse', _jobs(*ids), complete=complete,
+                          now=T0 + timedelta(hours=poll), scope=scope)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return JobLedger(str(tmp_path / 'ledger.sqlite3'), misses_before_removal=2)
+
+
+def test_posted_date_sticks_to_first_seen(ledger):
+    first = ledger.observe('levels', _jobs('a'), now=T0)
+    assert first.new_ids == ['a']
+
+    jobs = _jobs('a', posted_date=(T0 + timedelta(days=1)).isoformat())
+    assert ledger.observe('levels', jobs, now=T0 + timedelta(days=1)).new_ids == []
+    assert jobs[0]['posted_date'] == T0.isoformat()
+
+    # An earlier date from the source wins
+    earlier = (T0 - timedelta(days=3)).isoformat()
+    jobs = _jobs('a', posted_date=earlier)
+    ledger.observe('levels', jobs, now=T0 + timedelta(days=2))
+    assert jobs[0]['posted_date'] == earlier
+
+
+def test_tombstone_after_consecutive_complete_misses(ledger):
+    _poll(ledger, ['a', 'b'], 0)
+    assert _poll(ledger, ['a'], 1).tombstones == []
+    update = _poll(ledger, ['a'], 2)
+    assert [tombstone['id'] for tombstone in update.tombstones] == ['b']
+
+
+def test_partial_listings_never_count_misses(ledger):
+    _poll(ledger, ['a', 'b'], 0)
+    for poll in range(1, 5):
+        assert _poll(ledger, ['a'], poll, complete=False).tombstones == []
+    assert ledger.removals_after(0) == ([], 0)
+
+
+def test_reappearing_job_resets_misses(ledger):
+    _poll(ledger, ['a', 'b'], 0)
+    _poll(ledger, ['a'], 1)
+    _poll(ledger, ['a', 'b'], 2)
+    assert _poll(ledger, ['a'], 3).tombstones == []
+
+
+def test_misses_only_counted_within_scope(ledger):
+    _poll(ledger, ['s1'], 0, scope='greenhouse/stripe')
+    _poll(ledger, ['a1'], 0, scope='greenhouse/airbnb')
+    for poll in (1, 2):
+        _poll(ledger, ['a1'], poll, scope='greenhouse/airbnb')
+    assert ledger.removals_after(0) == ([], 0)
+
+    for poll in (3, 4):
+        _poll(ledger, [], poll, scope='greenhouse/stripe')
+    removed, _ = ledger.removals_after(0)
+    assert [tombstone['id'] for tombstone in removed] == ['s1']
+
+
+def test_removal_feed_serves_each_removal_once(ledger):
+    _poll(ledger, ['a', 'b', 'c'], 0)
+    _poll(ledger, ['c'], 1)
+    _poll(ledger, ['c'], 2)
+
+    removed, cursor = ledger.removals_after(0)
+    assert [tombstone['id'] for tombstone in removed] == ['a', 'b']
+    assert set(removed[0]) == {'id', 'source', 'last_seen', 'removed_at'}
+    assert ledger.removals_after(cursor) == ([], cursor)
+
+    # Removals from a later scrape (any keywords or scope) show up after the cursor
+    _poll(ledger, ['x'], 3, scope='greenhouse/other')
+    _poll(ledger, [], 4)
+    _poll(ledger, [], 5)
+    removed, next_cursor = ledger.removals_after(cursor)
+    assert [tombstone['id'] for tombstone in removed] == ['c']
+    assert next_cursor > cursor
+
+
+def test_removal_feed_pages_by_limit(ledger):
+    _poll(ledger, ['a', 'b', 'c'], 0)
+    _poll(ledger, [], 1)
+    _poll(ledger, [], 2)
+
+    page, cursor = ledger.removals_after(0, limit=2)
+    rest, cursor = ledger.removals_after(cursor, limit=2)
+    assert [tombstone['id'] for tombstone in page + rest] == ['a', 'b', 'c']
+    assert ledger.removals_after(cursor, limit=2) == ([], cursor)
+
+
+def test_reactivated_job_leaves_the_feed_and_sequence_keeps_growing(ledger):
+    _poll(ledger, ['a', 'b'], 0)
+    _poll(ledger, ['b'], 1)
+    _poll(ledger, ['b'], 2)
+    _, cursor = ledger.removals_after(0)
+
+    # 'a' comes back: no longer a removal, but its number is not reused
+    _poll(ledger, ['a', 'b'], 3)
+    assert ledger.removals_after(0) == ([], 0)
+    _poll(ledger, ['a'], 4)
+    _poll(ledger, ['a'], 5)
+    removed, next_cursor = ledger.removals_after(cursor)
+    assert [tombstone['id'] for tombstone in removed] == ['b']
+    assert next_cursor > cursor
+
+
+def test_cursor_past_the_end_starts_over(ledger):
+    _poll(ledger, ['a'], 0)
+    _poll(ledger, [], 1)
+    _poll(ledger, [], 2)
+    removed, cursor = ledger.removals_after(99)
+    assert [tombstone['id'] for tombstone in removed] == ['a']
+    assert cursor == 1
+
+
+def test_removed_endpoint_serves_the_feed(ledger, monkeypatch):
+    import app
+    monkeypatch.setattr(app, 'get_job_ledger', lambda: ledger)
+    ledger.observe('lever', _jobs('l1'), now=T0)
+    _poll(ledger, ['g1'], 0)
+    for poll in (1, 2):
+        ledger.observe('lever', [], now=T0 + timedelta(hours=poll))
+        _poll(ledger, [], poll)
+    client = app.app.test_client()
+
+    body = client.get('/api/scrape/removed?source=lever').get_json()
+    assert [tombstone['id'] for tombstone in body['removed']] == ['l1']
+    body = client.get(f"/api/scrape/removed?after={body['cursor']}").get_json()
+    assert body['removed'] == []
+    assert client.get('/api/scrape/removed?after=soon').status_code == 400
+
+    monkeypatch.setattr(app, 'get_job_ledger', lambda: None)
+    assert client.get('/api/scrape/removed').status_code == 404
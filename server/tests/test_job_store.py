@@ -0,0 +1,94 @@
+"""Shared job store and the bounds on per-query state"""
+import os
+import time
+
+import pytest
+
+from job_batch import JobBatch
+from job_store import JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'job_store'), max_loaded=2)
+
+
+def _batch(n):
+    return JobBatch.from_records([{'id': str(i), 'title': f"Intern {i}"} for i in range(n)])
+
+
+def test_load_returns_saved_result_and_follows_file_changes(store):
+    assert store.load('intern') is None
+    saved = store.save('intern', _batch(2), truncated=['Levels.fyi'])
+    loaded = store.load('  Intern ')
+    assert len(loaded['batch']) == 2
+    assert (loaded['version'], loaded['truncated']) == (saved['version'], ['Levels.fyi'])
+    assert store.load('intern') is loaded
+
+    store.save('intern', _batch(3))
+    assert len(store.load('intern')['batch']) == 3
+
+
+def test_decoded_results_are_lru_bounded(store):
+    for keywords in ('a', 'b', 'c'):
+        store.save(keywords, _batch(1))
+    store.load('a')
+    store.load('b')
+    store.load('a')
+    store.load('c')
+    assert len(store._loaded) == 2
+    a = store.load('a')
+    assert store.load('a') is a  # still cached: 'b' was evicted
+
+
+def test_request_completed_only_by_a_scrape_started_after_it(store):
+    store.request_scrape('intern')
+    requested_at = store.pending_requests()[0]['requested_at']
+    store.complete_request('intern', started_at=requested_at - 1)
+    assert len(store.pending_requests()) == 1
+    store.complete_request('intern', started_at=requested_at + 1)
+    assert store.pending_requests() == []
+
+
+@pytest.fixture
+def worker_app(monkeypatch, store):
+    import app
+    monkeypatch.setattr(app, 'SCRAPE_MODE', 'worker')
+    monkeypatch.setattr(app, 'store', store)
+    return app
+
+
+def test_any_query_is_accepted(worker_app, store):
+    store.save('data intern', _batch(1))
+    response = worker_app.app.test_client().get('/api/scrape?q=Data%20%20Intern')
+    assert response.status_code == 200
+    assert response.get_json()['total'] == 1
+
+
+def test_results_are_bounded_by_count_and_age(tmp_path):
+    store = JobStore(str(tmp_path / 'job_store'), max_results=2, result_ttl_seconds=3600)
+    for keywords in ('a', 'b', 'c'):
+        store.save(keywords, _batch(1))
+        time.sleep(0.01)
+    assert store.load('a') is None
+    assert store.load('b') is not None and store.load('c') is not None
+
+    old = time.time() - 7200
+    os.utime(store._result_path('b'), (old, old))
+    store.save('d', _batch(1))
+    assert store.load('b') is None
+    assert sorted(os.listdir(store.results_dir)) == sorted(
+        os.path.basename(store._result_path(keywords)) for keywords in ('c', 'd'))
+
+
+def test_pending_requests_are_bounded(worker_app, tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / 'bounded'), max_pending=1)
+    monkeypatch.setattr(worker_app, 'store', store)
+    store.heartbeat()
+
+    assert store.request_scrape('a')
+    assert store.request_scrape('a')
+    assert not store.request_scrape('b')
+    response = worker_app.app.test_client().get('/api/scrape?q=b')
+    assert response.status_code == 503
+    assert [request['keywords'] for request in store.pending_requests()] == ['a']
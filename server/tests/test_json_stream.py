@@ -0,0 +1,46 @@
+"""Streaming JSON array decoding"""
+import json
+
+import pytest
+
+from json_stream import contains_any, iter_json_items
+
+DOCUMENT = json.dumps({
+    'meta': {'jobs': [{'decoy': True}], 'note': 'jobs'},
+    'jobs': [
+        {'title': 'Software Intern', 'tags': ['a', 'b'], 'text': 'brackets ] } [ { inside'},
+        {'title': 'Staff Engineer', 'text': 'escaped \\" quote and \\\\ backslash'},
+        {'title': 'Data Intern', 'nested': {'deep': [[1, 2], {'x': 'y'}]}},
+    ],
+    'total': 3,
+}).encode('utf-8')
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, 64, 1 << 20])
+def test_items_match_json_loads_for_any_chunking(size):
+    items = list(iter_json_items(_chunks(DOCUMENT, size), key='jobs'))
+    assert items == json.loads(DOCUMENT)['jobs']
+
+
+def test_top_level_array():
+    data = json.dumps([{'id': 1}, {'id': 2, 'x': '[{'}]).encode('utf-8')
+    assert list(iter_json_items(_chunks(data, 3))) == [{'id': 1}, {'id': 2, 'x': '[{'}]
+
+
+def test_prefilter_skips_items_before_decoding():
+    items = iter_json_items([DOCUMENT], key='jobs', prefilter=contains_any(['INTERN']))
+    assert [item['title'] for item in items] == ['Software Intern', 'Data Intern']
+
+
+def test_truncated_document_raises():
+    with pytest.raises(ValueError, match="'jobs' array"):
+        list(iter_json_items(_chunks(DOCUMENT[:len(DOCUMENT) // 2], 16), key='jobs'))
+
+
+def test_missing_key_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'{"postings": []}'], key='jobs'))
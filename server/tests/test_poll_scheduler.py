@@ -0,0 +1,67 @@
+"""Due-time heap of polled sources"""
+from datetime import datetime, timedelta
+
+from smart_polling import PollScheduler, PredictivePollingModel, SmartPollingManager
+
+NOW = datetime(2026, 10, 5, 12, 0)
+
+
+def test_pop_due_returns_earliest_first_and_unschedules():
+    scheduler = PollScheduler(jitter_fraction=0)
+    scheduler.schedule('b', NOW - timedelta(minutes=1))
+    scheduler.schedule('a', NOW - timedelta(minutes=5))
+    scheduler.schedule('c', NOW + timedelta(minutes=5))
+
+    assert scheduler.pop_due(NOW) == ['a', 'b']
+    assert 'a' not in scheduler and 'c' in scheduler
+    assert scheduler.peek_next_due() == NOW + timedelta(minutes=5)
+
+
+def test_reschedule_and_remove_invalidate_old_entries():
+    scheduler = PollScheduler(jitter_fraction=0)
+    scheduler.schedule('a', NOW - timedelta(minutes=5))
+    scheduler.schedule('a', NOW + timedelta(minutes=10))
+    scheduler.schedule('b', NOW - timedelta(minutes=1))
+    scheduler.remove('b')
+
+    assert scheduler.pop_due(NOW) == []
+    assert scheduler.due_at('a') == NOW + timedelta(minutes=10)
+    assert len(scheduler) == 1
+
+
+def test_pop_due_respects_limit():
+    scheduler = PollScheduler(jitter_fraction=0)
+    for i in range(5):
+        scheduler.schedule(str(i), NOW - timedelta(minutes=i))
+    assert scheduler.pop_due(NOW, limit=2) == ['4', '3']
+    assert len(scheduler) == 3
+
+
+def test_heap_is_compacted_after_many_reschedules():
+    scheduler = PollScheduler(jitter_fraction=0)
+    for i in range(1000):
+        scheduler.schedule('a', NOW + timedelta(minutes=i))
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+
+
+def test_jitter_stays_within_fraction():
+    scheduler = PollScheduler(jitter_fraction=0.1, seed=7)
+    intervals = [scheduler.jittered(60) for _ in range(200)]
+    assert all(54 <= interval <= 66 for interval in intervals)
+    assert len(set(intervals)) > 1
+    assert PollScheduler(jitter_fraction=0).jittered(60) == 60
+
+
+def test_bad_jitter_setting_uses_default(monkeypatch):
+    monkeypatch.setenv('CIRCUIT_BREAKER', '0')
+    monkeypatch.setenv('POLLING_JITTER_FRACTION', '10%')
+    assert SmartPollingManager().scheduler.jitter_fraction == 0.1
+
+
+def test_injected_empty_scheduler_and_model_are_used(monkeypatch):
+    monkeypatch.setenv('CIRCUIT_BREAKER', '0')
+    scheduler = PollScheduler(seed=7)
+    model = PredictivePollingModel()
+    manager = SmartPollingManager(scheduler=scheduler, model=model)
+    assert manager.scheduler is scheduler
+    assert manager.model is model
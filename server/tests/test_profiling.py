@@ -0,0 +1,97 @@
+"""Profile jobs: profiled scrapes run on the job runner, never in the request"""
+import time
+
+import pytest
+
+import scrape_worker
+from job_batch import JobBatch
+from job_store import JobStore
+from profiling import profile
+from scrape_jobs import SUCCEEDED, ScrapeJobs
+
+
+def _busy_scrape():
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def test_cpu_profile_reports_the_profiled_function():
+    result, report = profile('cpu', _busy_scrape, top=5)
+    assert result > 0
+    assert report['kind'] == 'cpu' and report['samples'] > 0
+    assert any(row['function'] == '_busy_scrape' for row in report['top_total'])
+
+
+def test_unknown_profile_kind():
+    with pytest.raises(ValueError):
+        profile('wall', lambda: None)
+
+
+def test_bad_profile_settings_use_defaults(monkeypatch):
+    monkeypatch.setenv('PROFILE_MAX_OVERHEAD', '2%')
+    monkeypatch.setenv('PROFILE_INTERVAL_MS', 'fast')
+    monkeypatch.setenv('PROFILE_ALLOC_FRAMES', '')
+    for kind in ('cpu', 'alloc'):
+        result, report = profile(kind, _busy_scrape, top=5)
+        assert result > 0 and report['kind'] == kind
+
+
+@pytest.fixture
+def fake_scrape(monkeypatch):
+    def run_scrape(keywords, store, progress=None):
+        _busy_scrape()
+        return {'batch': JobBatch.from_records([]), 'truncated': [], 'version': 1}
+    monkeypatch.setattr(scrape_worker, 'run_scrape', run_scrape)
+
+
+def test_profile_job_stores_the_report(tmp_path, fake_scrape):
+    store = JobStore(str(tmp_path / 'store'))
+    jobs = ScrapeJobs(str(tmp_path / 'jobs'))
+    job = jobs.create('intern', profile={'kind': 'cpu', 'top': 3})
+
+    finished = jobs.run(job['id'], scrape_worker.job_runner(job, store))
+    assert finished['status'] == SUCCEEDED
+    assert finished['profile_report']['kind'] == 'cpu'
+    assert len(finished['profile_report']['top_self']) <= 3
+    assert jobs.wait(job['id'], timeout=0) == finished
+
+
+@pytest.fixture
+def profiling_app(monkeypatch, tmp_path):
+    import app
+    monkeypatch.setattr(app, 'PROFILE_TOKEN', 'secret')
+    monkeypatch.setattr(app, 'store', JobStore(str(tmp_path / 'store')))
+    monkeypatch.setattr(app, 'scrape_jobs', ScrapeJobs(str(tmp_path / 'jobs')))
+    return app
+
+
+def test_worker_mode_profile_is_filed_as_a_job_not_run_in_the_request(profiling_app, monkeypatch):
+    app = profiling_app
+    monkeypatch.setattr(app, 'SCRAPE_MODE', 'worker')
+    monkeypatch.setattr(app, 'run_scrape', lambda *args: pytest.fail('scraped in the request worker'))
+    client = app.app.test_client()
+    headers = {'Authorization': 'Bearer secret'}
+
+    # No scrape worker: nothing to run the job
+    assert client.get('/api/scrape?profile=cpu', headers=headers).status_code == 503
+
+    app.store.heartbeat()
+    monkeypatch.setattr(app, 'SCRAPE_WAIT_SECONDS', 0)
+    assert client.get('/api/scrape?profile=cpu', headers=headers).status_code == 503
+    queued = app.scrape_jobs.queued()
+    assert len(queued) == 1 and queued[0]['profile'] == {'kind': 'cpu', 'top': 30}
+
+
+def test_inline_profile_runs_on_the_job_runner(profiling_app, fake_scrape):
+    client = profiling_app.app.test_client()
+    headers = {'Authorization': 'Bearer secret'}
+    assert client.get('/api/scrape?profile=cpu').status_code == 401
+    assert client.get('/api/scrape?profile=wall', headers=headers).status_code == 400
+
+    response = client.get('/api/scrape?profile=cpu&top=5', headers=headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['profile']['kind'] == 'cpu' and body['jobs'] == 0
@@ -0,0 +1,121 @@
+"""Yield-driven SerpApi query budget"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from query_budget import QueryBudget, QuotaAdmission
+
+NOW = datetime(2026, 10, 10, 12, 0)
+
+
+def _budget(path=None, **kwargs):
+    kwargs.setdefault('explore_share', 0.0)
+    kwargs.setdefault('seed', 1)
+    return QueryBudget(state_file=str(path) if path else None, **kwargs)
+
+
+def test_record_counts_only_never_seen_jobs():
+    budget = _budget()
+    assert budget.record('q', ['https://a', 'https://b', ''], now=NOW) == 2
+    assert budget.record('q', ['https://A ', 'https://c'], now=NOW) == 1
+    stats = budget.queries['q']
+    assert (stats.total_searches, stats.total_new_jobs) == (2, 3)
+
+
+def test_adhoc_searches_do_not_learn():
+    budget = _budget()
+    budget.record('adhoc', ['https://a'], now=NOW, learn=False)
+    assert 'adhoc' not in budget.queries
+    assert budget.record('q', ['https://a'], now=NOW) == 0
+
+
+def test_select_tries_unsearched_queries_then_best_yield():
+    budget = _budget()
+    for run in range(5):
+        budget.record('good', [f"https://good/{run}/{i}" for i in range(10)], now=NOW)
+        budget.record('bad', [], now=NOW)
+
+    assert budget.select(['bad', 'good', 'new'], max_queries=2, now=NOW) == ['new', 'good']
+
+
+def test_allowance_paces_the_monthly_quota():
+    budget = _budget(monthly_quota=31)
+    assert budget.allowance(max_queries=10, now=datetime(2026, 10, 1)) == 1
+
+    budget = _budget(monthly_quota=310)
+    assert budget.allowance(max_queries=6, now=datetime(2026, 10, 1)) == 6
+    assert budget.allowance(max_queries=6, now=datetime(2026, 10, 31)) == 6
+
+    spent = _budget(monthly_quota=2)
+    run = spent.admission.open_run(5)
+    assert run.try_acquire() and run.try_acquire() and not run.try_acquire()
+    assert spent.select(['a', 'b'], max_queries=2) == []
+
+
+def test_statistics_decay_with_half_life():
+    budget = _budget(half_life_days=14)
+    budget.select(['q'], max_queries=1, now=NOW)
+    budget.record('q', ['https://a'], now=NOW)
+    budget.select(['q'], max_queries=1, now=NOW + timedelta(days=14))
+    assert budget.queries['q'].pulls == pytest.approx(0.5)
+    assert budget.queries['q'].total_searches == 1
+
+
+def test_state_round_trips(tmp_path):
+    path = tmp_path / 'budget.json'
+    budget = _budget(path)
+    budget.select(['q'], max_queries=1, now=NOW)
+    budget.record('q', ['https://a', 'https://b'], now=NOW)
+    budget.save()
+
+    reloaded = _budget(path)
+    assert reloaded.queries['q'].total_new_jobs == 2
+    assert reloaded.decayed_at == NOW
+    assert reloaded.record('q', ['https://a'], now=NOW) == 0
+
+
+def test_overlapping_runs_merge_their_statistics(tmp_path):
+    path = tmp_path / 'budget.json'
+    seed = _budget(path)
+    seed.record('shared', ['https://seed'], now=NOW)
+    seed.save()
+
+    first, second = _budget(path), _budget(path)
+    first.record('shared', ['https://first'], now=NOW)
+    first.record('only-first', ['https://first/2'], now=NOW)
+    second.record('shared', ['https://second'], now=NOW)
+    first.save()
+    second.save()
+
+    merged = _budget(path)
+    assert merged.queries['shared'].total_searches == 3
+    assert merged.queries['shared'].pulls == pytest.approx(3)
+    assert merged.queries['only-first'].total_searches == 1
+    assert merged.record('x', ['https://first', 'https://second', 'https://first/2'], now=NOW) == 0
+    # The second run now holds the merged state too; saving again adds nothing
+    second.save()
+    assert _budget(path).queries['shared'].total_searches == 3
+
+
+def test_merge_decays_the_older_side(tmp_path):
+    path = tmp_path / 'budget.json'
+    older, newer = _budget(path, half_life_days=14), _budget(path, half_life_days=14)
+    older.select(['q'], max_queries=1, now=NOW)
+    older.record('q', [], now=NOW)
+    older.save()
+
+    newer.select(['q'], max_queries=1, now=NOW + timedelta(days=14))
+    newer.record('q', [], now=NOW + timedelta(days=14))
+    newer.save()
+
+    merged = _budget(path, half_life_days=14)
+    assert merged.decayed_at == NOW + timedelta(days=14)
+    assert merged.queries['q'].pulls == pytest.approx(1.5)
+
+
+def test_from_env_uses_state_dir(state_dir, monkeypatch):
+    monkeypatch.setenv('SERPAPI_MONTHLY_QUOTA', 'lots')
+    budget = QueryBudget.from_env()
+    assert budget.monthly_quota == 250
+    assert budget.state_file.startswith(str(state_dir))
+    assert isinstance(budget.admission, QuotaAdmission) and budget.admission.path
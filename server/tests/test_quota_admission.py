@@ -0,0 +1,51 @@
+"""Shared SerpApi usage counter"""
+import threading
+from datetime import datetime
+
+from query_budget import QuotaAdmission
+
+NOW = datetime(2026, 10, 10, 12, 0)
+
+
+def test_monthly_quota_is_enforced_across_instances(tmp_path):
+    path = str(tmp_path / 'quota.json')
+    first = QuotaAdmission(path, monthly_quota=3)
+    second = QuotaAdmission(path, monthly_quota=3)
+
+    assert first.try_acquire(NOW) and second.try_acquire(NOW) and first.try_acquire(NOW)
+    assert not second.try_acquire(NOW)
+    assert first.usage(NOW) == (3, 3)
+
+
+def test_counts_reset_with_the_month(tmp_path):
+    admission = QuotaAdmission(str(tmp_path / 'quota.json'), monthly_quota=1)
+    assert admission.try_acquire(datetime(2026, 9, 30))
+    assert not admission.try_acquire(datetime(2026, 9, 30))
+    assert admission.try_acquire(datetime(2026, 10, 1))
+    assert admission.usage(datetime(2026, 10, 1)) == (1, 1)
+
+
+def test_concurrent_acquires_never_overspend(tmp_path):
+    admission = QuotaAdmission(str(tmp_path / 'quota.json'), monthly_quota=25)
+    admitted = []
+
+    def worker():
+        for _ in range(10):
+            if admission.try_acquire(NOW):
+                admitted.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(admitted) == 25
+    assert admission.usage(NOW)[0] == 25
+
+
+def test_run_quota_caps_one_run():
+    admission = QuotaAdmission(monthly_quota=10)
+    run = admission.open_run(2)
+    assert [run.try_acquire() for _ in range(3)] == [True, True, False]
+    assert admission.open_run(5).try_acquire()
@@ -0,0 +1,131 @@
+"""Retries with backoff and hedged requests"""
+import threading
+
+import pytest
+import requests
+
+import request_policy
+from deadlines import Deadline
+from request_policy import RequestPolicy, is_retryable
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(request_policy.time, 'sleep', slept.append)
+    return slept
+
+
+def _flaky(errors, result='ok'):
+    calls = []
+
+    def call(timeout):
+        calls.append(timeout)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return call, calls
+
+
+def test_retryable_errors():
+    assert is_retryable(_http_error(503)) and is_retryable(_http_error(429))
+    assert is_retryable(requests.ConnectionError()) and is_retryable(requests.Timeout())
+    assert not is_retryable(_http_error(404))
+    assert not is_retryable(ValueError())
+
+
+def test_transient_failures_are_retried_with_capped_backoff(sleeps):
+    policy = RequestPolicy(max_attempts=3, backoff_seconds=10, max_backoff_seconds=0.01)
+    call, calls = _flaky([requests.Timeout(), _http_error(502)])
+    assert policy.execute('url', call) == 'ok'
+    assert len(calls) == 3
+    assert len(sleeps) == 2 and all(0 <= delay <= 0.01 for delay in sleeps)
+    assert policy.stats()['retries'] == 2
+
+
+def test_permanent_failures_and_exhausted_attempts_raise(sleeps):
+    policy = RequestPolicy(max_attempts=2, backoff_seconds=0)
+    call, calls = _flaky([_http_error(404)])
+    with pytest.raises(requests.HTTPError):
+        policy.execute('url', call)
+    assert len(calls) == 1
+
+    call, calls = _flaky([requests.Timeout()] * 5)
+    with pytest.raises(requests.Timeout):
+        policy.execute('url', call)
+    assert len(calls) == 2
+    assert policy.stats()['failures'] == 2
+
+
+def test_backoff_never_sleeps_past_the_deadline(sleeps):
+    policy = RequestPolicy(max_attempts=5, backoff_seconds=100, max_backoff_seconds=100)
+    call, calls = _flaky([requests.Timeout()] * 5)
+    deadline = Deadline(0.001)
+    with pytest.raises(requests.Timeout):
+        policy.execute('url', call, deadline=deadline)
+    assert len(calls) < 5
+    assert all(delay < 0.001 for delay in sleeps)
+
+
+def test_slow_attempt_is_hedged_and_the_hedge_wins():
+    policy = RequestPolicy(hedge=True, hedge_min_samples=3)
+    for _ in range(3):
+        policy._observe('url', 0.01)
+    assert policy.hedge_delay('url') == 0.01
+
+    release = threading.Event()
+    calls = []
+
+    def call(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            release.wait(5)
+            return 'straggler'
+        return 'hedge'
+
+    try:
+        assert policy.execute('url', call) == 'hedge'
+    finally:
+        release.set()
+    stats = policy.stats()
+    assert (stats['hedges'], stats['hedge_wins']) == (1, 1)
+
+
+def test_hedge_win_records_the_hedge_own_latency():
+    policy = RequestPolicy(hedge=True, hedge_min_samples=3)
+    for _ in range(3):
+        policy._observe('url', 0.2)
+
+    release = threading.Event()
+    calls = []
+
+    def call(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            release.wait(5)
+        return 'ok'
+
+    try:
+        policy.execute('url', call)
+    finally:
+        release.set()
+    # Measured from the primary's start it would include the 0.2s hedge delay
+    assert policy._latencies['url'][-1] < 0.2
+
+
+def test_from_env_bad_values_fall_back_to_defaults(monkeypatch):
+    monkeypatch.setenv('REQUEST_MAX_ATTEMPTS', 'three')
+    monkeypatch.setenv('REQUEST_BACKOFF_SECONDS', '')
+    monkeypatch.setenv('REQUEST_MAX_BACKOFF_SECONDS', '8s')
+    monkeypatch.setenv('REQUEST_HEDGE_QUANTILE', '95')
+    monkeypatch.setenv('REQUEST_HEDGE_MIN_SAMPLES', 'ten')
+    policy = RequestPolicy.from_env()
+    assert (policy.max_attempts, policy.backoff_seconds, policy.max_backoff_seconds) == (3, 0.5, 8)
+    assert (policy.hedge_quantile, policy.hedge_min_samples) == (1.0, 10)
@@ -0,0 +1,114 @@
+"""Prepared payloads, ETags and the /api/scrape payload cache"""
+import gzip
+import importlib
+
+import pytest
+
+from job_batch import JobBatch
+from response_cache import PreparedPayload, ResponseCache
+
+
+class _Request:
+    def __init__(self, **headers):
+        self.headers = headers
+
+
+@pytest.fixture
+def payload():
+    return PreparedPayload.build(b'{"total":0}' * 50, 'application/json')
+
+
+def test_etag_is_stable_per_body(payload):
+    assert payload.etag == PreparedPayload.build(payload.body, 'application/json').etag
+    assert payload.etag != PreparedPayload.build(b'{}', 'application/json').etag
+
+
+@pytest.mark.parametrize('header', ['{etag}', 'W/{etag}', '"other", {etag}'])
+def test_if_none_match_gets_304(payload, header):
+    response = payload.make_response(_Request(**{'If-None-Match': header.format(etag=payload.etag)}))
+    assert response.status_code == 304
+    assert response.headers['ETag'] == payload.etag
+    assert response.get_data() == b''
+
+
+def test_stale_etag_gets_body(payload):
+    response = payload.make_response(_Request(**{'If-None-Match': '"stale"'}))
+    assert response.status_code == 200
+    assert response.get_data() == payload.body
+
+
+def test_serves_precompressed_encoding(payload):
+    response = payload.make_response(_Request(**{'Accept-Encoding': 'gzip, deflate'}))
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.get_data()) == payload.body
+
+    refused = payload.make_response(_Request(**{'Accept-Encoding': 'gzip;q=0'}))
+    assert 'Content-Encoding' not in refused.headers
+    assert refused.get_data() == payload.body
+
+
+def test_each_encoding_has_its_own_etag(payload):
+    gzipped = payload.make_response(_Request(**{'Accept-Encoding': 'gzip'}))
+    assert gzipped.headers['ETag'] == payload.etag_for('gzip') != payload.etag
+
+    again = payload.make_response(_Request(**{'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']}))
+    assert again.status_code == 304 and again.headers['ETag'] == gzipped.headers['ETag']
+
+    # The identity body's ETag does not validate the gzip bytes, nor the other way round
+    stale = payload.make_response(_Request(**{'Accept-Encoding': 'gzip', 'If-None-Match': payload.etag}))
+    assert stale.status_code == 200
+    assert payload.make_response(_Request(**{'If-None-Match': gzipped.headers['ETag']})).status_code == 200
+
+
+def test_response_cache_builds_once_and_evicts_lru():
+    cache = ResponseCache(max_entries=2)
+    builds = []
+
+    def build(name):
+        builds.append(name)
+        return PreparedPayload.build(name.encode(), 'text/plain')
+
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('b', lambda: build('b'))
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('c', lambda: build('c'))
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('b', lambda: build('b'))
+    assert builds == ['a', 'b', 'c', 'b']
+
+
+@pytest.fixture
+def app_module():
+    import app
+    return app
+
+
+def test_scrape_endpoint_revalidates_with_etag(app_module, monkeypatch):
+    entry = {'batch': JobBatch.from_records([]), 'truncated': [], 'timestamp': 0, 'version': 7}
+    monkeypatch.setattr(app_module, 'get_scrape_result', lambda keywords, refresh=False: entry)
+    client = app_module.app.test_client()
+
+    first = client.get('/api/scrape')
+    assert first.status_code == 200
+    assert first.get_json()['total'] == 0
+
+    again = client.get('/api/scrape', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_scrape_locks_are_bounded(app_module):
+    locks = {id(app_module.scrape_lock(f"query {i}")) for i in range(1000)}
+    assert len(locks) <= len(app_module.scrape_locks)
+    assert app_module.scrape_lock('same') is app_module.scrape_lock('same')
+
+
+def test_bad_cache_settings_fall_back_to_defaults(app_module, monkeypatch):
+    monkeypatch.setenv('SCRAPE_CACHE_SECONDS', 'an hour')
+    monkeypatch.setenv('SCRAPE_WAIT_SECONDS', '')
+    try:
+        reloaded = importlib.reload(app_module)
+        assert reloaded.CACHE_DURATION == 3600
+        assert reloaded.SCRAPE_WAIT_SECONDS == 600
+    finally:
+        monkeypatch.undo()
+        importlib.reload(app_module)
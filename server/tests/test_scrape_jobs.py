@@ -0,0 +1,138 @@
+"""Asynchronous scrape jobs: progress, cancellation, orphans and cleanup"""
+import os
+import time
+
+import pytest
+
+import scrape_jobs as scrape_jobs_module
+import scrape_worker
+from job_batch import JobBatch
+from job_record import JobRecord
+from scrape_jobs import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, ScrapeJobs
+from scrape_worker import ScrapeWorker
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    return ScrapeJobs(str(tmp_path / 'jobs'), ttl_seconds=60)
+
+
+def _record(job_id):
+    return JobRecord(
+        id=job_id, company_name='Acme', position_title='Software Intern', description='', job_type='software',
+        location='Remote', eligible_years=(), posted_date='2026-10-01', application_url=f"https://acme/{job_id}",
+        source='Lever',
+    )
+
+
+def _stored(records):
+    return {'batch': JobBatch.from_records(records), 'version': 42, 'truncated': ['Lever']}
+
+
+def test_job_reports_progress_and_final_result(jobs):
+    job = jobs.create('intern')
+    assert jobs.queued()[0]['id'] == job['id']
+
+    def runner(keywords, progress):
+        progress('Lever', RUNNING)
+        progress('Lever', SUCCEEDED, jobs=[_record('a')])
+        assert [item['id'] for item in jobs.results(job['id'])['internships']] == ['a']
+        assert jobs.get(job['id'])['status'] == RUNNING
+        return _stored([_record('a'), _record('b')])
+
+    finished = jobs.run(job['id'], runner)
+    assert finished['status'] == SUCCEEDED
+    assert (finished['total'], finished['version'], finished['truncated']) == (2, 42, ['Lever'])
+    assert finished['sources']['Lever']['jobs_found'] == 1
+    assert len(jobs.results(job['id'])['internships']) == 2
+    assert jobs.queued() == []
+
+
+def test_cancel_stops_before_next_source_and_keeps_partials(jobs):
+    job = jobs.create('intern')
+
+    def runner(keywords, progress):
+        progress('Lever', SUCCEEDED, jobs=[_record('a')])
+        jobs.cancel(job['id'])
+        progress('Greenhouse', RUNNING)
+        raise AssertionError('not reached')
+
+    assert jobs.run(job['id'], runner)['status'] == CANCELLED
+    assert len(jobs.results(job['id'])['internships']) == 1
+
+
+def test_failed_runner_marks_job_failed(jobs):
+    job = jobs.create('intern')
+
+    def runner(keywords, progress):
+        raise RuntimeError('boom')
+
+    finished = jobs.run(job['id'], runner)
+    assert (finished['status'], finished['error']) == (FAILED, 'boom')
+
+
+def test_unknown_or_malformed_ids(jobs):
+    assert jobs.get('0' * 32) is None
+    assert jobs.get('../secrets') is None
+
+
+def _leave_running(jobs):
+    """A job whose runner died after its first source"""
+    job = jobs.create('intern')
+
+    class Killed(BaseException):
+        pass
+
+    def runner(keywords, progress):
+        progress('Lever', SUCCEEDED, jobs=[_record('a')])
+        raise Killed()
+
+    with pytest.raises(Killed):
+        jobs.run(job['id'], runner)
+    assert jobs.get(job['id'])['status'] == RUNNING
+    return job
+
+
+def test_orphaned_running_jobs_are_failed_with_partials(jobs):
+    job = _leave_running(jobs)
+    queued = jobs.create('intern')
+
+    assert jobs.fail_orphaned() == [job['id']]
+    orphan = jobs.get(job['id'])
+    assert orphan['status'] == FAILED and orphan['finished_at']
+    assert len(jobs.results(job['id'])['internships']) == 1
+    assert jobs.get(queued['id'])['status'] == QUEUED
+
+
+def test_worker_fails_orphans_on_startup(jobs, tmp_path, monkeypatch):
+    from job_store import JobStore
+    # run() installs SIGTERM/SIGINT handlers from the main thread; keep pytest's
+    monkeypatch.setattr(scrape_worker.signal, 'signal', lambda *args: None)
+    job = _leave_running(jobs)
+    worker = ScrapeWorker(JobStore(str(tmp_path / 'store')), jobs, poll_seconds=0.01)
+    worker.stop()
+    worker.run()
+    assert jobs.get(job['id'])['status'] == FAILED
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_cleanup_expires_finished_and_abandoned_jobs(jobs, monkeypatch):
+    monkeypatch.setattr(scrape_jobs_module, 'STALE_JOB_SECONDS', 600)
+    finished = jobs.create('intern')
+    jobs.run(finished['id'], lambda keywords, progress: _stored([]))
+    recent = jobs.create('intern')
+    abandoned = jobs.create('intern')
+
+    _age(jobs._path(finished['id']), 120)
+    _age(jobs._path(finished['id'], '.results.json'), 120)
+    _age(jobs._path(recent['id']), 120)
+    _age(jobs._path(abandoned['id']), 1200)
+    jobs.cleanup()
+
+    assert jobs.get(finished['id']) is None
+    assert jobs.get(recent['id'])['status'] == QUEUED
+    assert jobs.get(abandoned['id']) is None
@@ -0,0 +1,110 @@
+"""Persistent seen-job filter and when scrapes add to it"""
+import time
+
+import pytest
+
+import scrape_worker
+import scrapers
+from job_record import JobRecord
+from seen_filter import BloomFilter, SeenFilter, bloom_parameters
+
+
+def _job(url, source='github_simplify_summer2026'):
+    return JobRecord(
+        id=url, company_name='Stripe', position_title='Intern', description='', job_type='software',
+        location='Remote', eligible_years=(), posted_date='2026-10-01', application_url=url, source=source,
+    )
+
+
+def test_bloom_filter_persists_and_keeps_its_false_positive_rate(tmp_path):
+    path = str(tmp_path / 'seen.bloom')
+    bloom = BloomFilter(path, capacity=1000, fp_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"https://jobs/{i}")
+    bloom.close()
+
+    reopened = BloomFilter(path)
+    assert all(f"https://jobs/{i}" in reopened for i in range(1000))
+    false_positives = sum(f"https://other/{i}" in reopened for i in range(5000))
+    assert false_positives < 5000 * 0.03
+    assert bloom_parameters(1000, 0.01)[1] == 7
+
+
+def test_seen_filter_rotates_and_forgets_after_max_age(tmp_path, monkeypatch):
+    seen = SeenFilter(str(tmp_path), max_age_days=2)
+    seen.add('https://a')
+    assert seen.seen('https://a') and not seen.seen('https://b')
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 86400 * 1.1)
+    seen._checked_at = 0
+    seen.add('https://b')
+    # Rotated once: 'a' survives in the previous generation
+    assert 'https://a' in seen._previous and seen.seen('https://b')
+
+    monkeypatch.setattr(time, 'time', lambda: now + 86400 * 2.2)
+    seen._checked_at = 0
+    assert not seen.seen('https://a')
+    assert seen.seen('https://b')
+
+
+def test_keys_seen_again_survive_rotation(tmp_path, monkeypatch):
+    seen = SeenFilter(str(tmp_path), max_age_days=2)
+    seen.add_all(['https://listed'])
+    now = time.time()
+    # A posting that stays listed is looked up once per generation
+    for day in range(1, 6):
+        monkeypatch.setattr(time, 'time', lambda day=day: now + 86400 * (day + 0.1))
+        seen._checked_at = 0
+        assert seen.seen('https://listed')
+    assert not seen.seen('https://never-added')
+
+
+def test_filters_share_state_across_instances(tmp_path):
+    SeenFilter(str(tmp_path)).add_all(['https://a', '', 'https://b'])
+    other = SeenFilter(str(tmp_path))
+    assert other.seen('https://a') and other.seen('https://b')
+
+
+class _Store:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def save(self, keywords, batch, truncated=()):
+        if self.fail:
+            raise OSError('disk full')
+        return {'batch': batch, 'version': 1}
+
+
+@pytest.fixture
+def seen(tmp_path, monkeypatch):
+    (tmp_path / 'seen').mkdir()
+    seen = SeenFilter(str(tmp_path / 'seen'))
+    monkeypatch.setattr(scrapers, 'get_seen_filter', lambda: seen)
+    monkeypatch.setenv('JOB_LEDGER', '0')
+    monkeypatch.setattr(scrapers, 'scrape_all_sources', lambda keywords, progress=None, watermarks=None: [
+        _job('https://github/1'), _job('https://google/1', source=scrapers.GoogleJobsScraper.SOURCE),
+        _job('https://boards.greenhouse.io/1', source='greenhouse'),
+    ])
+    return seen
+
+
+def test_jobs_are_marked_seen_only_after_the_result_is_stored(seen):
+    with pytest.raises(OSError):
+        scrape_worker.run_scrape('intern', _Store(fail=True))
+    assert not seen.seen('https://github/1')
+
+    scrape_worker.run_scrape('intern', _Store())
+    assert seen.seen('https://github/1') and seen.seen('https://google/1')
+    # Sources that never consult the filter do not fill it
+    assert not seen.seen('https://boards.greenhouse.io/1')
+
+
+def test_parsing_does_not_mark_jobs_seen(seen):
+    scraper = scrapers.GitHubInternshipScraper()
+    scraper.seen_filter = seen
+    rows = [{'cells': ['Stripe', 'Software Intern', 'Remote'], 'links': ['', 'https://github/2', ''],
+             'text': 'Stripe Software Intern Remote', 'table': 0, 'row': 0}]
+    jobs = scraper.parse_rows(scrapers.GitHubInternshipScraper.GITHUB_REPOS[0], rows)
+    assert [job.application_url for job in jobs] == ['https://github/2']
+    assert not seen.seen('https://github/2')
@@ -0,0 +1,57 @@
+"""On-disk SerpApi response cache"""
+import time
+
+import pytest
+
+from serpapi_cache import SerpApiCache, cache_key, ttl_for
+
+PARAMS = {'engine': 'google_jobs', 'q': 'Software  Engineering Intern', 'date_posted': 'week', 'api_key': 'one'}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SerpApiCache(str(tmp_path / 'cache.sqlite3'))
+
+
+def test_key_ignores_api_key_and_whitespace_case():
+    same = dict(PARAMS, q='software engineering intern', api_key='two')
+    assert cache_key(same) == cache_key(PARAMS)
+    assert cache_key(dict(PARAMS, date_posted='today')) != cache_key(PARAMS)
+
+
+def test_fetch_searches_once(cache):
+    calls = []
+
+    def search():
+        calls.append(1)
+        return {'jobs_results': [{'title': 'Intern'}]}
+
+    assert cache.fetch(PARAMS, search) == ({'jobs_results': [{'title': 'Intern'}]}, False)
+    assert cache.fetch(dict(PARAMS, api_key='other'), search) == ({'jobs_results': [{'title': 'Intern'}]}, True)
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_errors_are_not_cached(cache):
+    cache.put(PARAMS, {'error': 'Invalid API key'})
+    assert cache.get(PARAMS) is None
+
+
+def test_entries_expire_by_date_posted(cache, monkeypatch):
+    assert ttl_for({'date_posted': 'today'}) < ttl_for(PARAMS) < ttl_for({'date_posted': 'month'})
+    cache.put(PARAMS, {'jobs_results': []})
+    later = time.time() + ttl_for(PARAMS) + 1
+    monkeypatch.setattr(time, 'time', lambda: later)
+    assert cache.get(PARAMS) is None
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.put(dict(PARAMS, q='first'), {'jobs_results': ['a']})
+    cache.put(dict(PARAMS, q='second'), {'jobs_results': ['b']})
+    cache.max_bytes = cache.stats()['bytes']
+    cache.get(dict(PARAMS, q='first'))
+
+    cache.put(dict(PARAMS, q='third'), {'jobs_results': ['c']})
+    assert cache.get(dict(PARAMS, q='second')) is None
+    assert cache.get(dict(PARAMS, q='first')) is not None
+    assert cache.get(dict(PARAMS, q='third')) is not None
@@ -0,0 +1,67 @@
+"""Predictive polling model and manager configuration"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from smart_polling import PollingMetadata, PredictivePollingModel, SmartPollingManager
+
+MONDAY = datetime(2026, 10, 5)
+
+
+def _metadata() -> PollingMetadata:
+    return PollingMetadata(source_url='https://example.com/board', source_name='example')
+
+
+def _feed(model, metadata, changes_at_hour, weeks=2, poll_minutes=30):
+    """Poll every poll_minutes; polls in the given hours of the day see a change"""
+    now = MONDAY
+    end = MONDAY + timedelta(weeks=weeks)
+    while now < end:
+        model.observe(metadata, now.hour in changes_at_hour, now)
+        now += timedelta(minutes=poll_minutes)
+    return now
+
+
+def test_no_observations_keeps_current_interval():
+    metadata = _metadata()
+    assert PredictivePollingModel().change_rate(metadata) is None
+    assert PredictivePollingModel().next_interval_minutes(metadata, MONDAY) == metadata.current_poll_interval_minutes
+
+
+def test_busy_source_polled_more_often_than_quiet_one():
+    model = PredictivePollingModel()
+    busy, quiet = _metadata(), _metadata()
+    now = _feed(model, busy, changes_at_hour=set(range(24)))
+    _feed(model, quiet, changes_at_hour={9})
+    assert model.change_rate(busy) > model.change_rate(quiet)
+    assert model.next_interval_minutes(busy, now) < model.next_interval_minutes(quiet, now)
+
+
+def test_seasonality_shortens_intervals_in_busy_hours():
+    model = PredictivePollingModel()
+    metadata = _metadata()
+    _feed(model, metadata, changes_at_hour={9, 10, 11})
+    weights = model.seasonal_weights(metadata)
+    assert weights[9] > 1 > weights[2]
+
+    morning = MONDAY + timedelta(weeks=2, hours=9)
+    night = MONDAY + timedelta(weeks=2, hours=1)
+    assert model.next_interval_minutes(metadata, morning) < model.next_interval_minutes(metadata, night)
+
+
+def test_intervals_stay_within_bounds():
+    model = PredictivePollingModel()
+    metadata = _metadata()
+    now = _feed(model, metadata, changes_at_hour=set(range(24)), poll_minutes=5)
+    assert model.next_interval_minutes(metadata, now) >= metadata.min_poll_interval_minutes
+
+    idle = _metadata()
+    now = _feed(model, idle, changes_at_hour=set())
+    assert model.next_interval_minutes(idle, now) <= idle.max_poll_interval_minutes
+
+
+@pytest.mark.parametrize('value', ['half an hour', ''])
+def test_bad_staleness_setting_uses_default(monkeypatch, value):
+    monkeypatch.setenv('CIRCUIT_BREAKER', '0')
+    monkeypatch.setenv('POLLING_TARGET_STALENESS_MINUTES', value)
+    assert SmartPollingManager().model.target_staleness_minutes == 30.0
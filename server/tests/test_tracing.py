@@ -0,0 +1,96 @@
+"""Sampled scrape traces"""
+import contextvars
+import threading
+import time
+
+import pytest
+
+import tracing
+from tracing import TraceSampler, TraceStore
+
+
+def _traced(tmp_path, **kwargs):
+    # Trace every operation however loaded the test host is
+    return TraceStore(str(tmp_path / 'traces'), sampler=TraceSampler(rate=1.0, loaded_rate=1.0), **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return _traced(tmp_path, keep=2)
+
+
+@tracing.stage('clean')
+def _clean(value):
+    return value.strip()
+
+
+def test_spans_nest_and_stages_add_to_the_enclosing_span(store):
+    with store.trace('scrape', keywords='intern') as trace:
+        with tracing.span('source', category='source'):
+            with tracing.span('parse'):
+                for _ in range(3):
+                    _clean(' x ')
+
+    data = store.get(trace.id)
+    events = {event['name']: event for event in data['traceEvents']}
+    assert set(events) == {'scrape', 'source', 'parse'}
+    assert events['parse']['args']['clean_calls'] == 3
+    assert events['source']['ts'] <= events['parse']['ts']
+    assert data['otherData']['keywords'] == 'intern'
+
+
+def test_hooks_are_no_ops_outside_a_trace():
+    with tracing.span('orphan') as current:
+        assert current is None
+    assert _clean(' y ') == 'y'
+
+
+def test_threads_started_with_the_context_attach_to_the_span(store):
+    def query():
+        with tracing.span('query'):
+            pass
+
+    with store.trace('scrape') as trace:
+        with tracing.span('source'):
+            worker = threading.Thread(target=contextvars.copy_context().run, args=(query,))
+            worker.start()
+            worker.join()
+
+    events = {event['name']: event for event in trace.events}
+    assert 'query' in events
+    assert events['query']['tid'] != events['source']['tid']
+
+
+def test_unsampled_traces_are_not_stored(tmp_path):
+    store = TraceStore(str(tmp_path / 'traces'), sampler=TraceSampler(rate=0.0))
+    with store.trace('scrape') as trace:
+        assert trace is None
+    assert store.list() == []
+
+
+def test_span_cap_counts_dropped_spans(tmp_path):
+    store = _traced(tmp_path, max_spans=2)
+    with store.trace('scrape') as trace:
+        for _ in range(5):
+            with tracing.span('fetch'):
+                pass
+    assert len(trace.events) == 2 and trace.dropped == 4
+
+
+def test_only_the_newest_traces_are_kept(store):
+    ids = []
+    for name in ('a', 'b', 'c'):
+        with store.trace(name) as trace:
+            ids.append(trace.id)
+        time.sleep(0.01)
+    assert store.get(ids[0]) is None
+    assert [summary['name'] for summary in store.list()] == ['c', 'b']
+    assert store.get('../etc') is None
+
+
+def test_bad_env_values_fall_back_to_defaults(monkeypatch):
+    monkeypatch.setenv('TRACE_SAMPLE_RATE', 'all')
+    monkeypatch.setenv('TRACE_KEEP', '')
+    monkeypatch.setattr(tracing, '_shared_store', None)
+    store = tracing.get_trace_store()
+    assert store.sampler.rate == 1.0 and store.keep == tracing.DEFAULT_KEEP_TRACES
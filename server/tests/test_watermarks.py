@@ -0,0 +1,98 @@
+"""Per-board watermarks and reconcile schedule"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import scrape_worker
+import scrapers
+from watermarks import WatermarkStore, parse_timestamp
+
+T0 = datetime(2026, 10, 1, 12, 0)
+
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp('2026-10-01T14:00:00+02:00') == T0
+    assert parse_timestamp('2026-10-01T12:00:00Z') == T0
+    assert parse_timestamp(int((T0 - datetime(1970, 1, 1)).total_seconds() * 1000)) == T0
+    assert parse_timestamp('soon') is None
+    assert parse_timestamp('') is None
+
+
+def test_full_reconcile_due_until_first_full_pass():
+    store = WatermarkStore(reconcile_hours=24)
+    assert store.since('greenhouse', 'stripe', now=T0) is None
+
+    store.advance('greenhouse', 'stripe', ['2026-09-30T08:00:00Z', 'bad', None], full=True, now=T0)
+    assert store.since('greenhouse', 'stripe', now=T0 + timedelta(hours=1)) == datetime(2026, 9, 30, 8, 0)
+    assert store.since('greenhouse', 'stripe', now=T0 + timedelta(hours=24)) is None
+
+
+def test_empty_board_gets_a_watermark_from_a_full_pass():
+    store = WatermarkStore()
+    store.advance('lever', 'empty', [], full=True, now=T0)
+    assert store.since('lever', 'empty', now=T0 + timedelta(hours=1)) == T0
+
+
+def test_watermark_never_moves_back():
+    store = WatermarkStore()
+    store.advance('lever', 'acme', ['2026-09-30T08:00:00Z'], full=True, now=T0)
+    store.advance('lever', 'acme', ['2026-09-29T08:00:00Z'])
+    assert parse_timestamp(store.get('lever', 'acme')['watermark']) == datetime(2026, 9, 30, 8, 0)
+
+
+def test_save_merges_overlapping_runs(tmp_path):
+    path = str(tmp_path / 'board_watermarks.json')
+    first, second = WatermarkStore(path), WatermarkStore(path)
+    first.advance('greenhouse', 'stripe', ['2026-09-30T08:00:00'], full=True, now=T0)
+    second.advance('greenhouse', 'stripe', ['2026-09-30T09:00:00'])
+    second.advance('lever', 'acme', ['2026-09-28T00:00:00'], full=True, now=T0)
+    second.save()
+    first.save()
+
+    reloaded = WatermarkStore(path)
+    assert reloaded.get('greenhouse', 'stripe') == {
+        'watermark': '2026-09-30T09:00:00', 'reconciled_at': T0.isoformat()
+    }
+    assert reloaded.get('lever', 'acme')['watermark'] == '2026-09-28T00:00:00'
+    # The first store adopted what the second one saved
+    assert first.get('lever', 'acme') == reloaded.get('lever', 'acme')
+
+
+def test_pending_advances_apply_only_on_commit(tmp_path):
+    path = str(tmp_path / 'board_watermarks.json')
+    store = WatermarkStore(path)
+    pending = store.pending()
+    pending.advance('greenhouse', 'stripe', ['2026-09-30T08:00:00'], full=True, now=T0)
+
+    assert store.get('greenhouse', 'stripe') == {}
+    assert pending.since('greenhouse', 'stripe', now=T0) is None
+
+    pending.commit()
+    assert WatermarkStore(path).since('greenhouse', 'stripe', now=T0) == datetime(2026, 9, 30, 8, 0)
+
+
+class _Store:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def save(self, keywords, batch, truncated=()):
+        if self.fail:
+            raise OSError('disk full')
+        return {'batch': batch, 'version': 1}
+
+
+def test_scrape_commits_watermarks_only_after_the_result_is_stored(tmp_path, monkeypatch):
+    store = WatermarkStore(str(tmp_path / 'board_watermarks.json'))
+    monkeypatch.setattr(scrape_worker, 'get_watermark_store', lambda: store)
+
+    def scrape_all_sources(keywords, progress=None, watermarks=None):
+        watermarks.advance('lever', 'acme', ['2026-09-30T08:00:00'], full=True, now=T0)
+        return []
+    monkeypatch.setattr(scrapers, 'scrape_all_sources', scrape_all_sources)
+
+    with pytest.raises(OSError):
+        scrape_worker.run_scrape('intern', _Store(fail=True))
+    assert store.get('lever', 'acme') == {}
+
+    scrape_worker.run_scrape('intern', _Store())
+    assert store.get('lever', 'acme')['watermark'] == '2026-09-30T08:00:00'